@@ -1,9 +1,37 @@
 # backends/__init__.py
 from .canvas import Canvas, Rect, Point, Color
 from .input import InputSource
+from .input_encoder import EncoderInput, RotaryEncoder, Button, SimulatedEdges
+from .fonts import MaskFont, BitmapFont, PygameMaskFont
+from .glyph_atlas import GlyphAtlas
+
+from .canvas_fb import FramebufferCanvas
+from .canvas_damage import DamageTrackingCanvas
+from .present_thread import FramePresenter, PresentThread
+from .st7789 import SpiTransport, FakeTransport, SpidevTransport, ST7789Display
+from .shm import SharedFramebuffer, DisplayServer
+from .stream import FrameStreamServer, FrameStreamClient
+
+# pygame backends load on first access: `from msui.backends import
+# FramebufferCanvas` (and the SPI/shm/stream paths) must work on boards
+# without pygame.
+_LAZY = {
+    "PygameCanvas": ".canvas_pygame",
+    "PygameInput": ".input_pygame",
+    "PygamePresenter": ".present_pygame",
+}
+
+
+def __getattr__(name):
+    mod = _LAZY.get(name)
+    if mod is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(mod, __name__), name)
+    globals()[name] = value
+    return value
 
-from .canvas_pygame import PygameCanvas
-from .input_pygame import PygameInput
 
 __all__ = [
     "Canvas",
@@ -11,6 +39,27 @@ __all__ = [
     "Point",
     "Color",
     "InputSource",
+    "EncoderInput",
+    "RotaryEncoder",
+    "Button",
+    "SimulatedEdges",
+    "MaskFont",
+    "BitmapFont",
+    "PygameMaskFont",
+    "GlyphAtlas",
+    "FramebufferCanvas",
+    "DamageTrackingCanvas",
+    "FramePresenter",
+    "PresentThread",
+    "SpiTransport",
+    "FakeTransport",
+    "SpidevTransport",
+    "ST7789Display",
+    "SharedFramebuffer",
+    "DisplayServer",
+    "FrameStreamServer",
+    "FrameStreamClient",
     "PygameCanvas",
     "PygameInput",
+    "PygamePresenter",
 ]
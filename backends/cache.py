@@ -0,0 +1,131 @@
+# backends/cache.py
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from msui.log import LogMixin
+
+
+class LRUCache(LogMixin):
+    """
+    Tiny LRU cache with a hard cap to avoid unbounded growth.
+
+    Backend-neutral (no pygame), so every Canvas implementation can share it.
+
+    Limits:
+      - capacity: max entries (None = no entry limit, <= 0 disables the cache)
+      - max_bytes: optional byte budget, needs sizeof(val) -> approx bytes
+        (a sizeof alone, without max_bytes, just measures nbytes)
+
+    Counters (cumulative, see stats()): hits, misses, evictions, nbytes.
+
+    get/put/clear hold a small lock, so a background warm-up thread can fill
+    the cache while the render loop reads it.
+    """
+    def __init__(
+        self,
+        capacity: Optional[int],
+        *,
+        max_bytes: int = 0,
+        sizeof: Optional[Callable[[object], int]] = None,
+    ):
+        self.capacity = None if capacity is None else max(0, int(capacity))
+        self.max_bytes = max(0, int(max_bytes))
+        self._sizeof = sizeof
+        if self.max_bytes and sizeof is None:
+            raise ValueError("LRUCache(max_bytes=...) needs a sizeof callable")
+
+        self._od: "OrderedDict[object, object]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.log.debug("lru_init", capacity=self.capacity, max_bytes=self.max_bytes)
+
+    def __len__(self) -> int:
+        return len(self._od)
+
+    def _enabled(self) -> bool:
+        return self.capacity is None or self.capacity > 0
+
+    def _over(self) -> bool:
+        if self.capacity is not None and len(self._od) > self.capacity:
+            return True
+        return bool(self.max_bytes) and self.nbytes > self.max_bytes
+
+    def __contains__(self, key) -> bool:
+        # No hit/miss accounting and no LRU refresh (warm-up checks).
+        return key in self._od
+
+    def get(self, key):
+        if not self._enabled():
+            return None
+        with self._lock:
+            try:
+                val = self._od.pop(key)
+            except KeyError:
+                self.misses += 1
+                return None
+            # re-insert as most-recent
+            self._od[key] = val
+            self.hits += 1
+            return val
+
+    def put(self, key, val) -> None:
+        if not self._enabled():
+            return
+
+        with self._lock:
+            if key in self._od:
+                # refresh position
+                old = self._od.pop(key)
+                if self._sizeof is not None:
+                    self.nbytes -= self._sizeof(old)
+
+            self._od[key] = val
+            if self._sizeof is not None:
+                self.nbytes += self._sizeof(val)
+
+            # evict least-recent (always keep the entry just inserted)
+            evicted = 0
+            while len(self._od) > 1 and self._over():
+                _, old = self._od.popitem(last=False)
+                if self._sizeof is not None:
+                    self.nbytes -= self._sizeof(old)
+                evicted += 1
+            self.evictions += evicted
+
+        if evicted:
+            # DEBUG only; avoids spam
+            self.log.debug(
+                "lru_evicted",
+                count=evicted,
+                size=len(self._od),
+                capacity=self.capacity,
+                nbytes=self.nbytes,
+                max_bytes=self.max_bytes,
+            )
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Snapshot of the counters; see Profiler.watch_cache().
+        """
+        return {
+            "entries": len(self._od),
+            "capacity": -1 if self.capacity is None else self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "nbytes": self.nbytes,
+            "max_bytes": self.max_bytes,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            n = len(self._od)
+            self._od.clear()
+            self.nbytes = 0
+        self.log.debug("lru_cleared", prev_size=n)
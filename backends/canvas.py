@@ -1,7 +1,7 @@
 # backends/canvas.py
 from __future__ import annotations
 
-from typing import Protocol, Tuple, TypeAlias, runtime_checkable
+from typing import Protocol, Sequence, Tuple, TypeAlias, runtime_checkable
 
 # Common geometry / color types used across backends
 Point: TypeAlias = Tuple[int, int]
@@ -46,3 +46,86 @@ class Canvas(Protocol):
 
     def text(self, font_key: str, x: int, y: int, s: str, color: Color) -> None: ...
     def text_size(self, font_key: str, s: str) -> Tuple[int, int]: ...
+
+    # ---- batched primitives ----
+    # Flat int sequences (list, tuple, array('i'), ...) so callers can build them
+    # without per-item tuples. The defaults fall back to the single calls;
+    # backends override them to draw a whole batch in one go.
+
+    def lines(self, segments: Sequence[int], color: Color, *, width: int = 1) -> None:
+        """
+        Independent segments: [x1, y1, x2, y2, x1, y1, x2, y2, ...].
+        """
+        s = segments
+        for i in range(0, len(s) - 3, 4):
+            self.line((s[i], s[i + 1]), (s[i + 2], s[i + 3]), color, width=width)
+
+    def polyline(self, points: Sequence[int], color: Color, *, width: int = 1) -> None:
+        """
+        Connected points: [x0, y0, x1, y1, ...]; one segment per consecutive pair.
+        """
+        p = points
+        for i in range(0, len(p) - 3, 2):
+            self.line((p[i], p[i + 1]), (p[i + 2], p[i + 3]), color, width=width)
+
+    def circles(self, centers: Sequence[int], r: int, color: Color, *, width: int = 1) -> None:
+        """
+        Same-radius circles at [cx, cy, cx, cy, ...].
+        """
+        c = centers
+        for i in range(0, len(c) - 1, 2):
+            self.circle((c[i], c[i + 1]), r, color, width=width)
+
+
+# Batch calls for render code. Canvases that implement the Protocol
+# structurally (without subclassing Canvas) may lack lines/polyline/circles;
+# those get Canvas's loops over their own line()/circle().
+def draw_lines(canvas: Canvas, segments: Sequence[int], color: Color, *, width: int = 1) -> None:
+    fn = getattr(canvas, "lines", None)
+    if fn is None:
+        Canvas.lines(canvas, segments, color, width=width)
+    else:
+        fn(segments, color, width=width)
+
+
+def draw_polyline(canvas: Canvas, points: Sequence[int], color: Color, *, width: int = 1) -> None:
+    fn = getattr(canvas, "polyline", None)
+    if fn is None:
+        Canvas.polyline(canvas, points, color, width=width)
+    else:
+        fn(points, color, width=width)
+
+
+def draw_circles(canvas: Canvas, centers: Sequence[int], r: int, color: Color, *, width: int = 1) -> None:
+    fn = getattr(canvas, "circles", None)
+    if fn is None:
+        Canvas.circles(canvas, centers, r, color, width=width)
+    else:
+        fn(centers, r, color, width=width)
+
+
+@runtime_checkable
+class BitmapCanvas(Protocol):
+    """
+    Optional capability: copy a screen region out and blit it back.
+
+    Bitmaps are opaque backend objects (pygame Surface, ndarray, bytes...);
+    only the backend that produced one can blit it. Used by render caches.
+    """
+
+    def copy_rect(self, rect: Rect) -> object: ...
+    def blit(self, bitmap: object, x: int, y: int) -> None: ...
+    def bitmap_size(self, bitmap: object) -> Tuple[int, int]: ...
+    def bitmap_nbytes(self, bitmap: object) -> int: ...
+
+
+def clip_rect(rect: Rect, w: int, h: int) -> Rect | None:
+    """
+    Intersect rect with a (0, 0, w, h) canvas; None if nothing is left.
+    """
+    x, y, rw, rh = (int(v) for v in rect)
+    x0, y0 = max(0, x), max(0, y)
+    x1, y1 = min(int(w), x + rw), min(int(h), y + rh)
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return (x0, y0, x1 - x0, y1 - y0)
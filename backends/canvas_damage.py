@@ -0,0 +1,196 @@
+# backends/canvas_damage.py
+from __future__ import annotations
+
+from typing import List, Tuple
+
+from msui.backends.canvas import Canvas, Color, Point, Rect, draw_circles, draw_lines, draw_polyline
+from msui.log import LogMixin
+
+# Internal box form: (x0, y0, x1, y1), half-open.
+_Box = Tuple[int, int, int, int]
+
+
+def _area(b: _Box) -> int:
+    return (b[2] - b[0]) * (b[3] - b[1])
+
+
+def _union(a: _Box, b: _Box) -> _Box:
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def _waste(a: _Box, b: _Box) -> int:
+    """
+    Pixels a merged box covers that neither input box does.
+    """
+    u = _union(a, b)
+    ix = max(0, min(a[2], b[2]) - max(a[0], b[0]))
+    iy = max(0, min(a[3], b[3]) - max(a[1], b[1]))
+    return _area(u) - (_area(a) + _area(b) - ix * iy)
+
+
+def merge_boxes(boxes: List[_Box], *, max_waste: int = 0, max_rects: int = 0) -> List[_Box]:
+    """
+    Greedy rect merge.
+
+    - Any two boxes whose union wastes <= max_waste pixels are merged
+      (overlapping/touching boxes usually waste 0).
+    - If max_rects > 0, the cheapest pairs are merged until the list fits.
+    """
+    out = list(boxes)
+
+    merged = True
+    while merged:
+        merged = False
+        i = 0
+        while i < len(out):
+            j = i + 1
+            while j < len(out):
+                if _waste(out[i], out[j]) <= max_waste:
+                    out[i] = _union(out[i], out.pop(j))
+                    merged = True
+                    j = i + 1
+                else:
+                    j += 1
+            i += 1
+
+    while max_rects > 0 and len(out) > max_rects:
+        best = None
+        for i in range(len(out)):
+            for j in range(i + 1, len(out)):
+                w = _waste(out[i], out[j])
+                if best is None or w < best[0]:
+                    best = (w, i, j)
+        _, i, j = best
+        out[i] = _union(out[i], out.pop(j))
+
+    return out
+
+
+class DamageTrackingCanvas(LogMixin, Canvas):
+    """
+    Wrapper Canvas that forwards every call to `base` and records the screen
+    area each primitive may have touched.
+
+    take_damage() returns a merged, clipped list of rects drawn since the
+    previous call, so the present step can upload only what changed instead of
+    relying on the coarse dirty-mask regions.
+
+    Anything not part of the drawing API (surface, clear_caches, ...) is
+    forwarded to the wrapped backend.
+    """
+
+    def __init__(self, base: Canvas, *, max_waste: int = 64, max_rects: int = 16):
+        self.base = base
+        self.w = int(base.w)
+        self.h = int(base.h)
+        self.max_waste = max(0, int(max_waste))
+        self.max_rects = max(0, int(max_rects))
+        self._boxes: List[_Box] = []
+
+    def __getattr__(self, name):
+        return getattr(self.base, name)
+
+    # ---- damage bookkeeping ----
+    def add_damage(self, rect: Rect) -> None:
+        """
+        Mark a rect as changed (also usable for out-of-band writes).
+        """
+        x, y, w, h = rect
+        x0, y0 = max(0, int(x)), max(0, int(y))
+        x1, y1 = min(self.w, int(x) + int(w)), min(self.h, int(y) + int(h))
+        if x1 <= x0 or y1 <= y0:
+            return
+        for b in self._boxes:
+            # already covered (e.g. dial ticks inside a cleared tile)
+            if b[0] <= x0 and b[1] <= y0 and b[2] >= x1 and b[3] >= y1:
+                return
+        self._boxes.append((x0, y0, x1, y1))
+
+    def peek_damage(self) -> List[Rect]:
+        boxes = merge_boxes(self._boxes, max_waste=self.max_waste, max_rects=self.max_rects)
+        self._boxes = boxes
+        return [(b[0], b[1], b[2] - b[0], b[3] - b[1]) for b in boxes]
+
+    def take_damage(self) -> List[Rect]:
+        """
+        Merged damage since the last call; resets the tracker.
+        """
+        rects = self.peek_damage()
+        self._boxes = []
+        return rects
+
+    # ---- Canvas API ----
+    def fill(self, color: Color) -> None:
+        self.base.fill(color)
+        self._boxes = [(0, 0, self.w, self.h)]
+
+    def round_rect(
+        self,
+        rect: Rect,
+        radius: int,
+        color: Color,
+        *,
+        fill: bool = True,
+        width: int = 1,
+    ) -> None:
+        self.base.round_rect(rect, radius, color, fill=fill, width=width)
+        self.add_damage(rect)
+
+    def circle(self, center: Point, r: int, color: Color, *, width: int = 1) -> None:
+        self.base.circle(center, r, color, width=width)
+        r = int(r)
+        self.add_damage((int(center[0]) - r, int(center[1]) - r, 2 * r + 1, 2 * r + 1))
+
+    def arc(
+        self,
+        rect: Rect,
+        start_rad: float,
+        end_rad: float,
+        color: Color,
+        *,
+        width: int = 1,
+    ) -> None:
+        self.base.arc(rect, start_rad, end_rad, color, width=width)
+        self.add_damage(rect)
+
+    def line(self, p1: Point, p2: Point, color: Color, *, width: int = 1) -> None:
+        self.base.line(p1, p2, color, width=width)
+        pad = max(1, int(width)) // 2 + 1
+        x0, x1 = sorted((int(p1[0]), int(p2[0])))
+        y0, y1 = sorted((int(p1[1]), int(p2[1])))
+        self.add_damage((x0 - pad, y0 - pad, x1 - x0 + 2 * pad + 1, y1 - y0 + 2 * pad + 1))
+
+    def _add_points_damage(self, pts, pad: int) -> None:
+        # one bbox per batch: batched primitives are usually one small shape
+        if len(pts) < 2:
+            return
+        xs, ys = pts[0::2], pts[1::2]
+        x0, x1 = int(min(xs)), int(max(xs))
+        y0, y1 = int(min(ys)), int(max(ys))
+        self.add_damage((x0 - pad, y0 - pad, x1 - x0 + 2 * pad + 1, y1 - y0 + 2 * pad + 1))
+
+    def lines(self, segments, color: Color, *, width: int = 1) -> None:
+        draw_lines(self.base, segments, color, width=width)
+        self._add_points_damage(segments, max(1, int(width)) // 2 + 1)
+
+    def polyline(self, points, color: Color, *, width: int = 1) -> None:
+        draw_polyline(self.base, points, color, width=width)
+        self._add_points_damage(points, max(1, int(width)) // 2 + 1)
+
+    def circles(self, centers, r: int, color: Color, *, width: int = 1) -> None:
+        draw_circles(self.base, centers, r, color, width=width)
+        self._add_points_damage(centers, max(0, int(r)))
+
+    def text(self, font_key: str, x: int, y: int, s: str, color: Color) -> None:
+        self.base.text(font_key, x, y, s, color)
+        tw, th = self.base.text_size(font_key, s)
+        self.add_damage((int(x), int(y), tw, th))
+
+    def text_size(self, font_key: str, s: str) -> Tuple[int, int]:
+        return self.base.text_size(font_key, s)
+
+    # copy_rect / bitmap_size / bitmap_nbytes are forwarded via __getattr__
+    def blit(self, bitmap: object, x: int, y: int) -> None:
+        self.base.blit(bitmap, x, y)
+        bw, bh = self.base.bitmap_size(bitmap)
+        self.add_damage((int(x), int(y), bw, bh))
@@ -0,0 +1,573 @@
+# backends/canvas_fb.py
+from __future__ import annotations
+
+import math
+import mmap
+import os
+import stat
+import sys
+import threading
+from array import array
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from msui.backends.cache import LRUCache
+from msui.backends.canvas import BitmapCanvas, Canvas, Color, Point, Rect, clip_rect
+from msui.backends.fonts import MaskFont
+from msui.backends.glyph_atlas import DEFAULT_CHARSET, GlyphAtlas
+from msui.log import LogMixin
+
+_TWO_PI = 2.0 * math.pi
+
+# Text masks are thresholded to 1 bit (no read-modify-write blending on RGB565).
+_TEXT_COVERAGE_MIN = 128
+
+
+def rgb565(color: Color) -> int:
+    """
+    Quantize an RGB tuple to a 16-bit RGB565 value (numeric, not byte order).
+    """
+    r, g, b = color[0], color[1], color[2]
+    return ((int(r) & 0xF8) << 8) | ((int(g) & 0xFC) << 3) | (int(b) >> 3)
+
+
+@lru_cache(maxsize=256)
+def _circle_half_widths(r: int) -> Tuple[int, ...]:
+    """
+    half[dy] = largest |dx| with dx^2 + dy^2 <= r^2, for dy in 0..r.
+    """
+    rr = r * r
+    return tuple(math.isqrt(rr - dy * dy) for dy in range(r + 1))
+
+
+@lru_cache(maxsize=256)
+def _circle_hole_widths(r: int) -> Tuple[int, ...]:
+    """
+    hole[dy] = largest |dx| with dx^2 + dy^2 < r^2 (strictly inside), or -1 if none.
+    """
+    rr = r * r
+    out = []
+    for dy in range(r + 1):
+        rem = rr - dy * dy
+        out.append(math.isqrt(rem - 1) if rem >= 1 else -1)
+    return tuple(out)
+
+
+@lru_cache(maxsize=256)
+def _round_rect_insets(h: int, r: int) -> Tuple[int, ...]:
+    """
+    Per-row horizontal inset of a rounded rect of height h and corner radius r.
+    """
+    if r <= 0:
+        return (0,) * h
+    half = _circle_half_widths(r)
+    out = [0] * h
+    for i in range(min(r, h)):
+        inset = r - half[r - i]
+        out[i] = inset
+        out[h - 1 - i] = inset
+    return tuple(out)
+
+
+class FramebufferCanvas(LogMixin, Canvas, BitmapCanvas):
+    """
+    Canvas that rasterizes straight into an RGB565 pixel buffer.
+
+    The buffer can be a memory-mapped framebuffer device (/dev/fb0), a regular
+    file (for testing) or any writable bytes-like object. Drawing is span based:
+    every primitive is decomposed into horizontal runs that are written with a
+    single memoryview slice assignment, so no pygame Surface is involved and
+    presenting is a no-op for mmap'd devices.
+
+    byteorder:
+      - "native": host order (what Linux fbdev expects)
+      - "big":    wire order for SPI panels such as the ST7789
+    """
+
+    def __init__(
+        self,
+        w: int,
+        h: int,
+        fonts: Dict[str, MaskFont],
+        *,
+        buffer=None,
+        stride_px: Optional[int] = None,
+        byteorder: str = "native",
+        text_cache_max: int = 256,
+        size_cache_max: int = 512,
+        glyph_atlas: bool = True,
+        glyph_charset: str = DEFAULT_CHARSET,
+    ):
+        self.w = int(w)
+        self.h = int(h)
+        self.stride = int(stride_px) if stride_px else self.w
+        if self.stride < self.w:
+            raise ValueError(f"stride_px ({self.stride}) must be >= w ({self.w})")
+
+        if byteorder == "native":
+            byteorder = sys.byteorder
+        if byteorder not in ("little", "big"):
+            raise ValueError(f"Unknown byteorder: {byteorder!r}")
+        self.byteorder = byteorder
+        self._swap = byteorder != sys.byteorder
+
+        nbytes = self.stride * self.h * 2
+        if buffer is None:
+            buffer = bytearray(nbytes)
+        raw = memoryview(buffer).cast("B")
+        if len(raw) < nbytes:
+            raise ValueError(f"Framebuffer too small: need {nbytes} bytes, got {len(raw)}")
+
+        # Bytes view (for presenters) and 16-bit pixel view (for drawing).
+        self.buffer = raw[:nbytes]
+        self.pixels = self.buffer.cast("H")
+
+        self.fonts = fonts
+        self._mmap: Optional[mmap.mmap] = None
+
+        # One prebuilt row of pixels per color: spans are slices of it.
+        self._rows: Dict[Color, memoryview] = {}
+
+        # Glyph atlases (one per font key); strings with other chars fall back
+        # to the whole-string mask cache below.
+        self.use_glyph_atlas = bool(glyph_atlas)
+        self.glyph_charset = glyph_charset
+        self._atlases: Dict[str, GlyphAtlas] = {}
+
+        # Bounded caches (memory safe)
+        self._text_cache = LRUCache(text_cache_max)
+        self._size_cache = LRUCache(size_cache_max)
+
+        # Serializes font.mask()/size() and atlas builds between the render
+        # loop and a warm-up thread (see warm_text()); cache hits skip it.
+        self._font_lock = threading.RLock()
+
+        self.log.info(
+            "canvas_init",
+            backend="framebuffer",
+            w=self.w,
+            h=self.h,
+            stride_px=self.stride,
+            byteorder=self.byteorder,
+            fonts=list(fonts.keys()),
+            glyph_atlas=self.use_glyph_atlas,
+        )
+
+    @classmethod
+    def open(
+        cls,
+        path: str,
+        w: int,
+        h: int,
+        fonts: Dict[str, MaskFont],
+        *,
+        stride_px: Optional[int] = None,
+        **kwargs,
+    ) -> "FramebufferCanvas":
+        """
+        Memory-map a framebuffer device or regular file and draw into it.
+
+        Regular files are created/grown to the frame size, which makes this
+        usable for tests and for inspecting frames offline.
+        """
+        stride = int(stride_px) if stride_px else int(w)
+        nbytes = stride * int(h) * 2
+
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            st = os.fstat(fd)
+            if stat.S_ISREG(st.st_mode) and st.st_size < nbytes:
+                os.ftruncate(fd, nbytes)
+            mm = mmap.mmap(fd, nbytes, mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE)
+        finally:
+            # mmap keeps its own reference to the file
+            os.close(fd)
+
+        canvas = cls(w, h, fonts, buffer=mm, stride_px=stride, **kwargs)
+        canvas._mmap = mm
+        canvas.log.info("framebuffer_mapped", path=str(path), nbytes=nbytes)
+        return canvas
+
+    def close(self) -> None:
+        """
+        Release the mapping (only needed for canvases created via open()).
+        """
+        self._rows.clear()
+        self.pixels.release()
+        self.buffer.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def caches(self) -> Dict[str, LRUCache]:
+        """
+        Named LRU caches, for stats (see Profiler.watch_cache()).
+        """
+        return {"text": self._text_cache, "size": self._size_cache}
+
+    def clear_caches(self) -> None:
+        """
+        Call this if fonts/theme are swapped at runtime.
+        """
+        self.log.info("canvas_clear_caches")
+        self._text_cache.clear()
+        self._size_cache.clear()
+        self._rows.clear()
+        self._atlases.clear()
+
+    # ---- pixel helpers ----
+    def pack(self, color: Color) -> int:
+        """
+        Color -> stored 16-bit value (already in this buffer's byte order).
+        """
+        v = rgb565(color)
+        if self._swap:
+            v = ((v & 0xFF) << 8) | (v >> 8)
+        return v
+
+    def _row(self, color: Color) -> memoryview:
+        row = self._rows.get(color)
+        if row is None:
+            if len(self._rows) >= 64:
+                # Theme colors are a handful; this only trips on runtime color churn.
+                self._rows.clear()
+            row = memoryview(array("H", [self.pack(color)]) * self.w)
+            self._rows[color] = row
+        return row
+
+    def _span(self, y: int, x0: int, x1: int, row: memoryview) -> None:
+        # [x0, x1) on row y, clipped to the canvas
+        if y < 0 or y >= self.h:
+            return
+        if x0 < 0:
+            x0 = 0
+        if x1 > self.w:
+            x1 = self.w
+        if x1 <= x0:
+            return
+        off = y * self.stride
+        self.pixels[off + x0:off + x1] = row[:x1 - x0]
+
+    def _font(self, font_key: str) -> MaskFont:
+        font = self.fonts.get(font_key)
+        if font is None:
+            self.log.warn("missing_font_key", font_key=font_key, available=list(self.fonts.keys()))
+            font = next(iter(self.fonts.values()))
+        return font
+
+    # ---- Canvas API ----
+    def fill(self, color: Color) -> None:
+        row = self._row(color)
+        for y in range(self.h):
+            self._span(y, 0, self.w, row)
+
+    def round_rect(
+        self,
+        rect: Rect,
+        radius: int,
+        color: Color,
+        *,
+        fill: bool = True,
+        width: int = 1,
+    ) -> None:
+        x, y, w, h = (int(v) for v in rect)
+        if w <= 0 or h <= 0:
+            return
+        r = max(0, min(int(radius), min(w, h) // 2))
+        t = int(width)
+        row = self._row(color)
+        outer = _round_rect_insets(h, r)
+
+        if fill or t <= 0 or 2 * t >= min(w, h):
+            for i in range(h):
+                inset = outer[i]
+                self._span(y + i, x + inset, x + w - inset, row)
+            return
+
+        iw, ih = w - 2 * t, h - 2 * t
+        inner = _round_rect_insets(ih, max(0, r - t))
+        for i in range(h):
+            a = x + outer[i]
+            b = x + w - outer[i]
+            j = i - t
+            if 0 <= j < ih:
+                self._span(y + i, a, x + t + inner[j], row)
+                self._span(y + i, x + t + iw - inner[j], b, row)
+            else:
+                self._span(y + i, a, b, row)
+
+    def circle(self, center: Point, r: int, color: Color, *, width: int = 1) -> None:
+        self._circle(int(center[0]), int(center[1]), int(r), int(width), self._row(color))
+
+    def _circle(self, cx: int, cy: int, r: int, t: int, row) -> None:
+        if r < 0:
+            return
+        outer = _circle_half_widths(r)
+
+        if t <= 0 or t >= r:
+            for dy in range(-r, r + 1):
+                hw = outer[abs(dy)]
+                self._span(cy + dy, cx - hw, cx + hw + 1, row)
+            return
+
+        ri = r - t
+        hole = _circle_hole_widths(ri)
+        for dy in range(-r, r + 1):
+            ady = abs(dy)
+            hw = outer[ady]
+            hi = hole[ady] if ady <= ri else -1
+            if hi < 0:
+                self._span(cy + dy, cx - hw, cx + hw + 1, row)
+            else:
+                self._span(cy + dy, cx - hw, cx - hi, row)
+                self._span(cy + dy, cx + hi + 1, cx + hw + 1, row)
+
+    def arc(
+        self,
+        rect: Rect,
+        start_rad: float,
+        end_rad: float,
+        color: Color,
+        *,
+        width: int = 1,
+    ) -> None:
+        x, y, w, h = (int(v) for v in rect)
+        if w <= 0 or h <= 0:
+            return
+        t = max(1, int(width))
+        row = self._row(color)
+
+        rx, ry = w / 2.0, h / 2.0
+        cx, cy = x + rx, y + ry
+        irx, iry = rx - t, ry - t
+
+        start = float(start_rad) % _TWO_PI
+        sweep = float(end_rad) - float(start_rad)
+        full = sweep >= _TWO_PI
+        sweep %= _TWO_PI
+
+        for py in range(y, y + h):
+            fy = (py + 0.5) - cy
+            ny = fy / ry
+            if ny * ny > 1.0:
+                continue
+            ox = rx * math.sqrt(1.0 - ny * ny)
+
+            # candidate columns: outer span minus the inner ellipse's interior
+            ranges = [(int(math.floor(cx - ox)), int(math.ceil(cx + ox)))]
+            if irx > 0 and iry > 0 and abs(fy) < iry:
+                ix = irx * math.sqrt(1.0 - (fy / iry) ** 2)
+                ranges = [
+                    (ranges[0][0], int(math.ceil(cx - ix)) + 1),
+                    (int(math.floor(cx + ix)) - 1, ranges[0][1]),
+                ]
+
+            for lo, hi in ranges:
+                run_start = None
+                for px in range(lo, hi + 1):
+                    inside = False
+                    if px < hi:
+                        fx = (px + 0.5) - cx
+                        d_out = (fx / rx) ** 2 + ny * ny
+                        d_in = ((fx / irx) ** 2 + (fy / iry) ** 2) if irx > 0 and iry > 0 else 2.0
+                        if d_out <= 1.0 and d_in >= 1.0:
+                            if full:
+                                inside = True
+                            else:
+                                a = math.atan2(-fy, fx) % _TWO_PI
+                                inside = ((a - start) % _TWO_PI) <= sweep
+                    if inside:
+                        if run_start is None:
+                            run_start = px
+                    elif run_start is not None:
+                        self._span(py, run_start, px, row)
+                        run_start = None
+
+    def line(self, p1: Point, p2: Point, color: Color, *, width: int = 1) -> None:
+        t = max(1, int(width))
+        self._line(int(p1[0]), int(p1[1]), int(p2[0]), int(p2[1]), (t - 1) // 2, t // 2, self._row(color))
+
+    def lines(self, segments, color: Color, *, width: int = 1) -> None:
+        t = max(1, int(width))
+        lo, hi = (t - 1) // 2, t // 2
+        row = self._row(color)
+        s = segments
+        for i in range(0, len(s) - 3, 4):
+            self._line(int(s[i]), int(s[i + 1]), int(s[i + 2]), int(s[i + 3]), lo, hi, row)
+
+    def polyline(self, points, color: Color, *, width: int = 1) -> None:
+        t = max(1, int(width))
+        lo, hi = (t - 1) // 2, t // 2
+        row = self._row(color)
+        p = points
+        for i in range(0, len(p) - 3, 2):
+            self._line(int(p[i]), int(p[i + 1]), int(p[i + 2]), int(p[i + 3]), lo, hi, row)
+
+    def circles(self, centers, r: int, color: Color, *, width: int = 1) -> None:
+        r, t = int(r), int(width)
+        row = self._row(color)
+        c = centers
+        for i in range(0, len(c) - 1, 2):
+            self._circle(int(c[i]), int(c[i + 1]), r, t, row)
+
+    def _line(self, x0: int, y0: int, x1: int, y1: int, lo: int, hi: int, row) -> None:
+        # Bresenham; `lo`/`hi` pixels of thickness on either side of the spine
+        dx, dy = abs(x1 - x0), abs(y1 - y0)
+        if dx >= dy:
+            # x-major: collect horizontal runs, thicken vertically
+            if x0 > x1:
+                x0, y0, x1, y1 = x1, y1, x0, y0
+            sy = 1 if y1 >= y0 else -1
+            err = dx // 2
+            yy = y0
+            start = x0
+            for xx in range(x0, x1 + 1):
+                err -= dy
+                if err < 0:
+                    for o in range(-lo, hi + 1):
+                        self._span(yy + o, start, xx + 1, row)
+                    yy += sy
+                    err += dx
+                    start = xx + 1
+            if start <= x1:
+                for o in range(-lo, hi + 1):
+                    self._span(yy + o, start, x1 + 1, row)
+            return
+
+        # y-major: one point per row, thickened horizontally
+        if y0 > y1:
+            x0, y0, x1, y1 = x1, y1, x0, y0
+        sx = 1 if x1 >= x0 else -1
+        err = dy // 2
+        xx = x0
+        for yy in range(y0, y1 + 1):
+            self._span(yy, xx - lo, xx + hi + 1, row)
+            err -= dx
+            if err < 0:
+                xx += sx
+                err += dy
+
+    def glyph_atlas(self, font_key: str) -> GlyphAtlas:
+        """
+        Atlas for a font key, rasterized on first use (or via build_glyph_atlases()).
+        """
+        atlas = self._atlases.get(font_key)
+        if atlas is None:
+            with self._font_lock:
+                atlas = self._atlases.get(font_key)
+                if atlas is None:
+                    atlas = GlyphAtlas(self._font(font_key), self.glyph_charset)
+                    self._atlases[font_key] = atlas
+                    self.log.debug("glyph_atlas_built", font_key=font_key, glyphs=len(atlas.cells), w=atlas.width, h=atlas.height)
+        return atlas
+
+    def build_glyph_atlases(self, font_keys=None) -> None:
+        """
+        Rasterize atlases up front (startup) instead of on first text() call.
+        """
+        for key in (font_keys if font_keys is not None else self.fonts.keys()):
+            self.glyph_atlas(key)
+
+    def _text_runs(self, font_key: str, s: str) -> List[Tuple[int, int, int]]:
+        # Cache thresholded glyph runs per string (bounded LRU)
+        key = (font_key, s)
+        runs = self._text_cache.get(key)
+        if runs is None:
+            with self._font_lock:
+                w, h, cov = self._font(font_key).mask(s)
+            runs = []
+            for yy in range(h):
+                off = yy * w
+                start = None
+                for xx in range(w + 1):
+                    on = xx < w and cov[off + xx] >= _TEXT_COVERAGE_MIN
+                    if on and start is None:
+                        start = xx
+                    elif not on and start is not None:
+                        runs.append((yy, start, xx))
+                        start = None
+            self._text_cache.put(key, runs)
+        return runs
+
+    def text(self, font_key: str, x: int, y: int, s: str, color: Color) -> None:
+        row = self._row(color)
+        x, y = int(x), int(y)
+
+        if self.use_glyph_atlas:
+            atlas = self.glyph_atlas(font_key)
+            if atlas.covers(s):
+                # compose from glyph cells
+                runs = atlas.runs
+                cells = atlas.cells
+                for ch in s:
+                    for dy, a, b in runs[ch]:
+                        self._span(y + dy, x + a, x + b, row)
+                    x += cells[ch][2]
+                return
+
+        for dy, a, b in self._text_runs(font_key, s):
+            self._span(y + dy, x + a, x + b, row)
+
+    def text_size(self, font_key: str, s: str) -> Tuple[int, int]:
+        if self.use_glyph_atlas:
+            atlas = self.glyph_atlas(font_key)
+            if atlas.covers(s):
+                return atlas.size(s)
+
+        # Cache font.size results (bounded LRU)
+        key = (font_key, s)
+        v = self._size_cache.get(key)
+        if v is None:
+            with self._font_lock:
+                v = self._font(font_key).size(s)
+            self._size_cache.put(key, v)
+        return v
+
+    def warm_text(self, font_key: str, s: str, color: Color) -> None:
+        """
+        Fill the text/size caches for one string without drawing
+        (see render/warmup.py). May run on a warm-up thread while the render
+        loop draws: font access on both sides goes through _font_lock.
+        """
+        self._row(color)
+        if self.use_glyph_atlas and self.glyph_atlas(font_key).covers(s):
+            return
+        self._text_runs(font_key, s)
+        self.text_size(font_key, s)
+
+    # ---- bitmap capability (BitmapCanvas) ----
+    # Bitmaps are (w, h, bytearray) in this buffer's pixel format.
+    def copy_rect(self, rect: Rect) -> Tuple[int, int, bytearray]:
+        # Region is clipped to the canvas.
+        r = clip_rect(rect, self.w, self.h)
+        if r is None:
+            return (0, 0, bytearray())
+        x, y, w, h = r
+        rb = w * 2
+        sb = self.stride * 2
+        out = bytearray(rb * h)
+        for i in range(h):
+            s = (y + i) * sb + x * 2
+            out[i * rb:(i + 1) * rb] = self.buffer[s:s + rb]
+        return (w, h, out)
+
+    def blit(self, bitmap: Tuple[int, int, bytearray], x: int, y: int) -> None:
+        bw, bh, data = bitmap
+        x, y = int(x), int(y)
+        r = clip_rect((x, y, bw, bh), self.w, self.h)
+        if r is None:
+            return
+        cx, cy, cw, ch = r
+        src = memoryview(data)
+        rb = cw * 2
+        sb = self.stride * 2
+        for i in range(ch):
+            so = ((cy - y + i) * bw + (cx - x)) * 2
+            do = (cy + i) * sb + cx * 2
+            self.buffer[do:do + rb] = src[so:so + rb]
+
+    def bitmap_size(self, bitmap: Tuple[int, int, bytearray]) -> Tuple[int, int]:
+        return (bitmap[0], bitmap[1])
+
+    def bitmap_nbytes(self, bitmap: Tuple[int, int, bytearray]) -> int:
+        return len(bitmap[2])
@@ -0,0 +1,457 @@
+# backends/canvas_numpy.py
+from __future__ import annotations
+
+import math
+import threading
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from msui.backends.cache import LRUCache
+from msui.backends.canvas import BitmapCanvas, Canvas, Color, Point, Rect, clip_rect
+from msui.backends.canvas_fb import rgb565
+from msui.backends.fonts import MaskFont
+from msui.backends.glyph_atlas import DEFAULT_CHARSET, GlyphAtlas
+from msui.log import LogMixin
+
+_TWO_PI = 2.0 * math.pi
+
+# Same 1-bit text threshold as the framebuffer backend.
+_TEXT_COVERAGE_MIN = 128
+
+FORMATS = ("rgb565", "rgb888")
+
+
+def _array_nbytes(a: np.ndarray) -> int:
+    return int(a.nbytes)
+
+
+class NumpyCanvas(LogMixin, Canvas, BitmapCanvas):
+    """
+    Pure NumPy software rasterizer.
+
+    Draws into `self.fb`, an ndarray framebuffer:
+      - fmt="rgb565": shape (h, w), uint16 (numeric RGB565, host order)
+      - fmt="rgb888": shape (h, w, 3), uint8
+
+    Shapes are rasterized as boolean masks that are computed once per geometry
+    (bounded LRU) and then stamped with a single vectorized assignment; lines
+    are vectorized point spans. No per-pixel Python loops in the draw path.
+    """
+
+    def __init__(
+        self,
+        w: int,
+        h: int,
+        fonts: Dict[str, MaskFont],
+        *,
+        fmt: str = "rgb565",
+        buffer=None,
+        mask_cache_max: int = 256,
+        text_cache_max: int = 256,
+        size_cache_max: int = 512,
+        glyph_atlas: bool = True,
+        glyph_charset: str = DEFAULT_CHARSET,
+    ):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown fmt: {fmt!r} (expected one of {FORMATS})")
+
+        self.w = int(w)
+        self.h = int(h)
+        self.fmt = fmt
+        self.fonts = fonts
+
+        shape = (self.h, self.w) if fmt == "rgb565" else (self.h, self.w, 3)
+        dtype = np.uint16 if fmt == "rgb565" else np.uint8
+        if buffer is None:
+            self.fb = np.zeros(shape, dtype=dtype)
+        else:
+            # Wrap an existing writable buffer (mmap, shared memory, ...) without copying.
+            self.fb = np.frombuffer(buffer, dtype=dtype, count=int(np.prod(shape))).reshape(shape)
+
+        self._colors: Dict[Color, object] = {}
+
+        # Glyph atlases per font key: (GlyphAtlas, boolean atlas mask)
+        self.use_glyph_atlas = bool(glyph_atlas)
+        self.glyph_charset = glyph_charset
+        self._atlases: Dict[str, Tuple[GlyphAtlas, np.ndarray]] = {}
+
+        # Bounded caches (memory safe)
+        # masks are measured (nbytes in stats()), capped by entry count
+        self._mask_cache = LRUCache(mask_cache_max, sizeof=_array_nbytes)
+        self._text_cache = LRUCache(text_cache_max, sizeof=_array_nbytes)
+        self._size_cache = LRUCache(size_cache_max)
+
+        # Serializes font.mask()/size() and atlas builds between the render
+        # loop and a warm-up thread (see warm_text()); cache hits skip it.
+        self._font_lock = threading.RLock()
+
+        self.log.info(
+            "canvas_init",
+            backend="numpy",
+            w=self.w,
+            h=self.h,
+            fmt=self.fmt,
+            fonts=list(fonts.keys()),
+            glyph_atlas=self.use_glyph_atlas,
+        )
+
+    def caches(self) -> Dict[str, LRUCache]:
+        """
+        Named LRU caches, for stats (see Profiler.watch_cache()).
+        """
+        return {"mask": self._mask_cache, "text": self._text_cache, "size": self._size_cache}
+
+    def clear_caches(self) -> None:
+        """
+        Call this if fonts/theme are swapped at runtime.
+        """
+        self.log.info("canvas_clear_caches")
+        self._mask_cache.clear()
+        self._text_cache.clear()
+        self._size_cache.clear()
+        self._colors.clear()
+        self._atlases.clear()
+
+    # ---- helpers ----
+    def _pix(self, color: Color):
+        v = self._colors.get(color)
+        if v is None:
+            if self.fmt == "rgb565":
+                v = np.uint16(rgb565(color))
+            else:
+                v = np.array(color[:3], dtype=np.uint8)
+            self._colors[color] = v
+        return v
+
+    def _stamp(self, mask: np.ndarray, x: int, y: int, color: Color) -> None:
+        # Paint `color` where mask is True, with mask's top-left at (x, y); clipped.
+        mh, mw = mask.shape
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(self.w, x + mw), min(self.h, y + mh)
+        if x1 <= x0 or y1 <= y0:
+            return
+        sub = mask[y0 - y:y1 - y, x0 - x:x1 - x]
+        self.fb[y0:y1, x0:x1][sub] = self._pix(color)
+
+    def _font(self, font_key: str) -> MaskFont:
+        font = self.fonts.get(font_key)
+        if font is None:
+            self.log.warn("missing_font_key", font_key=font_key, available=list(self.fonts.keys()))
+            font = next(iter(self.fonts.values()))
+        return font
+
+    def _mask(self, key, build) -> np.ndarray:
+        m = self._mask_cache.get(key)
+        if m is None:
+            m = build()
+            m.setflags(write=False)
+            self._mask_cache.put(key, m)
+        return m
+
+    # ---- mask builders ----
+    @staticmethod
+    def _rr_filled(w: int, h: int, r: int) -> np.ndarray:
+        if r <= 0:
+            return np.ones((h, w), dtype=bool)
+        # per-row insets from the corner circle (matches canvas_fb spans)
+        i = np.arange(h)
+        d = np.minimum(i, h - 1 - i)  # rows from nearest edge
+        dy = np.clip(r - d, 0, r)
+        half = np.floor(np.sqrt(np.maximum(r * r - dy * dy, 0))).astype(np.int64)
+        inset = np.where(d < r, r - half, 0)
+        cols = np.arange(w)[None, :]
+        return (cols >= inset[:, None]) & (cols < (w - inset)[:, None])
+
+    def _round_rect_mask(self, w: int, h: int, r: int, t: int) -> np.ndarray:
+        def build():
+            outer = self._rr_filled(w, h, r)
+            if t <= 0:
+                return outer
+            inner = self._rr_filled(w - 2 * t, h - 2 * t, max(0, r - t))
+            out = outer.copy()
+            out[t:h - t, t:w - t] &= ~inner
+            return out
+
+        return self._mask(("rr", w, h, r, t), build)
+
+    def _circle_mask(self, r: int, t: int) -> np.ndarray:
+        def build():
+            yy, xx = np.ogrid[-r:r + 1, -r:r + 1]
+            d2 = xx * xx + yy * yy
+            m = d2 <= r * r
+            if 0 < t < r:
+                ri = r - t
+                m &= d2 >= ri * ri
+            return m
+
+        return self._mask(("circle", r, t), build)
+
+    def _arc_mask(self, w: int, h: int, start: float, end: float, t: int) -> np.ndarray:
+        def build():
+            rx, ry = w / 2.0, h / 2.0
+            fy = (np.arange(h) + 0.5 - ry)[:, None]
+            fx = (np.arange(w) + 0.5 - rx)[None, :]
+            m = (fx / rx) ** 2 + (fy / ry) ** 2 <= 1.0
+            irx, iry = rx - t, ry - t
+            if irx > 0 and iry > 0:
+                m &= (fx / irx) ** 2 + (fy / iry) ** 2 >= 1.0
+            sweep = end - start
+            if sweep < _TWO_PI:
+                a = np.arctan2(-fy, fx) % _TWO_PI
+                m &= ((a - (start % _TWO_PI)) % _TWO_PI) <= (sweep % _TWO_PI)
+            return m
+
+        return self._mask(("arc", w, h, start, end, t), build)
+
+    # ---- Canvas API ----
+    def fill(self, color: Color) -> None:
+        self.fb[...] = self._pix(color)
+
+    def round_rect(
+        self,
+        rect: Rect,
+        radius: int,
+        color: Color,
+        *,
+        fill: bool = True,
+        width: int = 1,
+    ) -> None:
+        x, y, w, h = (int(v) for v in rect)
+        if w <= 0 or h <= 0:
+            return
+        r = max(0, min(int(radius), min(w, h) // 2))
+        t = int(width)
+        if fill or t <= 0 or 2 * t >= min(w, h):
+            t = 0
+            if r == 0:
+                # plain rect: direct slice fill
+                x0, y0 = max(0, x), max(0, y)
+                x1, y1 = min(self.w, x + w), min(self.h, y + h)
+                if x1 > x0 and y1 > y0:
+                    self.fb[y0:y1, x0:x1] = self._pix(color)
+                return
+        self._stamp(self._round_rect_mask(w, h, r, t), x, y, color)
+
+    def circle(self, center: Point, r: int, color: Color, *, width: int = 1) -> None:
+        r = int(r)
+        if r < 0:
+            return
+        t = int(width)
+        if t >= r:
+            t = 0
+        self._stamp(self._circle_mask(r, max(0, t)), int(center[0]) - r, int(center[1]) - r, color)
+
+    def arc(
+        self,
+        rect: Rect,
+        start_rad: float,
+        end_rad: float,
+        color: Color,
+        *,
+        width: int = 1,
+    ) -> None:
+        x, y, w, h = (int(v) for v in rect)
+        if w <= 0 or h <= 0:
+            return
+        m = self._arc_mask(w, h, float(start_rad), float(end_rad), max(1, int(width)))
+        self._stamp(m, x, y, color)
+
+    def line(self, p1: Point, p2: Point, color: Color, *, width: int = 1) -> None:
+        x0, y0 = int(p1[0]), int(p1[1])
+        x1, y1 = int(p2[0]), int(p2[1])
+        t = max(1, int(width))
+        lo, hi = (t - 1) // 2, t // 2
+
+        n = max(abs(x1 - x0), abs(y1 - y0)) + 1
+        # Round offsets from p1, not absolute coords: rint() rounds ties to even,
+        # which would make a line's shape depend on where it is drawn.
+        xs = x0 + np.rint(np.linspace(0, x1 - x0, n)).astype(np.intp)
+        ys = y0 + np.rint(np.linspace(0, y1 - y0, n)).astype(np.intp)
+
+        if t > 1:
+            off = np.arange(-lo, hi + 1, dtype=np.intp)
+            if abs(x1 - x0) >= abs(y1 - y0):
+                ys = (ys[:, None] + off[None, :]).ravel()
+                xs = np.repeat(xs, t)
+            else:
+                xs = (xs[:, None] + off[None, :]).ravel()
+                ys = np.repeat(ys, t)
+
+        keep = (xs >= 0) & (xs < self.w) & (ys >= 0) & (ys < self.h)
+        self.fb[ys[keep], xs[keep]] = self._pix(color)
+
+    def lines(self, segments, color: Color, *, width: int = 1) -> None:
+        seg = np.asarray(segments, dtype=np.intp)
+        seg = seg[:seg.size - seg.size % 4].reshape(-1, 4)
+        if not len(seg):
+            return
+        t = max(1, int(width))
+        lo, hi = (t - 1) // 2, t // 2
+
+        x0, y0 = seg[:, 0], seg[:, 1]
+        dx, dy = seg[:, 2] - x0, seg[:, 3] - y0
+        n = np.maximum(np.abs(dx), np.abs(dy)) + 1
+
+        # One index run 0..n-1 per segment, then the same arithmetic as
+        # np.linspace(0, d, n) in line() so batched and single lines match.
+        total = int(n.sum())
+        start = np.repeat(np.cumsum(n) - n, n)
+        i = np.arange(total, dtype=np.intp) - start
+        div = np.maximum(n - 1, 1).astype(np.float64)
+        fx = i * np.repeat(dx / div, n)
+        fy = i * np.repeat(dy / div, n)
+        last = np.cumsum(n) - 1
+        fx[last] = dx
+        fy[last] = dy
+        xs = np.repeat(x0, n) + np.rint(fx).astype(np.intp)
+        ys = np.repeat(y0, n) + np.rint(fy).astype(np.intp)
+
+        if t > 1:
+            off = np.arange(-lo, hi + 1, dtype=np.intp)
+            horiz = np.repeat(np.abs(dx) >= np.abs(dy), n)[:, None]
+            xs = (xs[:, None] + np.where(horiz, 0, off[None, :])).ravel()
+            ys = (ys[:, None] + np.where(horiz, off[None, :], 0)).ravel()
+
+        keep = (xs >= 0) & (xs < self.w) & (ys >= 0) & (ys < self.h)
+        self.fb[ys[keep], xs[keep]] = self._pix(color)
+
+    def polyline(self, points, color: Color, *, width: int = 1) -> None:
+        p = np.asarray(points, dtype=np.intp)
+        p = p[:p.size - p.size % 2].reshape(-1, 2)
+        if len(p) < 2:
+            return
+        self.lines(np.concatenate((p[:-1], p[1:]), axis=1), color, width=width)
+
+    def circles(self, centers, r: int, color: Color, *, width: int = 1) -> None:
+        r = int(r)
+        if r < 0:
+            return
+        t = int(width)
+        if t >= r:
+            t = 0
+        m = self._circle_mask(r, max(0, t))
+        c = centers
+        for k in range(0, len(c) - 1, 2):
+            self._stamp(m, int(c[k]) - r, int(c[k + 1]) - r, color)
+
+    def glyph_atlas(self, font_key: str) -> Tuple[GlyphAtlas, np.ndarray]:
+        """
+        (atlas, boolean coverage mask) for a font key, rasterized on first use.
+        """
+        entry = self._atlases.get(font_key)
+        if entry is None:
+            with self._font_lock:
+                entry = self._atlases.get(font_key)
+                if entry is None:
+                    atlas = GlyphAtlas(self._font(font_key), self.glyph_charset)
+                    cov = np.frombuffer(atlas.coverage, dtype=np.uint8).reshape(atlas.height, atlas.width)
+                    entry = (atlas, cov >= _TEXT_COVERAGE_MIN)
+                    self._atlases[font_key] = entry
+                    self.log.debug("glyph_atlas_built", font_key=font_key, glyphs=len(atlas.cells), w=atlas.width, h=atlas.height)
+        return entry
+
+    def build_glyph_atlases(self, font_keys=None) -> None:
+        """
+        Rasterize atlases up front (startup) instead of on first text() call.
+        """
+        for key in (font_keys if font_keys is not None else self.fonts.keys()):
+            self.glyph_atlas(key)
+
+    def _text_mask(self, font_key: str, s: str) -> np.ndarray:
+        key = (font_key, s)
+        m = self._text_cache.get(key)
+        if m is None:
+            with self._font_lock:
+                w, h, cov = self._font(font_key).mask(s)
+            m = np.frombuffer(cov, dtype=np.uint8).reshape(h, w) >= _TEXT_COVERAGE_MIN
+            self._text_cache.put(key, m)
+        return m
+
+    def text(self, font_key: str, x: int, y: int, s: str, color: Color) -> None:
+        x, y = int(x), int(y)
+
+        if self.use_glyph_atlas:
+            atlas, mask = self.glyph_atlas(font_key)
+            if atlas.covers(s):
+                # compose from glyph cells (mask slices are views, no copies)
+                for ch in s:
+                    gx, gw, adv = atlas.cells[ch]
+                    if gw and atlas.runs[ch]:
+                        self._stamp(mask[:, gx:gx + gw], x, y, color)
+                    x += adv
+                return
+
+        m = self._text_mask(font_key, s)
+        if m.size:
+            self._stamp(m, x, y, color)
+
+    def text_size(self, font_key: str, s: str) -> Tuple[int, int]:
+        if self.use_glyph_atlas:
+            atlas, _ = self.glyph_atlas(font_key)
+            if atlas.covers(s):
+                return atlas.size(s)
+
+        # Cache font.size results (bounded LRU)
+        key = (font_key, s)
+        v = self._size_cache.get(key)
+        if v is None:
+            with self._font_lock:
+                v = self._font(font_key).size(s)
+            self._size_cache.put(key, v)
+        return v
+
+    def warm_text(self, font_key: str, s: str, color: Color) -> None:
+        """
+        Fill the text/size caches for one string without drawing
+        (see render/warmup.py). May run on a warm-up thread while the render
+        loop draws: font access on both sides goes through _font_lock.
+        """
+        self._pix(color)
+        if self.use_glyph_atlas and self.glyph_atlas(font_key)[0].covers(s):
+            return
+        self._text_mask(font_key, s)
+        self.text_size(font_key, s)
+
+    # ---- bitmap capability (BitmapCanvas) ----
+    def copy_rect(self, rect: Rect) -> np.ndarray:
+        # Region is clipped to the canvas.
+        r = clip_rect(rect, self.w, self.h)
+        if r is None:
+            return self.fb[0:0, 0:0].copy()
+        x, y, w, h = r
+        return self.fb[y:y + h, x:x + w].copy()
+
+    def blit(self, bitmap: np.ndarray, x: int, y: int) -> None:
+        x, y = int(x), int(y)
+        bh, bw = bitmap.shape[:2]
+        r = clip_rect((x, y, bw, bh), self.w, self.h)
+        if r is None:
+            return
+        cx, cy, cw, ch = r
+        self.fb[cy:cy + ch, cx:cx + cw] = bitmap[cy - y:cy - y + ch, cx - x:cx - x + cw]
+
+    def bitmap_size(self, bitmap: np.ndarray) -> Tuple[int, int]:
+        return (int(bitmap.shape[1]), int(bitmap.shape[0]))
+
+    def bitmap_nbytes(self, bitmap: np.ndarray) -> int:
+        return int(bitmap.nbytes)
+
+    # ---- export helpers ----
+    def to_rgb888(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Expand the framebuffer to (h, w, 3) uint8 (e.g. for saving/inspection).
+        """
+        if self.fmt == "rgb888":
+            if out is None:
+                return self.fb.copy()
+            np.copyto(out, self.fb)
+            return out
+
+        v = self.fb
+        if out is None:
+            out = np.empty((self.h, self.w, 3), dtype=np.uint8)
+        out[..., 0] = ((v >> 11) & 0x1F) << 3
+        out[..., 1] = ((v >> 5) & 0x3F) << 2
+        out[..., 2] = (v & 0x1F) << 3
+        return out
@@ -1,64 +1,65 @@
 # backends/canvas_pygame.py
 from __future__ import annotations
 
+import threading
+
 import pygame
-from typing import Dict, Tuple
-from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
 
-from msui.backends.canvas import Canvas, Color, Point, Rect
+from msui.backends.cache import LRUCache as _LRUCache
+from msui.backends.canvas import BitmapCanvas, Canvas, Color, Point, Rect, clip_rect
+from msui.backends.glyph_atlas import DEFAULT_CHARSET
 from msui.log import LogMixin
 
 
-class _LRUCache(LogMixin):
+def _surface_nbytes(surf: pygame.Surface) -> int:
+    w, h = surf.get_size()
+    return w * h * surf.get_bytesize()
+
+
+class PygameGlyphAtlas:
     """
-    Tiny LRU cache with a hard cap to avoid unbounded growth.
+    All glyphs of one (font, color) pair rendered once into a single SRCALPHA
+    surface. text() then blits cells from it instead of calling font.render()
+    for every new string.
+
+      - cells[ch] = (area Rect in the atlas, pen advance)
+
+    Per-glyph composition ignores kerning, so strings can differ from
+    font.render() by a pixel here and there; that's why it's opt-in.
     """
-    def __init__(self, capacity: int):
-        self.capacity = max(0, int(capacity))
-        self._od: "OrderedDict[object, object]" = OrderedDict()
-        self.log.debug("lru_init", capacity=self.capacity)
-
-    def get(self, key):
-        if self.capacity <= 0:
-            return None
-        try:
-            val = self._od.pop(key)
-        except KeyError:
-            return None
-        # re-insert as most-recent
-        self._od[key] = val
-        return val
-
-    def put(self, key, val) -> None:
-        if self.capacity <= 0:
-            return
-
-        if key in self._od:
-            # refresh position
-            try:
-                self._od.pop(key)
-            except KeyError:
-                pass
-
-        self._od[key] = val
-
-        # evict least-recent
-        evicted = 0
-        while len(self._od) > self.capacity:
-            self._od.popitem(last=False)
-            evicted += 1
-
-        if evicted:
-            # DEBUG only; avoids spam
-            self.log.debug("lru_evicted", count=evicted, size=len(self._od), capacity=self.capacity)
-
-    def clear(self) -> None:
-        n = len(self._od)
-        self._od.clear()
-        self.log.debug("lru_cleared", prev_size=n)
-
-
-class PygameCanvas(LogMixin, Canvas):
+
+    def __init__(self, font: pygame.font.Font, color: Color, charset: str = DEFAULT_CHARSET):
+        images = []
+        for ch in dict.fromkeys(charset):  # dedupe, keep order
+            img = font.render(ch, True, color)
+            images.append((ch, img, font.size(ch)[0]))
+
+        self.height = max((img.get_height() for _, img, _ in images), default=0)
+        self.width = sum(img.get_width() for _, img, _ in images)
+        self.surface = pygame.Surface((max(1, self.width), max(1, self.height)), pygame.SRCALPHA)
+        self.cells: Dict[str, Tuple[pygame.Rect, int]] = {}
+
+        x = 0
+        for ch, img, adv in images:
+            w, h = img.get_size()
+            self.surface.blit(img, (x, 0))
+            self.cells[ch] = (pygame.Rect(x, 0, w, h), adv)
+            x += w
+
+    def covers(self, s: str) -> bool:
+        cells = self.cells
+        for ch in s:
+            if ch not in cells:
+                return False
+        return True
+
+    def size(self, s: str) -> Tuple[int, int]:
+        cells = self.cells
+        return (sum(cells[ch][1] for ch in s), self.height)
+
+
+class PygameCanvas(LogMixin, Canvas, BitmapCanvas):
     """
     Pygame implementation of the stable Canvas interface.
     Keeps pygame isolated here.
@@ -70,16 +71,31 @@ class PygameCanvas(LogMixin, Canvas):
         h: int,
         fonts: Dict[str, pygame.font.Font],
         *,
-        text_cache_max: int = 512,
+        text_cache_max: Optional[int] = 512,
         size_cache_max: int = 1024,
+        text_cache_bytes: int = 0,
+        glyph_atlas: bool = False,
+        glyph_charset: str = DEFAULT_CHARSET,
     ):
         self.w = int(w)
         self.h = int(h)
         self.surface = pygame.Surface((self.w, self.h))
         self.fonts = fonts
 
-        # Bounded caches (memory safe)
-        self._text_cache = _LRUCache(text_cache_max)
+        # Glyph atlases per (font_key, color); see PygameGlyphAtlas.
+        self.use_glyph_atlas = bool(glyph_atlas)
+        self.glyph_charset = glyph_charset
+        self._atlases: Dict[Tuple[str, Color], PygameGlyphAtlas] = {}
+        # First atlas per font_key, for text_size(): metrics don't depend on color.
+        self._metrics: Dict[str, PygameGlyphAtlas] = {}
+
+        # Serializes font.render()/size() and atlas builds between the render
+        # loop and a warm-up thread (see warm_text()); cache hits skip it.
+        self._font_lock = threading.RLock()
+
+        # Bounded caches (memory safe). Text surfaces are always measured, so
+        # stats() reports their bytes; text_cache_bytes > 0 also caps them.
+        self._text_cache = _LRUCache(text_cache_max, max_bytes=text_cache_bytes, sizeof=_surface_nbytes)
         self._size_cache = _LRUCache(size_cache_max)
 
         # Helpful init log (INFO is fine; it happens once)
@@ -89,8 +105,10 @@ class PygameCanvas(LogMixin, Canvas):
             w=self.w,
             h=self.h,
             fonts=list(fonts.keys()),
-            text_cache_max=int(text_cache_max),
+            text_cache_max=text_cache_max,
             size_cache_max=int(size_cache_max),
+            text_cache_bytes=int(text_cache_bytes),
+            glyph_atlas=self.use_glyph_atlas,
         )
 
     def clear_caches(self) -> None:
@@ -100,6 +118,48 @@ class PygameCanvas(LogMixin, Canvas):
         self.log.info("canvas_clear_caches")
         self._text_cache.clear()
         self._size_cache.clear()
+        self._atlases.clear()
+        self._metrics.clear()
+
+    def caches(self) -> Dict[str, _LRUCache]:
+        """
+        Named LRU caches, for stats (see Profiler.watch_cache()).
+        """
+        return {"text": self._text_cache, "size": self._size_cache}
+
+    def _font(self, font_key: str) -> pygame.font.Font:
+        font = self.fonts.get(font_key)
+        if font is None:
+            # This is a real bug, so warn loudly and fallback.
+            self.log.warn("missing_font_key", font_key=font_key, available=list(self.fonts.keys()))
+            # Pick any font deterministically to avoid crashing
+            font = next(iter(self.fonts.values()))
+        return font
+
+    def glyph_atlas(self, font_key: str, color: Color) -> PygameGlyphAtlas:
+        """
+        Atlas for (font_key, color), rendered on first use (or via build_glyph_atlases()).
+        """
+        key = (font_key, color)
+        atlas = self._atlases.get(key)
+        if atlas is None:
+            with self._font_lock:
+                atlas = self._atlases.get(key)
+                if atlas is None:
+                    atlas = PygameGlyphAtlas(self._font(font_key), color, self.glyph_charset)
+                    self._atlases[key] = atlas
+                    self._metrics.setdefault(font_key, atlas)
+                    self.log.debug("glyph_atlas_built", font_key=font_key, color=color, glyphs=len(atlas.cells), w=atlas.width, h=atlas.height)
+        return atlas
+
+    def build_glyph_atlases(self, colors: Iterable[Color], font_keys: Optional[Iterable[str]] = None) -> None:
+        """
+        Render atlases up front (startup) for the theme's text colors.
+        """
+        keys = list(font_keys) if font_keys is not None else list(self.fonts.keys())
+        for color in colors:
+            for key in keys:
+                self.glyph_atlas(key, color)
 
     def fill(self, color: Color) -> None:
         self.surface.fill(color)
@@ -159,22 +219,61 @@ class PygameCanvas(LogMixin, Canvas):
             int(width),
         )
 
+    def lines(self, segments, color: Color, *, width: int = 1) -> None:
+        surf, w, draw_line = self.surface, int(width), pygame.draw.line
+        s = segments
+        for i in range(0, len(s) - 3, 4):
+            draw_line(surf, color, (int(s[i]), int(s[i + 1])), (int(s[i + 2]), int(s[i + 3])), w)
+
+    def polyline(self, points, color: Color, *, width: int = 1) -> None:
+        p = points
+        pts = [(int(p[i]), int(p[i + 1])) for i in range(0, len(p) - 1, 2)]
+        if len(pts) >= 2:
+            # one call; same pixels as chained draw.line() segments
+            pygame.draw.lines(self.surface, color, False, pts, int(width))
+
+    def circles(self, centers, r: int, color: Color, *, width: int = 1) -> None:
+        surf, r, w, draw_circle = self.surface, int(r), int(width), pygame.draw.circle
+        c = centers
+        for i in range(0, len(c) - 1, 2):
+            draw_circle(surf, color, (int(c[i]), int(c[i + 1])), r, w)
+
     def text(self, font_key: str, x: int, y: int, s: str, color: Color) -> None:
+        if self.use_glyph_atlas:
+            atlas = self.glyph_atlas(font_key, color)
+            if atlas.covers(s):
+                # compose from glyph cells
+                x, y = int(x), int(y)
+                src = atlas.surface
+                blit = self.surface.blit
+                for ch in s:
+                    area, adv = atlas.cells[ch]
+                    blit(src, (x, y), area)
+                    x += adv
+                return
+
+        self.surface.blit(self._text_surface(font_key, s, color), (int(x), int(y)))
+
+    def _text_surface(self, font_key: str, s: str, color: Color) -> pygame.Surface:
         # Cache rendered surface (bounded LRU)
         key = (font_key, s, color)
         img = self._text_cache.get(key)
         if img is None:
-            font = self.fonts.get(font_key)
-            if font is None:
-                # This is a real bug, so warn loudly and fallback.
-                self.log.warn("missing_font_key", font_key=font_key, available=list(self.fonts.keys()))
-                # Pick any font deterministically to avoid crashing
-                font = next(iter(self.fonts.values()))
-            img = font.render(s, True, color)
+            with self._font_lock:
+                img = self._font(font_key).render(s, True, color)
             self._text_cache.put(key, img)
-        self.surface.blit(img, (int(x), int(y)))
+        return img
 
     def text_size(self, font_key: str, s: str) -> Tuple[int, int]:
+        if self.use_glyph_atlas:
+            # Metrics must match what text() composes, even before it has run
+            # for this font; any color's atlas has the same advances.
+            atlas = self._metrics.get(font_key)
+            if atlas is None:
+                atlas = self.glyph_atlas(font_key, (255, 255, 255))
+            if atlas.covers(s):
+                return atlas.size(s)
+
         # Cache font.size results (bounded LRU)
         key = (font_key, s)
         v = self._size_cache.get(key)
@@ -183,6 +282,40 @@ class PygameCanvas(LogMixin, Canvas):
             if font is None:
                 self.log.warn("missing_font_key_size", font_key=font_key, available=list(self.fonts.keys()))
                 font = next(iter(self.fonts.values()))
-            v = font.size(s)
+            with self._font_lock:
+                v = font.size(s)
             self._size_cache.put(key, v)
         return v
+
+    def warm_text(self, font_key: str, s: str, color: Color) -> None:
+        """
+        Fill the text/size caches for one string without drawing
+        (see render/warmup.py). May run on a warm-up thread while the render
+        loop draws: font access on both sides goes through _font_lock.
+        """
+        if self.use_glyph_atlas:
+            atlas = self.glyph_atlas(font_key, color)
+            if atlas.covers(s):
+                return
+
+        if (font_key, s, color) not in self._text_cache:
+            self._text_surface(font_key, s, color)
+        if (font_key, s) not in self._size_cache:
+            self.text_size(font_key, s)
+
+    # ---- bitmap capability (BitmapCanvas) ----
+    def copy_rect(self, rect: Rect) -> pygame.Surface:
+        # Region is clipped to the canvas.
+        r = clip_rect(rect, self.w, self.h)
+        if r is None:
+            return pygame.Surface((0, 0))
+        return self.surface.subsurface(pygame.Rect(*r)).copy()
+
+    def blit(self, bitmap: pygame.Surface, x: int, y: int) -> None:
+        self.surface.blit(bitmap, (int(x), int(y)))
+
+    def bitmap_size(self, bitmap: pygame.Surface) -> Tuple[int, int]:
+        return bitmap.get_size()
+
+    def bitmap_nbytes(self, bitmap: pygame.Surface) -> int:
+        return _surface_nbytes(bitmap)
@@ -0,0 +1,245 @@
+# backends/canvas_record.py
+from __future__ import annotations
+
+from array import array
+from typing import Dict, List, Tuple
+
+from msui.backends.canvas import Canvas, Color, Point, Rect, draw_circles, draw_lines, draw_polyline
+from msui.log import LogMixin
+
+# Opcodes (one byte each in DisplayList.ops)
+OP_FILL = 0
+OP_ROUND_RECT = 1
+OP_CIRCLE = 2
+OP_ARC = 3
+OP_LINE = 4
+OP_TEXT = 5
+OP_LINES = 6
+OP_POLYLINE = 7
+OP_CIRCLES = 8
+
+
+class DisplayList:
+    """
+    Compact, replayable list of Canvas calls.
+
+    Storage is array-backed:
+      - ops:     array('B') opcode per call
+      - ints:    array('i') integer operands, consumed in op order
+      - floats:  array('d') float operands (arc angles)
+      - colors / strings: interned tables referenced by index from `ints`
+
+    Operand layout per op (ints unless noted):
+      FILL        color
+      ROUND_RECT  x y w h radius color fill width
+      CIRCLE      cx cy r color width
+      ARC         x y w h color width        + floats: start end
+      LINE        x1 y1 x2 y2 color width
+      TEXT        font x y string color
+      LINES       color width n  x1 y1 x2 y2 ...   (n ints follow)
+      POLYLINE    color width n  x0 y0 x1 y1 ...   (n ints follow)
+      CIRCLES     color width r n  cx cy ...       (n ints follow)
+    """
+
+    __slots__ = ("ops", "ints", "floats", "colors", "strings")
+
+    def __init__(self) -> None:
+        self.ops = array("B")
+        self.ints = array("i")
+        self.floats = array("d")
+        self.colors: List[Color] = []
+        self.strings: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Approximate memory footprint of the operand arrays.
+        """
+        return (
+            len(self.ops) * self.ops.itemsize
+            + len(self.ints) * self.ints.itemsize
+            + len(self.floats) * self.floats.itemsize
+        )
+
+    def replay(self, canvas: Canvas, dx: int = 0, dy: int = 0) -> None:
+        """
+        Re-issue the recorded calls on `canvas`, translated by (dx, dy).
+        """
+        ints = self.ints
+        floats = self.floats
+        colors = self.colors
+        strings = self.strings
+        i = 0
+        f = 0
+
+        def coords(start: int, n: int) -> List[int]:
+            c = ints[start:start + n].tolist()
+            if dx or dy:
+                c[0::2] = [v + dx for v in c[0::2]]
+                c[1::2] = [v + dy for v in c[1::2]]
+            return c
+
+        for op in self.ops:
+            if op == OP_LINE:
+                canvas.line(
+                    (ints[i] + dx, ints[i + 1] + dy),
+                    (ints[i + 2] + dx, ints[i + 3] + dy),
+                    colors[ints[i + 4]],
+                    width=ints[i + 5],
+                )
+                i += 6
+            elif op == OP_CIRCLE:
+                canvas.circle((ints[i] + dx, ints[i + 1] + dy), ints[i + 2], colors[ints[i + 3]], width=ints[i + 4])
+                i += 5
+            elif op == OP_ROUND_RECT:
+                canvas.round_rect(
+                    (ints[i] + dx, ints[i + 1] + dy, ints[i + 2], ints[i + 3]),
+                    ints[i + 4],
+                    colors[ints[i + 5]],
+                    fill=bool(ints[i + 6]),
+                    width=ints[i + 7],
+                )
+                i += 8
+            elif op == OP_TEXT:
+                canvas.text(strings[ints[i]], ints[i + 1] + dx, ints[i + 2] + dy, strings[ints[i + 3]], colors[ints[i + 4]])
+                i += 5
+            elif op == OP_ARC:
+                canvas.arc(
+                    (ints[i] + dx, ints[i + 1] + dy, ints[i + 2], ints[i + 3]),
+                    floats[f],
+                    floats[f + 1],
+                    colors[ints[i + 4]],
+                    width=ints[i + 5],
+                )
+                i += 6
+                f += 2
+            elif op == OP_FILL:
+                canvas.fill(colors[ints[i]])
+                i += 1
+            elif op == OP_LINES:
+                n = ints[i + 2]
+                draw_lines(canvas, coords(i + 3, n), colors[ints[i]], width=ints[i + 1])
+                i += 3 + n
+            elif op == OP_POLYLINE:
+                n = ints[i + 2]
+                draw_polyline(canvas, coords(i + 3, n), colors[ints[i]], width=ints[i + 1])
+                i += 3 + n
+            elif op == OP_CIRCLES:
+                n = ints[i + 3]
+                draw_circles(canvas, coords(i + 4, n), ints[i + 2], colors[ints[i]], width=ints[i + 1])
+                i += 4 + n
+            else:
+                raise ValueError(f"Unknown display list opcode: {op}")
+
+
+class RecordingCanvas(LogMixin, Canvas):
+    """
+    Canvas that records draw calls into a DisplayList instead of drawing.
+
+    text_size() needs real font metrics, so it is delegated to `measure`
+    (normally the backend the list will be replayed on).
+    """
+
+    def __init__(self, w: int, h: int, measure: Canvas):
+        self.w = int(w)
+        self.h = int(h)
+        self.measure = measure
+        self._dl = DisplayList()
+        self._color_idx: Dict[Color, int] = {}
+        self._string_idx: Dict[str, int] = {}
+
+    def _color(self, color: Color) -> int:
+        idx = self._color_idx.get(color)
+        if idx is None:
+            idx = len(self._dl.colors)
+            self._dl.colors.append(color)
+            self._color_idx[color] = idx
+        return idx
+
+    def _string(self, s: str) -> int:
+        idx = self._string_idx.get(s)
+        if idx is None:
+            idx = len(self._dl.strings)
+            self._dl.strings.append(s)
+            self._string_idx[s] = idx
+        return idx
+
+    def finish(self) -> DisplayList:
+        """
+        Return the recorded list and start a fresh one.
+        """
+        dl = self._dl
+        self._dl = DisplayList()
+        self._color_idx = {}
+        self._string_idx = {}
+        return dl
+
+    # ---- Canvas API ----
+    def fill(self, color: Color) -> None:
+        self._dl.ops.append(OP_FILL)
+        self._dl.ints.append(self._color(color))
+
+    def round_rect(
+        self,
+        rect: Rect,
+        radius: int,
+        color: Color,
+        *,
+        fill: bool = True,
+        width: int = 1,
+    ) -> None:
+        x, y, w, h = rect
+        self._dl.ops.append(OP_ROUND_RECT)
+        self._dl.ints.extend(
+            (int(x), int(y), int(w), int(h), int(radius), self._color(color), 1 if fill else 0, int(width))
+        )
+
+    def circle(self, center: Point, r: int, color: Color, *, width: int = 1) -> None:
+        self._dl.ops.append(OP_CIRCLE)
+        self._dl.ints.extend((int(center[0]), int(center[1]), int(r), self._color(color), int(width)))
+
+    def arc(
+        self,
+        rect: Rect,
+        start_rad: float,
+        end_rad: float,
+        color: Color,
+        *,
+        width: int = 1,
+    ) -> None:
+        x, y, w, h = rect
+        self._dl.ops.append(OP_ARC)
+        self._dl.ints.extend((int(x), int(y), int(w), int(h), self._color(color), int(width)))
+        self._dl.floats.extend((float(start_rad), float(end_rad)))
+
+    def line(self, p1: Point, p2: Point, color: Color, *, width: int = 1) -> None:
+        self._dl.ops.append(OP_LINE)
+        self._dl.ints.extend((int(p1[0]), int(p1[1]), int(p2[0]), int(p2[1]), self._color(color), int(width)))
+
+    def lines(self, segments, color: Color, *, width: int = 1) -> None:
+        n = len(segments) - len(segments) % 4
+        self._dl.ops.append(OP_LINES)
+        self._dl.ints.extend((self._color(color), int(width), n))
+        self._dl.ints.extend(int(v) for v in segments[:n])
+
+    def polyline(self, points, color: Color, *, width: int = 1) -> None:
+        n = len(points) - len(points) % 2
+        self._dl.ops.append(OP_POLYLINE)
+        self._dl.ints.extend((self._color(color), int(width), n))
+        self._dl.ints.extend(int(v) for v in points[:n])
+
+    def circles(self, centers, r: int, color: Color, *, width: int = 1) -> None:
+        n = len(centers) - len(centers) % 2
+        self._dl.ops.append(OP_CIRCLES)
+        self._dl.ints.extend((self._color(color), int(width), int(r), n))
+        self._dl.ints.extend(int(v) for v in centers[:n])
+
+    def text(self, font_key: str, x: int, y: int, s: str, color: Color) -> None:
+        self._dl.ops.append(OP_TEXT)
+        self._dl.ints.extend((self._string(font_key), int(x), int(y), self._string(s), self._color(color)))
+
+    def text_size(self, font_key: str, s: str) -> Tuple[int, int]:
+        return self.measure.text_size(font_key, s)
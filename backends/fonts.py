@@ -0,0 +1,166 @@
+# backends/fonts.py
+"""
+Backend-neutral font sources.
+
+Pixel backends (framebuffer, SPI, NumPy) cannot use pygame surfaces for text,
+so they consume fonts through the small `MaskFont` protocol instead:
+
+  - size(s) -> (w, h)
+  - mask(s) -> (w, h, coverage)   coverage: w*h bytes, row-major, 0..255
+
+Two sources are provided:
+  - BitmapFont: tiny built-in 5x7 font (no dependencies; headless/tests)
+  - PygameMaskFont: adapter around a pygame.font.Font (desktop parity)
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional, Protocol, Tuple, runtime_checkable
+
+
+@runtime_checkable
+class MaskFont(Protocol):
+    def size(self, s: str) -> Tuple[int, int]: ...
+    def mask(self, s: str) -> Tuple[int, int, bytes]: ...
+
+
+# 5x7 glyphs, one int per row (top -> bottom), bit 4 = leftmost column.
+_GLYPHS_5X7: Dict[str, Tuple[int, ...]] = {
+    " ": (0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00),
+    "0": (0x0E, 0x11, 0x13, 0x15, 0x19, 0x11, 0x0E),
+    "1": (0x04, 0x0C, 0x04, 0x04, 0x04, 0x04, 0x0E),
+    "2": (0x0E, 0x11, 0x01, 0x02, 0x04, 0x08, 0x1F),
+    "3": (0x1F, 0x02, 0x04, 0x02, 0x01, 0x11, 0x0E),
+    "4": (0x02, 0x06, 0x0A, 0x12, 0x1F, 0x02, 0x02),
+    "5": (0x1F, 0x10, 0x1E, 0x01, 0x01, 0x11, 0x0E),
+    "6": (0x06, 0x08, 0x10, 0x1E, 0x11, 0x11, 0x0E),
+    "7": (0x1F, 0x01, 0x02, 0x04, 0x08, 0x08, 0x08),
+    "8": (0x0E, 0x11, 0x11, 0x0E, 0x11, 0x11, 0x0E),
+    "9": (0x0E, 0x11, 0x11, 0x0F, 0x01, 0x02, 0x0C),
+    "A": (0x0E, 0x11, 0x11, 0x11, 0x1F, 0x11, 0x11),
+    "B": (0x1E, 0x11, 0x11, 0x1E, 0x11, 0x11, 0x1E),
+    "C": (0x0E, 0x11, 0x10, 0x10, 0x10, 0x11, 0x0E),
+    "D": (0x1C, 0x12, 0x11, 0x11, 0x11, 0x12, 0x1C),
+    "E": (0x1F, 0x10, 0x10, 0x1E, 0x10, 0x10, 0x1F),
+    "F": (0x1F, 0x10, 0x10, 0x1E, 0x10, 0x10, 0x10),
+    "G": (0x0E, 0x11, 0x10, 0x17, 0x11, 0x11, 0x0F),
+    "H": (0x11, 0x11, 0x11, 0x1F, 0x11, 0x11, 0x11),
+    "I": (0x0E, 0x04, 0x04, 0x04, 0x04, 0x04, 0x0E),
+    "J": (0x07, 0x02, 0x02, 0x02, 0x02, 0x12, 0x0C),
+    "K": (0x11, 0x12, 0x14, 0x18, 0x14, 0x12, 0x11),
+    "L": (0x10, 0x10, 0x10, 0x10, 0x10, 0x10, 0x1F),
+    "M": (0x11, 0x1B, 0x15, 0x15, 0x11, 0x11, 0x11),
+    "N": (0x11, 0x11, 0x19, 0x15, 0x13, 0x11, 0x11),
+    "O": (0x0E, 0x11, 0x11, 0x11, 0x11, 0x11, 0x0E),
+    "P": (0x1E, 0x11, 0x11, 0x1E, 0x10, 0x10, 0x10),
+    "Q": (0x0E, 0x11, 0x11, 0x11, 0x15, 0x12, 0x0D),
+    "R": (0x1E, 0x11, 0x11, 0x1E, 0x14, 0x12, 0x11),
+    "S": (0x0F, 0x10, 0x10, 0x0E, 0x01, 0x01, 0x1E),
+    "T": (0x1F, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04),
+    "U": (0x11, 0x11, 0x11, 0x11, 0x11, 0x11, 0x0E),
+    "V": (0x11, 0x11, 0x11, 0x11, 0x11, 0x0A, 0x04),
+    "W": (0x11, 0x11, 0x11, 0x15, 0x15, 0x15, 0x0A),
+    "X": (0x11, 0x11, 0x0A, 0x04, 0x0A, 0x11, 0x11),
+    "Y": (0x11, 0x11, 0x11, 0x0A, 0x04, 0x04, 0x04),
+    "Z": (0x1F, 0x01, 0x02, 0x04, 0x08, 0x10, 0x1F),
+    "-": (0x00, 0x00, 0x00, 0x1F, 0x00, 0x00, 0x00),
+    "+": (0x00, 0x04, 0x04, 0x1F, 0x04, 0x04, 0x00),
+    "/": (0x00, 0x01, 0x02, 0x04, 0x08, 0x10, 0x00),
+    ".": (0x00, 0x00, 0x00, 0x00, 0x00, 0x0C, 0x0C),
+    ":": (0x00, 0x0C, 0x0C, 0x00, 0x0C, 0x0C, 0x00),
+    "%": (0x18, 0x19, 0x02, 0x04, 0x08, 0x13, 0x03),
+    "?": (0x0E, 0x11, 0x01, 0x02, 0x04, 0x00, 0x04),
+}
+
+
+class BitmapFont:
+    """
+    Built-in 5x7 monospace font scaled by an integer factor.
+
+    Lowercase maps to uppercase; unknown characters render as '?'.
+    Good enough for headless rendering, tests and bring-up on bare hardware.
+
+    spacing: pixels between glyphs (default: one scaled glyph column).
+    """
+
+    GLYPH_W = 5
+    GLYPH_H = 7
+
+    def __init__(self, scale: int = 2, *, spacing: Optional[int] = None):
+        self.scale = max(1, int(scale))
+        self.spacing = self.scale if spacing is None else max(0, int(spacing))
+        self.advance = self.GLYPH_W * self.scale + self.spacing
+        self.height = (self.GLYPH_H + 1) * self.scale  # one empty row as descender room
+
+    def _rows(self, ch: str) -> Tuple[int, ...]:
+        g = _GLYPHS_5X7.get(ch)
+        if g is None:
+            g = _GLYPHS_5X7.get(ch.upper(), _GLYPHS_5X7["?"])
+        return g
+
+    def size(self, s: str) -> Tuple[int, int]:
+        return (len(s) * self.advance, self.height)
+
+    def mask(self, s: str) -> Tuple[int, int, bytes]:
+        w, h = self.size(s)
+        out = bytearray(w * h)
+        sc = self.scale
+        for ci, ch in enumerate(s):
+            gx = ci * self.advance
+            for gy, bits in enumerate(self._rows(ch)):
+                if not bits:
+                    continue
+                for col in range(self.GLYPH_W):
+                    if not (bits >> (self.GLYPH_W - 1 - col)) & 1:
+                        continue
+                    x0 = gx + col * sc
+                    for yy in range(gy * sc, (gy + 1) * sc):
+                        off = yy * w + x0
+                        out[off:off + sc] = b"\xff" * sc
+        return (w, h, bytes(out))
+
+
+def default_bitmap_fonts() -> Dict[str, BitmapFont]:
+    """
+    Font map matching Theme.FONT_S / FONT_M / FONT_L keys.
+
+    Sized so tile text stays inside Theme.TILE_W (70 px): left-aligned labels
+    up to 10 chars in "S", centered values up to 6 chars in "M" and 4 in "L".
+    Text wider than its tile spills into the gap/neighbour, which a partial
+    redraw of that tile never clears.
+    """
+    return {
+        "S": BitmapFont(1),
+        "M": BitmapFont(2, spacing=1),
+        "L": BitmapFont(3, spacing=2),
+    }
+
+
+class PygameMaskFont:
+    """
+    Adapter: pygame.font.Font -> MaskFont.
+
+    pygame is only touched through the wrapped font object (and imported lazily),
+    so pixel backends stay importable on boards without pygame.
+    """
+
+    def __init__(self, font):
+        self.font = font
+
+    def size(self, s: str) -> Tuple[int, int]:
+        w, h = self.font.size(s)
+        return (int(w), int(h))
+
+    def mask(self, s: str) -> Tuple[int, int, bytes]:
+        import pygame
+
+        img = self.font.render(s, True, (255, 255, 255))
+        w, h = img.get_size()
+        if img.get_flags() & pygame.SRCALPHA:
+            raw = pygame.image.tobytes(img, "RGBA")
+            cov = raw[3::4]
+        else:
+            # Non-alpha render: white text on black, any channel is coverage.
+            raw = pygame.image.tobytes(img, "RGB")
+            cov = raw[0::3]
+        return (int(w), int(h), bytes(cov))
@@ -0,0 +1,142 @@
+# backends/framediff.py
+"""
+Block-level frame diffing.
+
+Dirty bits are coarse (a whole 70x110 tile for a one-digit value change, a
+full tile for a focus outline recolor). BlockDiffer compares the previous and
+current frame inside those candidate rects in fixed (block_h x block_w)
+blocks and returns tight row-span windows around what actually changed, so
+the SPI upload only carries changed pixels plus a little slack.
+
+Optional module: needs numpy.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from msui.backends.canvas import Rect, clip_rect
+from msui.backends.canvas_damage import merge_boxes
+from msui.log import LogMixin
+
+
+def frame_array(canvas) -> np.ndarray:
+    """
+    Zero-copy (h, w[, 3]) ndarray view of a pixel canvas' framebuffer
+    (NumpyCanvas.fb or FramebufferCanvas.buffer).
+    """
+    fb = getattr(canvas, "fb", None)
+    if isinstance(fb, np.ndarray):
+        return fb
+    buf = getattr(canvas, "buffer", None)
+    if buf is None:
+        raise TypeError(f"{type(canvas).__name__} has no pixel buffer to diff")
+    a = np.frombuffer(buf, dtype=np.uint16, count=int(canvas.h) * int(canvas.stride))
+    return a.reshape(int(canvas.h), int(canvas.stride))[:, :int(canvas.w)]
+
+
+class BlockDiffer(LogMixin):
+    """
+    Keeps a copy of the last presented frame and turns candidate rects into
+    minimal update windows.
+
+    - block_h / block_w: diff granularity (rows per band, columns per block)
+    - max_waste: windows are merged when the union re-sends at most this many
+      unchanged pixels (each window's CASET/RASET/RAMWR setup costs about as
+      much as a few pixels), see canvas_damage.merge_boxes()
+    """
+
+    def __init__(self, w: int, h: int, *, block_h: int = 8, block_w: int = 8, max_waste: int = 32):
+        self.w = int(w)
+        self.h = int(h)
+        self.block_h = max(1, int(block_h))
+        self.block_w = max(1, int(block_w))
+        self.max_waste = max(0, int(max_waste))
+        self._prev: Optional[np.ndarray] = None
+
+        # Running totals: candidate pixels in vs window pixels out.
+        self.pixels_in = 0
+        self.pixels_out = 0
+
+        self.log.info(
+            "frame_differ_init",
+            w=self.w,
+            h=self.h,
+            block_h=self.block_h,
+            block_w=self.block_w,
+            max_waste=self.max_waste,
+        )
+
+    def reset(self) -> None:
+        """
+        Forget the previous frame; the next diff() returns the candidates as-is.
+        """
+        self._prev = None
+
+    def _diff_rect(self, changed: np.ndarray, ox: int, oy: int) -> List[Rect]:
+        h, w = changed.shape
+        bh, bw = self.block_h, self.block_w
+        nby = -(-h // bh)
+        nbx = -(-w // bw)
+
+        # pad to whole blocks, then reduce each block to one bool
+        padded = np.zeros((nby * bh, nbx * bw), dtype=bool)
+        padded[:h, :w] = changed
+        blocks = padded.reshape(nby, bh, nbx, bw).any(axis=(1, 3))
+
+        boxes = []
+        for by in np.flatnonzero(blocks.any(axis=1)):
+            by = int(by)
+            row = blocks[by]
+            # runs of adjacent changed blocks in this band
+            edges = np.flatnonzero(np.diff(np.concatenate(([False], row, [False])).astype(np.int8)))
+            for b0, b1 in zip(edges[::2], edges[1::2]):
+                # tighten to the exact changed pixels inside the run
+                y0, x0 = by * bh, int(b0) * bw
+                sub = changed[y0:y0 + bh, x0:int(b1) * bw]
+                cols = np.flatnonzero(sub.any(axis=0))
+                rows = np.flatnonzero(sub.any(axis=1))
+                boxes.append((
+                    ox + x0 + int(cols[0]),
+                    oy + y0 + int(rows[0]),
+                    ox + x0 + int(cols[-1]) + 1,
+                    oy + y0 + int(rows[-1]) + 1,
+                ))
+
+        boxes = merge_boxes(boxes, max_waste=self.max_waste)
+        return [(b[0], b[1], b[2] - b[0], b[3] - b[1]) for b in boxes]
+
+    def diff(self, frame: np.ndarray, rects: Optional[Iterable[Rect]] = None) -> List[Rect]:
+        """
+        Changed windows of `frame` inside `rects` (default: whole frame), then
+        remember those regions as presented.
+        """
+        if rects is None:
+            rects = ((0, 0, self.w, self.h),)
+        clipped = [r for r in (clip_rect(rc, self.w, self.h) for rc in rects) if r is not None]
+
+        if self._prev is None or self._prev.shape != frame.shape:
+            # nothing to compare against: everything in the candidates is new
+            self._prev = frame.copy()
+            n = sum(r[2] * r[3] for r in clipped)
+            self.pixels_in += n
+            self.pixels_out += n
+            return clipped
+
+        prev = self._prev
+        out: List[Rect] = []
+        for x, y, w, h in clipped:
+            cur = frame[y:y + h, x:x + w]
+            old = prev[y:y + h, x:x + w]
+            changed = cur != old
+            if changed.ndim == 3:
+                changed = changed.any(axis=2)
+            self.pixels_in += w * h
+            if changed.any():
+                for r in self._diff_rect(changed, x, y):
+                    out.append(r)
+                    self.pixels_out += r[2] * r[3]
+                old[...] = cur
+        return out
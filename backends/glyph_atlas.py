@@ -0,0 +1,81 @@
+# backends/glyph_atlas.py
+"""
+Pre-rasterized glyph atlases.
+
+Text is composed from glyph cells instead of rasterizing every new string,
+so a changing dial value ("087" -> "088") costs a few cell copies rather than
+a fresh font render. Pixel backends use the backend-neutral GlyphAtlas below
+(coverage only, color applied at draw time); the pygame backend keeps its own
+per-color Surface atlas in canvas_pygame.py.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Tuple
+
+from msui.backends.fonts import MaskFont
+
+# Printable ASCII: covers every label/option/value string the UI produces.
+DEFAULT_CHARSET = "".join(chr(c) for c in range(32, 127))
+
+# Same 1-bit threshold the pixel backends use for whole-string masks.
+_COVERAGE_MIN = 128
+
+
+class GlyphAtlas:
+    """
+    One coverage atlas per font: all glyphs side by side in a single
+    (height x width) byte buffer.
+
+      - cells[ch] = (x, w, advance): glyph position/size in the atlas, pen advance
+      - runs[ch]  = ((dy, x0, x1), ...): thresholded horizontal runs, glyph-relative
+    """
+
+    def __init__(self, font: MaskFont, charset: str = DEFAULT_CHARSET):
+        glyphs = []
+        height = 0
+        for ch in dict.fromkeys(charset):  # dedupe, keep order
+            w, h, cov = font.mask(ch)
+            adv, _ = font.size(ch)
+            glyphs.append((ch, int(w), int(h), cov, int(adv)))
+            height = max(height, int(h))
+
+        self.height = height
+        self.width = sum(g[1] for g in glyphs)
+        self.cells: Dict[str, Tuple[int, int, int]] = {}
+        self.runs: Dict[str, Tuple[Tuple[int, int, int], ...]] = {}
+
+        atlas = bytearray(self.width * self.height)
+        x = 0
+        for ch, w, h, cov, adv in glyphs:
+            runs = []
+            for yy in range(h):
+                src = cov[yy * w:(yy + 1) * w]
+                atlas[yy * self.width + x:yy * self.width + x + w] = src
+                start = None
+                for xx in range(w + 1):
+                    on = xx < w and src[xx] >= _COVERAGE_MIN
+                    if on and start is None:
+                        start = xx
+                    elif not on and start is not None:
+                        runs.append((yy, start, xx))
+                        start = None
+            self.cells[ch] = (x, w, adv)
+            self.runs[ch] = tuple(runs)
+            x += w
+
+        self.coverage = bytes(atlas)
+
+    def covers(self, s: str) -> bool:
+        cells = self.cells
+        for ch in s:
+            if ch not in cells:
+                return False
+        return True
+
+    def advance(self, ch: str) -> int:
+        return self.cells[ch][2]
+
+    def size(self, s: str) -> Tuple[int, int]:
+        cells = self.cells
+        return (sum(cells[ch][2] for ch in s), self.height)
@@ -1,8 +1,9 @@
 # backends/input.py
 from __future__ import annotations
 
-from typing import Protocol, runtime_checkable, List
+from typing import Protocol, runtime_checkable, List, Optional
 from msui.core.events import UIEvent
+from msui.log import LogMixin
 
 
 @runtime_checkable
@@ -13,7 +14,106 @@ class InputSource(Protocol):
     Backends implement:
       - pump(): read/consume platform events (if needed)
       - get_events(dt_ms): convert current input state into UIEvents
+
+    Optional:
+      - wait(timeout_s): block until input arrives or a pending repeat is
+        due, so an idle loop can sleep instead of polling every frame
     """
 
     def pump(self) -> None: ...
     def get_events(self, dt_ms: int) -> List[UIEvent]: ...
+
+    def wait(self, timeout_s: Optional[float] = None) -> bool:
+        """
+        Block until get_events() may return something: new input, or a held
+        key's next repeat (never longer than timeout_s; None = no limit).
+        Returns True if input arrived. Default: polling source, returns
+        False immediately (the loop's frame cap paces it).
+        """
+        return False
+
+
+class AccelRepeater(LogMixin):
+    """
+    Deterministic (dt-based) key repeater.
+
+    - Fires immediately on press.
+    - Then repeats after first_delay, at repeat interval.
+    - Optional acceleration for UP/DOWN via step_for_hold(held_s).
+
+    This avoids dependence on wall clock jitter and behaves consistently
+    across machines/fps hiccups as long as dt_ms is provided.
+    """
+
+    def __init__(self, first_delay_ms: int = 250, repeat_ms: int = 60, accel: bool = True, *, name: str = "key"):
+        self.name = str(name)
+        self.first_delay_s = max(0.0, float(first_delay_ms) / 1000.0)
+        self.repeat_s = max(0.001, float(repeat_ms) / 1000.0)
+        self.accel = bool(accel)
+
+        self._was_down = False
+        self._held_s = 0.0
+        self._since_fire_s = 0.0
+
+        self.log.debug(
+            "repeater_init",
+            name=self.name,
+            first_delay_ms=int(first_delay_ms),
+            repeat_ms=int(repeat_ms),
+            accel=self.accel,
+        )
+
+    def step_for_hold(self, held_s: float) -> int:
+        if not self.accel:
+            return 1
+        if held_s < 0.6:
+            return 1
+        if held_s < 1.2:
+            return 2
+        if held_s < 2.0:
+            return 5
+        return 10
+
+    def reset(self) -> None:
+        self._was_down = False
+        self._held_s = 0.0
+        self._since_fire_s = 0.0
+
+    def update(self, is_down: bool, dt_s: float) -> tuple[bool, int]:
+        dt_s = max(0.0, float(dt_s))
+
+        if not is_down:
+            if self._was_down:
+                # Edge: released (debug only)
+                self.log.debug("repeater_release", name=self.name, held_s=round(self._held_s, 3))
+            self.reset()
+            return False, 0
+
+        # down
+        if not self._was_down:
+            # edge: fire immediately
+            self._was_down = True
+            self._held_s = 0.0
+            self._since_fire_s = 0.0
+            self.log.debug("repeater_press", name=self.name)
+            return True, 1
+
+        # held
+        self._held_s += dt_s
+        self._since_fire_s += dt_s
+
+        if self._held_s >= self.first_delay_s and self._since_fire_s >= self.repeat_s:
+            # Fire at most once per frame to keep event rates stable.
+            self._since_fire_s = 0.0
+            step = self.step_for_hold(self._held_s)
+            return True, step
+
+        return False, 0
+
+    def time_to_fire_s(self) -> Optional[float]:
+        """
+        Held time until update() fires again (None: released, nothing pending).
+        """
+        if not self._was_down:
+            return None
+        return max(0.0, self.first_delay_s - self._held_s, self.repeat_s - self._since_fire_s)
@@ -0,0 +1,444 @@
+# backends/input_encoder.py
+"""
+Rotary encoder / push button input from GPIO edge events.
+
+Edges are read as Linux GPIO character-device v2 line events (struct
+gpio_v2_line_event, 48 bytes each, native byte order):
+
+  timestamp_ns u64, id u32 (1 rising, 2 falling), offset u32,
+  seqno u32, line_seqno u32, padding 6 x u32
+
+from any fd that yields them: the line fd of a GPIO line request
+(open_gpio_lines()), a pipe fed by SimulatedEdges, or a file of recorded
+edges.
+
+A fast spin is hundreds of edges per second, so a decoder thread reads them
+in batches into one reused buffer, runs the quadrature state machine and adds
+detents (with velocity acceleration) to per-encoder counters. get_events()
+swaps the counters out under a lock: per frame, one VALUE_DELTA per value
+encoder and one NAV_*/PAGE_* per detent, nothing allocated per edge.
+Ordering between different encoders/buttons within one frame is not kept.
+"""
+
+from __future__ import annotations
+
+import os
+import select
+import struct
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from msui.backends.input import InputSource
+from msui.core.events import (
+    UIEvent,
+    ui_event,
+    event_code,
+    event_name,
+    NAV_LEFT,
+    NAV_RIGHT,
+    PAGE_PREV,
+    PAGE_NEXT,
+    VALUE_DELTA,
+    TOGGLE_BYPASS,
+)
+from msui.log import LogMixin
+
+EDGE_RISING = 1
+EDGE_FALLING = 2
+
+EDGE_SIZE = 48
+_EDGE = struct.Struct("=QIIII24x")  # native, like the kernel struct
+_EDGE_WORDS = EDGE_SIZE // 4  # u32 words per record (decoder reads a u32 view)
+
+# Quadrature transitions, indexed by (prev_ab << 2) | ab: +1 for a quarter
+# step along 00 -> 01 -> 11 -> 10 -> 00, -1 backwards, 0 for no change.
+_QDEC = (0, 1, -1, 0, -1, 0, 0, 1, 1, 0, 0, -1, 0, -1, 1, 0)
+
+# (min detents/s, multiplier), checked in order
+DEFAULT_ACCEL: Tuple[Tuple[float, int], ...] = ((40.0, 10), (25.0, 5), (12.0, 2))
+
+_KINDS = {
+    "value": None,
+    "nav": (NAV_LEFT, NAV_RIGHT),
+    "page": (PAGE_PREV, PAGE_NEXT),
+}
+
+
+@dataclass(frozen=True)
+class RotaryEncoder:
+    """
+    A quadrature encoder on lines `a` and `b`.
+
+    kind: "value" (VALUE_DELTA, accelerated), "nav" (NAV_LEFT/RIGHT) or
+    "page" (PAGE_PREV/NEXT); swap a/b to reverse the direction.
+    """
+
+    a: int
+    b: int
+    kind: str = "value"
+    steps_per_detent: int = 4
+    accel: bool = True
+
+
+@dataclass(frozen=True)
+class Button:
+    """
+    A push button on `line`, emitting `event` on press.
+    """
+
+    line: int
+    event: int = TOGGLE_BYPASS
+    active_low: bool = True
+    debounce_ms: float = 5.0
+
+    def __post_init__(self) -> None:
+        # event names ("PAGE_NEXT") are accepted too
+        object.__setattr__(self, "event", event_code(self.event))
+
+
+class EncoderInput(LogMixin, InputSource):
+    """
+    InputSource decoding encoders and buttons from a GPIO edge fd.
+
+    Call start() to run the decoder thread and stop() on shutdown. `levels`
+    are the line levels when the fd was opened (line offset -> 0/1; missing
+    lines are assumed idle: high for pulled-up encoders/active-low buttons).
+    """
+
+    def __init__(
+        self,
+        fd: int,
+        encoders: Sequence[RotaryEncoder] = (),
+        buttons: Sequence[Button] = (),
+        *,
+        levels: Optional[Dict[int, int]] = None,
+        accel: Sequence[Tuple[float, int]] = DEFAULT_ACCEL,
+        batch: int = 64,
+    ):
+        self.fd = int(fd)
+        self.encoders = tuple(encoders)
+        self.buttons = tuple(buttons)
+        self.accel = tuple((float(r), int(m)) for r, m in accel)
+        for enc in self.encoders:
+            if enc.kind not in _KINDS:
+                raise ValueError(f"Unknown encoder kind {enc.kind!r} (expected one of {sorted(_KINDS)})")
+
+        levels = dict(levels or {})
+        # Per-line dispatch: offset -> (encoder index, is_b) / button index.
+        self._enc_line: Dict[int, Tuple[int, bool]] = {}
+        self._btn_line: Dict[int, int] = {}
+        for i, enc in enumerate(self.encoders):
+            self._enc_line[enc.a] = (i, False)
+            self._enc_line[enc.b] = (i, True)
+        for i, btn in enumerate(self.buttons):
+            self._btn_line[btn.line] = i
+
+        # Decoder-thread state (no lock: only that thread touches it).
+        self._ab = [(levels.get(e.a, 1) << 1) | levels.get(e.b, 1) for e in self.encoders]
+        self._sub = [0] * len(self.encoders)
+        self._last_detent_ns = [0] * len(self.encoders)
+        self._last_dir = [0] * len(self.encoders)
+        self._btn_level = [levels.get(b.line, 1 if b.active_low else 0) for b in self.buttons]
+        self._btn_edge_ns = [0] * len(self.buttons)
+
+        # Shared with get_events(): accumulated since the last call.
+        self._lock = threading.Lock()
+        self._pending_enc = [0] * len(self.encoders)
+        self._pending_btn = [0] * len(self.buttons)
+        self._ready = threading.Event()
+
+        self._buf = bytearray(max(1, int(batch)) * EDGE_SIZE)
+        self._words = memoryview(self._buf).cast("I")
+        self._wake_r, self._wake_w = os.pipe()
+        self._stop = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.edges = 0
+        self.missed = 0
+
+        self.log.info(
+            "input_init",
+            backend="encoder",
+            encoders=[f"{e.kind}:{e.a}/{e.b}" for e in self.encoders],
+            buttons=[f"{event_name(b.event)}:{b.line}" for b in self.buttons],
+            batch=len(self._buf) // EDGE_SIZE,
+        )
+
+    # ---- lifecycle ----
+    def start(self) -> "EncoderInput":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="msui-encoder", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """
+        Stop the decoder thread and close the wake pipe. Safe to call again,
+        e.g. after a timed-out join.
+        """
+        if self._wake_w < 0:
+            return
+        self._stop = True
+        os.write(self._wake_w, b"x")
+        t = self._thread
+        if t is not None:
+            t.join(timeout)
+            if t.is_alive():
+                # Still in select()/readv(): the pipe must outlive it (a closed
+                # fd number may already be reused elsewhere).
+                self.log.warn("encoder_input_stop_timeout", timeout_s=float(timeout))
+                return
+            self._thread = None
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+        self._wake_r = self._wake_w = -1
+        self.log.info("encoder_input_stop", edges=self.edges, missed=self.missed)
+
+    # ---- decoder thread ----
+    def _run(self) -> None:
+        have = 0
+        while not self._stop:
+            r, _, _ = select.select([self.fd, self._wake_r], [], [])
+            if self._stop:
+                break
+            if self.fd not in r:
+                continue
+            n = os.readv(self.fd, [memoryview(self._buf)[have:]])
+            if n == 0:
+                self.log.info("edge_source_eof", edges=self.edges)
+                break
+            have += n
+            whole = have - have % EDGE_SIZE
+            self._decode(whole // EDGE_SIZE)
+            if whole < have:
+                # partial record (pipe split it): keep it at the front
+                self._buf[:have - whole] = self._buf[whole:have]
+            have -= whole
+
+    def _decode(self, count: int) -> None:
+        w = self._words
+        enc_line = self._enc_line
+        btn_line = self._btn_line
+        touched = False
+        for k in range(count):
+            o = k * _EDGE_WORDS
+            ts = w[o] | (w[o + 1] << 32)
+            level = 1 if w[o + 2] == EDGE_RISING else 0
+            line = w[o + 3]
+
+            hit = enc_line.get(line)
+            if hit is not None:
+                i, is_b = hit
+                prev = self._ab[i]
+                ab = (prev & 2) | level if is_b else (level << 1) | (prev & 1)
+                self._ab[i] = ab
+                step = _QDEC[(prev << 2) | ab]
+                if step == 0:
+                    self.missed += 1  # same level twice: an edge was lost
+                    continue
+                enc = self.encoders[i]
+                sub = self._sub[i] + step
+                if -enc.steps_per_detent < sub < enc.steps_per_detent:
+                    self._sub[i] = sub
+                    continue
+                self._sub[i] = 0
+                delta = self._detent(i, 1 if sub > 0 else -1, ts)
+                with self._lock:
+                    self._pending_enc[i] += delta
+                touched = True
+                continue
+
+            bi = btn_line.get(line)
+            if bi is not None:
+                btn = self.buttons[bi]
+                if level == self._btn_level[bi]:
+                    continue
+                if ts - self._btn_edge_ns[bi] < btn.debounce_ms * 1e6:
+                    self._btn_level[bi] = level
+                    continue  # bounce
+                self._btn_edge_ns[bi] = ts
+                self._btn_level[bi] = level
+                if level == (0 if btn.active_low else 1):
+                    with self._lock:
+                        self._pending_btn[bi] += 1
+                    touched = True
+
+        self.edges += count
+        if touched:
+            self._ready.set()
+
+    def _detent(self, i: int, direction: int, ts: int) -> int:
+        # Velocity acceleration from the kernel timestamps of consecutive detents.
+        enc = self.encoders[i]
+        mult = 1
+        if enc.accel and enc.kind == "value" and direction == self._last_dir[i] and self._last_detent_ns[i]:
+            dt_ns = ts - self._last_detent_ns[i]
+            if dt_ns > 0:
+                rate = 1e9 / dt_ns
+                for min_rate, m in self.accel:
+                    if rate >= min_rate:
+                        mult = m
+                        break
+        self._last_detent_ns[i] = ts
+        self._last_dir[i] = direction
+        return direction * mult
+
+    # ---- InputSource ----
+    def pump(self) -> None:
+        pass
+
+    def get_events(self, dt_ms: int) -> List[UIEvent]:
+        events: List[UIEvent] = []
+        if not self._ready.is_set():
+            return events
+        with self._lock:
+            self._ready.clear()
+            for i, enc in enumerate(self.encoders):
+                d = self._pending_enc[i]
+                if not d:
+                    continue
+                self._pending_enc[i] = 0
+                pair = _KINDS[enc.kind]
+                if pair is None:
+                    events.append(ui_event(VALUE_DELTA, d))
+                else:
+                    events.extend([ui_event(pair[1] if d > 0 else pair[0])] * abs(d))
+            for i, btn in enumerate(self.buttons):
+                n = self._pending_btn[i]
+                if n:
+                    self._pending_btn[i] = 0
+                    events.extend([ui_event(btn.event)] * n)
+        return events
+
+    def wait(self, timeout_s: Optional[float] = None) -> bool:
+        return self._ready.wait(timeout_s)
+
+
+class SimulatedEdges:
+    """
+    Edge source for tests and desktop runs: writes gpio_v2_line_event records
+    into a pipe; pass .fd to EncoderInput. Timestamps come from an internal
+    nanosecond clock advanced by each call, so runs are deterministic.
+    """
+
+    def __init__(self, *, levels: Optional[Dict[int, int]] = None):
+        self.fd, self._w = os.pipe()
+        self.levels: Dict[int, int] = dict(levels or {})
+        self.now_ns = 1
+        self._seq = 0
+
+    def close(self) -> None:
+        """
+        Close the write end (the reader sees EOF).
+        """
+        os.close(self._w)
+
+    def _records(self, edges: Sequence[Tuple[int, int, int]]) -> bytes:
+        out = bytearray()
+        for ts, line, level in edges:
+            self._seq += 1
+            out += _EDGE.pack(ts, EDGE_RISING if level else EDGE_FALLING, line, self._seq, self._seq)
+        return bytes(out)
+
+    def _write(self, data: bytes) -> None:
+        view = memoryview(data)
+        while view:
+            n = os.write(self._w, view)
+            view = view[n:]
+
+    def edge(self, line: int, level: int, *, after_ns: int = 0) -> None:
+        self.now_ns += int(after_ns)
+        self.levels[line] = int(level)
+        self._write(self._records([(self.now_ns, line, int(level))]))
+
+    def turn(self, enc: RotaryEncoder, detents: int, *, interval_s: float = 0.05) -> None:
+        """
+        Turn `enc` by `detents` (negative: backwards), one detent every
+        interval_s, as a full quadrature sequence in a single write.
+        """
+        quarter_ns = max(1, int(interval_s * 1e9 / enc.steps_per_detent))
+        ab = (self.levels.get(enc.a, 1) << 1) | self.levels.get(enc.b, 1)
+        # Gray-code order for +1 steps (matches _QDEC); walk it backwards for -1.
+        order = (0, 1, 3, 2)
+        pos = order.index(ab)
+        edges = []
+        d = 1 if detents > 0 else -1
+        for _ in range(abs(int(detents)) * enc.steps_per_detent):
+            pos = (pos + d) % 4
+            nab = order[pos]
+            self.now_ns += quarter_ns
+            line, level = (enc.a, nab >> 1) if (nab ^ ab) & 2 else (enc.b, nab & 1)
+            edges.append((self.now_ns, line, level))
+            ab = nab
+        self.levels[enc.a], self.levels[enc.b] = ab >> 1, ab & 1
+        self._write(self._records(edges))
+
+    def press(self, btn: Button, *, hold_s: float = 0.1) -> None:
+        pressed = 0 if btn.active_low else 1
+        self.edge(btn.line, pressed, after_ns=int(50e6))
+        self.edge(btn.line, 1 - pressed, after_ns=int(hold_s * 1e9))
+
+
+# ---- real hardware: GPIO character device (Linux uAPI v2) ----
+
+_GPIO_V2_LINE_FLAG_INPUT = 1 << 2
+_GPIO_V2_LINE_FLAG_EDGE_RISING = 1 << 3
+_GPIO_V2_LINE_FLAG_EDGE_FALLING = 1 << 4
+_GPIO_V2_LINE_FLAG_BIAS_PULL_UP = 1 << 8
+
+# struct gpio_v2_line_request: offsets[64] u32, consumer[32], config
+# (flags u64, num_attrs u32, padding[5], attrs[10] x 24 bytes), num_lines,
+# event_buffer_size, padding[5], fd s32
+_LINE_REQUEST = struct.Struct("=64I32sQI5I240xII5Ii")
+_LINE_VALUES = struct.Struct("=QQ")  # bits, mask
+
+
+def _iowr(nr: int, size: int) -> int:
+    return (3 << 30) | (size << 16) | (0xB4 << 8) | nr
+
+
+_GPIO_V2_GET_LINE_IOCTL = _iowr(0x07, _LINE_REQUEST.size)
+_GPIO_V2_LINE_GET_VALUES_IOCTL = _iowr(0x0E, _LINE_VALUES.size)
+
+
+def open_gpio_lines(
+    chip: str,
+    offsets: Sequence[int],
+    *,
+    pull_up: bool = True,
+    consumer: str = "msui",
+) -> Tuple[int, Dict[int, int]]:
+    """
+    Request `offsets` on a GPIO chip (e.g. "/dev/gpiochip0") as inputs with
+    edge detection on both edges. Returns (line fd, current levels) for
+    EncoderInput(fd, ..., levels=levels); close the fd after stop().
+    """
+    import fcntl
+
+    offsets = [int(o) for o in offsets]
+    if not 0 < len(offsets) <= 64:
+        raise ValueError("need 1..64 line offsets")
+    flags = _GPIO_V2_LINE_FLAG_INPUT | _GPIO_V2_LINE_FLAG_EDGE_RISING | _GPIO_V2_LINE_FLAG_EDGE_FALLING
+    if pull_up:
+        flags |= _GPIO_V2_LINE_FLAG_BIAS_PULL_UP
+
+    req = bytearray(
+        _LINE_REQUEST.pack(
+            *offsets, *([0] * (64 - len(offsets))),
+            consumer.encode()[:31],
+            flags, 0, 0, 0, 0, 0, 0,
+            len(offsets), 0, 0, 0, 0, 0, 0, -1,
+        )
+    )
+    chip_fd = os.open(chip, os.O_RDONLY | os.O_CLOEXEC)
+    try:
+        fcntl.ioctl(chip_fd, _GPIO_V2_GET_LINE_IOCTL, req)
+    finally:
+        os.close(chip_fd)
+    line_fd = _LINE_REQUEST.unpack(req)[-1]
+
+    vals = bytearray(_LINE_VALUES.pack(0, (1 << len(offsets)) - 1))
+    fcntl.ioctl(line_fd, _GPIO_V2_LINE_GET_VALUES_IOCTL, vals)
+    bits = _LINE_VALUES.unpack(vals)[0]
+    return line_fd, {off: (bits >> i) & 1 for i, off in enumerate(offsets)}
@@ -1,11 +1,15 @@
 # backends/input_pygame.py
 from __future__ import annotations
 
+import time
+from typing import Optional
+
 import pygame
 
-from msui.backends.input import InputSource
+from msui.backends.input import AccelRepeater, InputSource  # AccelRepeater re-exported
 from msui.core.events import (
     UIEvent,
+    ui_event,
     NAV_LEFT,
     NAV_RIGHT,
     PAGE_PREV,
@@ -16,83 +20,9 @@ from msui.core.events import (
 )
 from msui.log import LogMixin
 
-
-class AccelRepeater(LogMixin):
-    """
-    Deterministic (dt-based) key repeater.
-
-    - Fires immediately on press.
-    - Then repeats after first_delay, at repeat interval.
-    - Optional acceleration for UP/DOWN via step_for_hold(held_s).
-
-    This avoids dependence on wall clock jitter and behaves consistently
-    across machines/fps hiccups as long as dt_ms is provided.
-    """
-
-    def __init__(self, first_delay_ms: int = 250, repeat_ms: int = 60, accel: bool = True, *, name: str = "key"):
-        self.name = str(name)
-        self.first_delay_s = max(0.0, float(first_delay_ms) / 1000.0)
-        self.repeat_s = max(0.001, float(repeat_ms) / 1000.0)
-        self.accel = bool(accel)
-
-        self._was_down = False
-        self._held_s = 0.0
-        self._since_fire_s = 0.0
-
-        self.log.debug(
-            "repeater_init",
-            name=self.name,
-            first_delay_ms=int(first_delay_ms),
-            repeat_ms=int(repeat_ms),
-            accel=self.accel,
-        )
-
-    def step_for_hold(self, held_s: float) -> int:
-        if not self.accel:
-            return 1
-        if held_s < 0.6:
-            return 1
-        if held_s < 1.2:
-            return 2
-        if held_s < 2.0:
-            return 5
-        return 10
-
-    def reset(self) -> None:
-        self._was_down = False
-        self._held_s = 0.0
-        self._since_fire_s = 0.0
-
-    def update(self, is_down: bool, dt_s: float) -> tuple[bool, int]:
-        dt_s = max(0.0, float(dt_s))
-
-        if not is_down:
-            if self._was_down:
-                # Edge: released (debug only)
-                self.log.debug("repeater_release", name=self.name, held_s=round(self._held_s, 3))
-            self.reset()
-            return False, 0
-
-        # down
-        if not self._was_down:
-            # edge: fire immediately
-            self._was_down = True
-            self._held_s = 0.0
-            self._since_fire_s = 0.0
-            self.log.debug("repeater_press", name=self.name)
-            return True, 1
-
-        # held
-        self._held_s += dt_s
-        self._since_fire_s += dt_s
-
-        if self._held_s >= self.first_delay_s and self._since_fire_s >= self.repeat_s:
-            # Fire at most once per frame to keep event rates stable.
-            self._since_fire_s = 0.0
-            step = self.step_for_hold(self._held_s)
-            return True, step
-
-        return False, 0
+# Video drivers where SDL_WaitEventTimeout really blocks; elsewhere (dummy,
+# kmsdrm, ...) event.wait() polls every millisecond internally.
+_BLOCKING_WAIT_DRIVERS = frozenset(("x11", "wayland", "windows", "cocoa"))
 
 
 class PygameInput(LogMixin, InputSource):
@@ -103,6 +33,7 @@ class PygameInput(LogMixin, InputSource):
     Stable API:
       - pump()
       - get_events(dt_ms)
+      - wait(timeout_s): sleeps until a key event or the next repeat is due
 
     Back-compat:
       - pump_pygame_events() alias for pump()
@@ -134,6 +65,9 @@ class PygameInput(LogMixin, InputSource):
         self.rep_up = AccelRepeater(first_delay_ms=first_delay_ms, repeat_ms=updown_ms, accel=True, name="UP")
         self.rep_down = AccelRepeater(first_delay_ms=first_delay_ms, repeat_ms=updown_ms, accel=True, name="DOWN")
 
+        self._idle_poll_s = 1.0 / fps
+        self._repeaters = (self.rep_left, self.rep_right, self.rep_a, self.rep_d, self.rep_up, self.rep_down)
+
         self._quit = False
         self._toggle_bypass_pressed = False
 
@@ -147,16 +81,68 @@ class PygameInput(LogMixin, InputSource):
             page_repeat_ms=page_ms,
         )
 
+    def _handle(self, ev) -> None:
+        if ev.type == pygame.QUIT:
+            self._quit = True
+            self.log.info("quit_event", source="pygame.QUIT")
+        elif ev.type == pygame.KEYDOWN:
+            if ev.key == pygame.K_ESCAPE:
+                self._quit = True
+                self.log.info("quit_event", source="ESCAPE")
+
     # --- stable interface ---
     def pump(self) -> None:
         for ev in pygame.event.get():
-            if ev.type == pygame.QUIT:
-                self._quit = True
-                self.log.info("quit_event", source="pygame.QUIT")
-            elif ev.type == pygame.KEYDOWN:
-                if ev.key == pygame.K_ESCAPE:
-                    self._quit = True
-                    self.log.info("quit_event", source="ESCAPE")
+            self._handle(ev)
+
+    def wait(self, timeout_s: Optional[float] = None) -> bool:
+        """
+        Block in pygame.event.wait() until a key/quit event or the earliest
+        repeater deadline. Key state is read in get_events() as before, so
+        repeats stay dt-based; the deadline only decides when to wake.
+        """
+        if self._quit:
+            return True
+        due = [t for t in (r.time_to_fire_s() for r in self._repeaters) if t is not None]
+        if timeout_s is not None:
+            due.append(max(0.0, float(timeout_s)))
+        deadline = time.perf_counter() + min(due) if due else None
+
+        try:
+            blocking = pygame.display.get_driver() in _BLOCKING_WAIT_DRIVERS
+        except pygame.error:
+            blocking = False
+        if not blocking:
+            return self._poll_until(deadline)
+
+        while True:
+            if deadline is None:
+                ev = pygame.event.wait()
+            else:
+                left_ms = int((deadline - time.perf_counter()) * 1000.0 + 0.999)
+                if left_ms <= 0:
+                    return False
+                ev = pygame.event.wait(left_ms)
+            if ev.type == pygame.NOEVENT:
+                return False
+            self._handle(ev)
+            if ev.type in (pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP):
+                return True
+            # mouse motion, window events, ...: keep sleeping
+
+    def _poll_until(self, deadline: Optional[float]) -> bool:
+        # Fallback for drivers without a blocking wait: check the queue once per frame.
+        while True:
+            woke = False
+            for ev in pygame.event.get():
+                self._handle(ev)
+                woke = woke or ev.type in (pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP)
+            if woke:
+                return True
+            left = self._idle_poll_s if deadline is None else deadline - time.perf_counter()
+            if left <= 0:
+                return False
+            time.sleep(min(self._idle_poll_s, left))
 
     # --- back-compat alias ---
     def pump_pygame_events(self) -> None:
@@ -164,7 +150,7 @@ class PygameInput(LogMixin, InputSource):
 
     def get_events(self, dt_ms: int):
         if self._quit:
-            return [UIEvent(QUIT)]
+            return [ui_event(QUIT)]
 
         dt_s = max(0.0, float(dt_ms)) / 1000.0
         events: list[UIEvent] = []
@@ -174,41 +160,41 @@ class PygameInput(LogMixin, InputSource):
         if keys[pygame.K_SPACE]:
             if not self._toggle_bypass_pressed:
                 self._toggle_bypass_pressed = True
-                events.append(UIEvent(TOGGLE_BYPASS))
-                self.log.debug("event", type=TOGGLE_BYPASS)
+                events.append(ui_event(TOGGLE_BYPASS))
+                self.log.debug("event", type="TOGGLE_BYPASS")
         else:
             self._toggle_bypass_pressed = False
 
         fired, _ = self.rep_left.update(keys[pygame.K_LEFT], dt_s)
         if fired:
-            events.append(UIEvent(NAV_LEFT))
-            self.log.debug("event", type=NAV_LEFT)
+            events.append(ui_event(NAV_LEFT))
+            self.log.debug("event", type="NAV_LEFT")
 
         fired, _ = self.rep_right.update(keys[pygame.K_RIGHT], dt_s)
         if fired:
-            events.append(UIEvent(NAV_RIGHT))
-            self.log.debug("event", type=NAV_RIGHT)
+            events.append(ui_event(NAV_RIGHT))
+            self.log.debug("event", type="NAV_RIGHT")
 
         fired, _ = self.rep_a.update(keys[pygame.K_a], dt_s)
         if fired:
-            events.append(UIEvent(PAGE_PREV))
-            self.log.debug("event", type=PAGE_PREV)
+            events.append(ui_event(PAGE_PREV))
+            self.log.debug("event", type="PAGE_PREV")
 
         fired, _ = self.rep_d.update(keys[pygame.K_d], dt_s)
         if fired:
-            events.append(UIEvent(PAGE_NEXT))
-            self.log.debug("event", type=PAGE_NEXT)
+            events.append(ui_event(PAGE_NEXT))
+            self.log.debug("event", type="PAGE_NEXT")
 
         # UP: +delta
         fired, step = self.rep_up.update(keys[pygame.K_UP], dt_s)
         if fired:
-            events.append(UIEvent(VALUE_DELTA, delta=step))
-            self.log.debug("event", type=VALUE_DELTA, delta=step)
+            events.append(ui_event(VALUE_DELTA, step))
+            self.log.debug("event", type="VALUE_DELTA", delta=step)
 
         # DOWN: -delta
         fired, step = self.rep_down.update(keys[pygame.K_DOWN], dt_s)
         if fired:
-            events.append(UIEvent(VALUE_DELTA, delta=-step))
-            self.log.debug("event", type=VALUE_DELTA, delta=-step)
+            events.append(ui_event(VALUE_DELTA, -step))
+            self.log.debug("event", type="VALUE_DELTA", delta=-step)
 
         return events
@@ -0,0 +1,104 @@
+# backends/pixfmt.py
+"""
+Pixel-format conversion to the ST7789 wire format (RGB565, big-endian).
+
+Rgb565Encoder converts an RGB888 frame (or a sub-rect of it) with a handful of
+vectorized NumPy ops that all write through `out=` into buffers allocated once,
+so steady-state frames allocate nothing. The result is a memoryview over a
+reusable bytearray, ready for SpiTransport.data().
+
+Quantization matches canvas_fb.rgb565() (truncating), so an RGB888 frame of
+theme colors encodes to the same bytes the framebuffer backend would draw.
+
+Optional module: needs numpy.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+from msui.backends.canvas import Rect, clip_rect
+from msui.log import LogMixin
+
+
+class Rgb565Encoder(LogMixin):
+    """
+    Reusable RGB888 / native RGB565 -> big-endian RGB565 converter.
+
+    Output and scratch buffers are sized for max_w x max_h pixels; each
+    encode() returns a view of the first w*h*2 bytes, valid until the next call.
+    """
+
+    def __init__(self, max_w: int, max_h: int):
+        self.max_w = int(max_w)
+        self.max_h = int(max_h)
+        n = self.max_w * self.max_h
+
+        self.buffer = bytearray(n * 2)
+        self._out = np.frombuffer(self.buffer, dtype=">u2")  # big-endian view: swap happens on store
+        self._t0 = np.empty(n, dtype=np.uint16)
+        self._t1 = np.empty(n, dtype=np.uint16)
+
+        self.log.info("rgb565_encoder_init", max_w=self.max_w, max_h=self.max_h, nbytes=len(self.buffer))
+
+    def _region(self, src: np.ndarray, rect: Optional[Rect]):
+        h, w = src.shape[0], src.shape[1]
+        if rect is None:
+            x, y = 0, 0
+        else:
+            r = clip_rect(rect, w, h)
+            if r is None:
+                return None, 0, 0
+            x, y, w, h = r
+        if w * h > self._out.size:
+            raise ValueError(f"rect {w}x{h} exceeds encoder capacity {self.max_w}x{self.max_h}")
+        return src[y:y + h, x:x + w], w, h
+
+    def encode_rgb888(self, src: np.ndarray, rect: Optional[Rect] = None) -> memoryview:
+        """
+        (h, w, >=3) uint8 RGB(A) array -> big-endian RGB565 bytes of `rect`
+        (default: whole array), row-major and tightly packed.
+        """
+        sub, w, h = self._region(src, rect)
+        if sub is None:
+            return memoryview(self.buffer)[:0]
+
+        n = w * h
+        out = self._out[:n].reshape(h, w)
+        t0 = self._t0[:n].reshape(h, w)
+        t1 = self._t1[:n].reshape(h, w)
+
+        # r: (R & 0xF8) << 8
+        np.bitwise_and(sub[..., 0], 0xF8, out=t0)
+        np.left_shift(t0, 8, out=t0)
+        # g: (G & 0xFC) << 3
+        np.bitwise_and(sub[..., 1], 0xFC, out=t1)
+        np.left_shift(t1, 3, out=t1)
+        np.bitwise_or(t0, t1, out=t0)
+        # b: B >> 3
+        np.right_shift(sub[..., 2], 3, out=t1)
+        np.bitwise_or(t0, t1, out=out)
+
+        return memoryview(self.buffer)[:n * 2]
+
+    def encode_rgb565(self, src: np.ndarray, rect: Optional[Rect] = None) -> memoryview:
+        """
+        (h, w) host-order uint16 RGB565 (NumpyCanvas fmt="rgb565") -> big-endian bytes.
+        """
+        sub, w, h = self._region(src, rect)
+        if sub is None:
+            return memoryview(self.buffer)[:0]
+
+        n = w * h
+        np.copyto(self._out[:n].reshape(h, w), sub)
+        return memoryview(self.buffer)[:n * 2]
+
+    def encode(self, src: np.ndarray, rect: Optional[Rect] = None) -> memoryview:
+        """
+        Dispatch on array layout: (h, w) uint16 RGB565 or (h, w, 3|4) uint8 RGB888.
+        """
+        if src.ndim == 2:
+            return self.encode_rgb565(src, rect)
+        return self.encode_rgb888(src, rect)
@@ -0,0 +1,73 @@
+# backends/present_pygame.py
+from __future__ import annotations
+
+from typing import List, Optional, Sequence
+
+import pygame
+
+from msui.backends.canvas import Rect, clip_rect
+from msui.log import LogMixin
+
+
+class PygamePresenter(LogMixin):
+    """
+    Presents a canvas surface to an integer-scaled pygame window.
+
+    Only the given rects are scaled, straight into the window surface, and
+    pushed with display.update(rects); no full-size temporary surface, no
+    full flip. Nearest-neighbour scaling of a sub-rect equals that part of a
+    full scale, so partial presents are exact.
+    """
+
+    def __init__(self, window: pygame.Surface, w: int, h: int, scale: int = 1):
+        self.window = window
+        self.w = int(w)
+        self.h = int(h)
+        self.scale = max(1, int(scale))
+        self.log.info("presenter_init", backend="pygame", w=self.w, h=self.h, scale=self.scale)
+
+    def _scale_rect(self, surface: pygame.Surface, r: Rect) -> pygame.Rect:
+        x, y, w, h = r
+        s = self.scale
+        dst = pygame.Rect(x * s, y * s, w * s, h * s)
+        src = surface.subsurface(pygame.Rect(x, y, w, h))
+        if s == 1:
+            self.window.blit(src, dst)
+        else:
+            # scale directly into the window (dest size must match exactly)
+            pygame.transform.scale(src, dst.size, self.window.subsurface(dst))
+        return dst
+
+    def present(self, surface: pygame.Surface, rects: Optional[Sequence[Rect]] = None) -> List[pygame.Rect]:
+        """
+        Upload `rects` (canvas coords) of `surface`; None means the whole frame.
+        Returns the window rects that were updated.
+        """
+        if rects is None:
+            rects = [(0, 0, self.w, self.h)]
+
+        updated: List[pygame.Rect] = []
+        for rect in rects:
+            r = clip_rect(rect, self.w, self.h)
+            if r is not None:
+                updated.append(self._scale_rect(surface, r))
+
+        if len(updated) == 1 and updated[0].size == self.window.get_size():
+            pygame.display.flip()
+        elif updated:
+            pygame.display.update(updated)
+        return updated
+
+    # ---- FramePresenter (see present_thread.py) ----
+    # Main thread only (SDL): use with an unstarted PresentThread, never start() it.
+    def new_frame(self, canvas) -> pygame.Surface:
+        return canvas.surface.copy()
+
+    def snapshot(self, canvas, frame: pygame.Surface, rects: Sequence[Rect]) -> None:
+        for rect in rects:
+            r = clip_rect(rect, self.w, self.h)
+            if r is not None:
+                frame.blit(canvas.surface, (r[0], r[1]), pygame.Rect(*r))
+
+    def present_frame(self, frame: pygame.Surface, rects: Sequence[Rect]) -> None:
+        self.present(frame, rects)
@@ -0,0 +1,195 @@
+# backends/present_thread.py
+"""
+Background presenting.
+
+The main loop renders into its canvas, then submit() snapshots the dirty rects
+into a free frame and hands it to a worker thread that pushes it to the
+display. Slow uploads (SPI transfers, window updates) then overlap with the
+next input poll and render instead of delaying them.
+
+Handoff between the two threads is two deques (free frames, ready frames);
+append/popleft are atomic, so no lock is held around the copy or the upload.
+With two frames, if the worker is still busy when the next frame is submitted
+and the previous submission hasn't been picked up yet, the new rects are
+merged into that pending frame (frame skipping) instead of blocking.
+
+For framebuffer/SPI presenters (ST7789Display, ...). SDL only supports window
+updates from the main thread, so a PygamePresenter must not run on a started
+PresentThread; unstarted, submit() presents synchronously on the caller.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Optional, Protocol, Sequence, runtime_checkable
+
+from msui.backends.canvas import Rect
+from msui.log import LogMixin
+
+
+@runtime_checkable
+class FramePresenter(Protocol):
+    """
+    What PresentThread needs from a presenter (PygamePresenter, ST7789Display).
+    """
+
+    def new_frame(self, canvas) -> object:
+        """
+        Allocate a frame buffer compatible with `canvas`.
+        """
+        ...
+
+    def snapshot(self, canvas, frame: object, rects: Sequence[Rect]) -> None:
+        """
+        Copy `rects` of the canvas into `frame` (render thread).
+        """
+        ...
+
+    def present_frame(self, frame: object, rects: Sequence[Rect]) -> None:
+        """
+        Upload `rects` of `frame` to the display (worker thread).
+        """
+        ...
+
+
+class PresentThread(LogMixin):
+    """
+    Double-buffered present worker.
+
+    Only rects submitted with a frame are valid in it; presenters must upload
+    just those (they already work that way).
+    """
+
+    def __init__(self, presenter: FramePresenter, canvas, *, frames: int = 2, name: str = "msui-present"):
+        self.presenter = presenter
+        self.canvas = canvas
+        self.name = str(name)
+
+        self._free = deque(presenter.new_frame(canvas) for _ in range(max(2, int(frames))))
+        self._ready: deque = deque()
+        self._wake = threading.Event()
+        self._stop = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.submitted = 0
+        self.presented = 0
+        self.coalesced = 0
+        self.errors = 0
+
+        self.log.info("present_thread_init", name=self.name, frames=len(self._free))
+
+    # ---- lifecycle ----
+    def start(self) -> "PresentThread":
+        if self._thread is None:
+            self._stop = False
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """
+        Present anything still pending, then stop the worker.
+        """
+        t = self._thread
+        if t is None:
+            return
+        self._stop = True
+        self._wake.set()
+        t.join(timeout)
+        if t.is_alive():
+            # Keep the handle: the worker is still inside an upload.
+            self.log.warn("present_thread_stop_timeout", name=self.name, timeout_s=float(timeout))
+            return
+        self._thread = None
+        self.log.info(
+            "present_thread_stop",
+            name=self.name,
+            submitted=self.submitted,
+            presented=self.presented,
+            coalesced=self.coalesced,
+            errors=self.errors,
+        )
+
+    def __enter__(self) -> "PresentThread":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ---- render side ----
+    def submit(self, rects: Optional[Sequence[Rect]] = None) -> None:
+        """
+        Snapshot `rects` of the canvas (None: full frame) and queue them.
+        """
+        if rects is None:
+            rects = [(0, 0, int(self.canvas.w), int(self.canvas.h))]
+        rects = list(rects)
+        if not rects:
+            return
+
+        while True:
+            try:
+                frame = self._free.popleft()
+                break
+            except IndexError:
+                pass
+            try:
+                # Worker is busy and a frame is still queued: take it back and
+                # fold the new rects in (its old rects stay valid).
+                frame, pending = self._ready.popleft()
+                rects = list(dict.fromkeys(pending + rects))
+                self.coalesced += 1
+                break
+            except IndexError:
+                # worker is between returning a frame and taking the next one
+                time.sleep(0)
+
+        self.presenter.snapshot(self.canvas, frame, rects)
+        self._ready.append((frame, rects))
+        self.submitted += 1
+        self._wake.set()
+
+        if self._thread is None:
+            # not started: present synchronously
+            self._drain()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every submitted frame has been presented (or failed).
+        """
+        deadline = None if timeout is None else time.perf_counter() + float(timeout)
+        # each coalesced submit re-queued a frame instead of adding one
+        while self.submitted - self.coalesced - self.presented - self.errors > 0:
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+            time.sleep(0.001)
+        return True
+
+    # ---- worker side ----
+    def _drain(self) -> None:
+        while True:
+            try:
+                frame, rects = self._ready.popleft()
+            except IndexError:
+                break
+            try:
+                self.presenter.present_frame(frame, rects)
+                self.presented += 1
+            except Exception as e:  # noqa: BLE001
+                # Keep presenting later frames; a transient bus error shouldn't kill the UI.
+                self.errors += 1
+                self.log.error("present_failed", name=self.name, error=repr(e))
+            finally:
+                self._free.append(frame)
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            self._drain()
+            if self._stop:
+                self._drain()
+                return
+
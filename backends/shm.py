@@ -0,0 +1,311 @@
+# backends/shm.py
+"""
+Shared-memory framebuffer for an out-of-process display server.
+
+The UI process renders into its own FramebufferCanvas as usual and publish()es
+the dirty rects into a multiprocessing.shared_memory block. A display-server
+process attaches to the same block, copies out each new frame and pushes it to
+the panel at its own cadence, so SPI/GPIO stalls never block the UI loop.
+
+Block layout (little-endian header, then raw canvas pixels):
+
+  magic "MSFB", version, w, h, stride_px, flags (bit 0: big-endian pixels)
+  frame    u64  frames published so far
+  n_rects  u32  dirty rects of `frame` (0 = full frame)
+  rects    MAX_RECTS x (x, y, w, h) u16
+  pixels   stride_px * h * 2 bytes
+
+Synchronization lives outside the block, in multiprocessing primitives the
+owner creates and hands to the server process (`fb.sync`, passed as a Process
+argument):
+
+  lock   held by publish() around the pixel copy + header, and by read()
+         around its copy; its acquire/release syscalls are the memory
+         barriers plain shared-memory stores lack (aarch64 reorders them)
+  ready  Event set after each publish(); the server blocks on it instead
+         of polling
+
+A reader that missed frames (frame != last + 1) can't know their rects and
+re-reads the whole frame instead.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import struct
+from multiprocessing import shared_memory
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+from msui.backends.canvas import Rect, clip_rect
+from msui.log import LogMixin
+
+MAGIC = b"MSFB"
+VERSION = 2
+MAX_RECTS = 32
+
+_FIXED = struct.Struct("<4sHHHHH")  # magic, version, w, h, stride_px, flags
+_FRAME = struct.Struct("<QI")       # frame, n_rects
+_RECT = struct.Struct("<HHHH")
+
+_OFF_FRAME = 16  # _FIXED is 14 bytes; keep the u64 aligned
+_OFF_RECTS = _OFF_FRAME + _FRAME.size + 4
+HEADER_SIZE = _OFF_RECTS + MAX_RECTS * _RECT.size
+
+FLAG_BIG_ENDIAN = 1
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        pass
+    # Older versions register attachers with the resource tracker, which then
+    # unlinks the block when the attaching process exits; only the owner
+    # should. Unregistering afterwards isn't an option: child processes share
+    # the owner's tracker and would drop its registration.
+    from multiprocessing import resource_tracker
+
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def _copy_rects(dst: memoryview, src: memoryview, stride_px: int, rects: Iterable[Rect]) -> None:
+    stride_b = stride_px * 2
+    for x, y, w, h in rects:
+        if x == 0 and w == stride_px:
+            a, b = y * stride_b, (y + h) * stride_b
+            dst[a:b] = src[a:b]
+            continue
+        n = w * 2
+        for yy in range(y, y + h):
+            a = yy * stride_b + x * 2
+            dst[a:a + n] = src[a:a + n]
+
+
+class SharedFramebuffer(LogMixin):
+    """
+    One RGB565 frame plus its dirty rects in shared memory.
+
+    The renderer create()s it (and unlink()s it on shutdown); the display
+    server attach()es by name with the creator's `sync` primitives.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, sync: Tuple[object, object], *, owner: bool):
+        self._shm = shm
+        self._lock, self._ready = sync
+        self.owner = bool(owner)
+        self.name = shm.name
+        buf = shm.buf
+
+        magic, version, w, h, stride, flags = _FIXED.unpack_from(buf, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{shm.name!r} is not an msui framebuffer (magic={magic!r}, version={version})")
+        self.w, self.h, self.stride = int(w), int(h), int(stride)
+        self.byteorder = "big" if flags & FLAG_BIG_ENDIAN else "little"
+        self.nbytes = self.stride * self.h * 2
+        self.pixels = buf[HEADER_SIZE:HEADER_SIZE + self.nbytes]
+
+        # reader state; the first read() is always a full frame (panel contents unknown)
+        self.last_frame = 0
+        self._synced = False
+
+    # ---- lifecycle ----
+    @classmethod
+    def create(
+        cls,
+        name: Optional[str],
+        w: int,
+        h: int,
+        *,
+        stride_px: Optional[int] = None,
+        byteorder: str = "big",
+    ) -> "SharedFramebuffer":
+        """
+        Allocate a new block (name=None: let the OS pick one; see .name).
+        byteorder must match the canvas that publishes into it.
+        """
+        if byteorder not in ("little", "big"):
+            raise ValueError(f"Unknown byteorder: {byteorder!r}")
+        stride = int(stride_px) if stride_px else int(w)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=HEADER_SIZE + stride * int(h) * 2)
+        shm.buf[:HEADER_SIZE] = bytes(HEADER_SIZE)
+        flags = FLAG_BIG_ENDIAN if byteorder == "big" else 0
+        _FIXED.pack_into(shm.buf, 0, MAGIC, VERSION, int(w), int(h), stride, flags)
+        fb = cls(shm, (multiprocessing.Lock(), multiprocessing.Event()), owner=True)
+        fb.log.info("shm_fb_create", name=fb.name, w=fb.w, h=fb.h, stride_px=fb.stride, byteorder=byteorder, nbytes=shm.size)
+        return fb
+
+    @classmethod
+    def attach(cls, name: str, sync: Tuple[object, object]) -> "SharedFramebuffer":
+        """
+        Attach to the block `name`; `sync` is the creator's `fb.sync`.
+        """
+        fb = cls(_attach(name), sync, owner=False)
+        fb.log.info("shm_fb_attach", name=fb.name, w=fb.w, h=fb.h, stride_px=fb.stride, byteorder=fb.byteorder)
+        return fb
+
+    def close(self) -> None:
+        self.pixels.release()
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """
+        Remove the block (owner, after close()).
+        """
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedFramebuffer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+        if self.owner:
+            self.unlink()
+
+    @property
+    def sync(self) -> Tuple[object, object]:
+        """
+        (lock, ready) to pass to the server process, e.g. as a Process argument.
+        """
+        return (self._lock, self._ready)
+
+    # ---- header ----
+    @property
+    def frame(self) -> int:
+        """
+        Number of frames published so far.
+        """
+        return _FRAME.unpack_from(self._shm.buf, _OFF_FRAME)[0]
+
+    def _clip_all(self, rects: Optional[Iterable[Rect]]) -> List[Rect]:
+        if rects is None:
+            return [(0, 0, self.w, self.h)]
+        return [r for r in (clip_rect(rc, self.w, self.h) for rc in rects) if r is not None]
+
+    # ---- writer (renderer process) ----
+    def publish(self, canvas, rects: Optional[Sequence[Rect]] = None) -> int:
+        """
+        Copy `rects` (None: full frame) of a FramebufferCanvas into shared
+        memory and announce them as the next frame. Returns the frame number.
+        """
+        if int(canvas.stride) != self.stride or int(canvas.h) != self.h or canvas.byteorder != self.byteorder:
+            raise ValueError(
+                f"canvas ({canvas.stride}x{canvas.h}, {canvas.byteorder}) doesn't match "
+                f"shared framebuffer ({self.stride}x{self.h}, {self.byteorder})"
+            )
+        clipped = self._clip_all(rects)
+        if not clipped:
+            return self.frame
+        if len(clipped) > MAX_RECTS:
+            clipped = [(0, 0, self.w, self.h)]
+
+        buf = self._shm.buf
+        with self._lock:
+            frame = self.frame + 1
+            _copy_rects(self.pixels, canvas.buffer, self.stride, clipped)
+            for i, r in enumerate(clipped):
+                _RECT.pack_into(buf, _OFF_RECTS + i * _RECT.size, *r)
+            _FRAME.pack_into(buf, _OFF_FRAME, frame, len(clipped))
+        self._ready.set()
+        return frame
+
+    # ---- reader (display server process) ----
+    def new_frame(self) -> bytearray:
+        """
+        Local frame buffer for read().
+        """
+        return bytearray(self.nbytes)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until a frame was published since the last wait() (False on timeout).
+        """
+        if not self._ready.wait(timeout):
+            return False
+        # A publish() landing between here and read() is still picked up by
+        # read() (and sets the event again for the next wait()).
+        self._ready.clear()
+        return True
+
+    def read(self, dst: bytearray) -> Optional[List[Rect]]:
+        """
+        Copy the newest frame's changes into `dst`. Returns the rects that
+        changed since the previous read() (None: nothing new).
+        """
+        buf = self._shm.buf
+        with self._lock:
+            frame, n = _FRAME.unpack_from(buf, _OFF_FRAME)
+            if frame == self.last_frame and self._synced:
+                return None
+
+            if self._synced and frame == self.last_frame + 1 and 0 < n <= MAX_RECTS:
+                rects = [_RECT.unpack_from(buf, _OFF_RECTS + i * _RECT.size) for i in range(n)]
+            else:
+                # missed a frame (or first read): its rects are gone
+                rects = [(0, 0, self.w, self.h)]
+            _copy_rects(memoryview(dst), self.pixels, self.stride, rects)
+
+        self.last_frame = frame
+        self._synced = True
+        return rects
+
+
+class DisplayServer(LogMixin):
+    """
+    Display-server loop: wait for published frames and push them.
+
+    `display` is a FramePresenter-style object taking (bytearray, stride_px)
+    frames, e.g. ST7789Display.present_frame().
+    """
+
+    def __init__(self, fb: SharedFramebuffer, display, *, wake_s: float = 0.25):
+        self.fb = fb
+        self.display = display
+        # Longest block in wait(), so run() still checks should_stop when idle.
+        self.wake_s = max(0.0, float(wake_s))
+        self._frame = fb.new_frame()
+        self.presented = 0
+        self.log.info("display_server_init", name=fb.name, wake_s=self.wake_s)
+
+    def step(self) -> bool:
+        """
+        Present the newest frame if there is one. Returns True if it did.
+        """
+        rects = self.fb.read(self._frame)
+        if rects is None:
+            return False
+        self.display.present_frame((self._frame, self.fb.stride), rects)
+        self.presented += 1
+        return True
+
+    def run(self, should_stop: Callable[[], bool] = lambda: False) -> None:
+        self.step()  # first frame may predate us
+        while not should_stop():
+            if self.fb.wait(self.wake_s):
+                self.step()
+        self.log.info("display_server_stop", name=self.fb.name, presented=self.presented)
+
+
+def serve(
+    name: str,
+    make_display: Callable[[], object],
+    sync: Tuple[object, object],
+    wake_s: float = 0.25,
+) -> None:
+    """
+    multiprocessing target: attach to `name` and serve until killed.
+
+      Process(target=serve, args=(fb.name, make_display, fb.sync)).start()
+
+    `make_display` builds the display inside the server process (SPI handles
+    don't survive a fork/pickle), e.g. a module-level factory function.
+    """
+    fb = SharedFramebuffer.attach(name, sync)
+    try:
+        DisplayServer(fb, make_display(), wake_s=wake_s).run()
+    finally:
+        fb.close()
@@ -0,0 +1,346 @@
+# backends/st7789.py
+"""
+ST7789 SPI panel backend (1.69" 240x280 target).
+
+Rendering happens in a FramebufferCanvas created with byteorder="big", so the
+canvas buffer already is the panel's wire format (RGB565, MSB first). Presenting
+then only pushes damaged regions: one CASET/RASET address window + RAMWR per
+rect, instead of streaming the whole frame over SPI.
+
+The bus is abstracted by the small SpiTransport protocol:
+  - FakeTransport: in-memory, emulates panel GRAM (desktop tests)
+  - SpidevTransport: Linux spidev + a DC-pin callback (real hardware)
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Callable, Iterable, List, Optional, Protocol, Tuple, runtime_checkable
+
+from msui.backends.canvas import Rect
+from msui.log import LogMixin
+
+# Command set subset (datasheet names)
+SWRESET = 0x01
+SLPOUT = 0x11
+NORON = 0x13
+INVON = 0x21
+DISPON = 0x29
+CASET = 0x2A
+RASET = 0x2B
+RAMWR = 0x2C
+MADCTL = 0x36
+COLMOD = 0x3A
+
+COLMOD_RGB565 = 0x55
+
+
+@runtime_checkable
+class SpiTransport(Protocol):
+    """
+    Stable bus interface: a command byte (DC low) followed by data bytes (DC high).
+    """
+
+    def command(self, cmd: int) -> None: ...
+    def data(self, buf) -> None: ...
+
+
+class FakeTransport(LogMixin, SpiTransport):
+    """
+    In-memory transport that behaves like the panel controller.
+
+    Tracks bytes/commands sent and maintains a GRAM copy (big-endian RGB565)
+    so tests can check exactly what reached the "glass".
+    """
+
+    def __init__(self, gram_w: int = 240, gram_h: int = 320):
+        self.gram_w = int(gram_w)
+        self.gram_h = int(gram_h)
+        self.gram = bytearray(self.gram_w * self.gram_h * 2)
+
+        self.commands: List[int] = []
+        self.bytes_sent = 0
+        self.pixel_bytes = 0
+
+        self._cmd: Optional[int] = None
+        self._args = bytearray()
+        self._win = (0, self.gram_w - 1, 0, self.gram_h - 1)
+        self._cx = 0
+        self._cy = 0
+
+    def reset_counters(self) -> None:
+        self.commands.clear()
+        self.bytes_sent = 0
+        self.pixel_bytes = 0
+
+    def command(self, cmd: int) -> None:
+        self._cmd = int(cmd)
+        self._args.clear()
+        self.commands.append(self._cmd)
+        self.bytes_sent += 1
+        if self._cmd == RAMWR:
+            x0, _, y0, _ = self._win
+            self._cx, self._cy = x0, y0
+
+    def data(self, buf) -> None:
+        mv = memoryview(buf).cast("B")
+        self.bytes_sent += len(mv)
+
+        if self._cmd in (CASET, RASET):
+            self._args += mv
+            if len(self._args) >= 4:
+                a = (self._args[0] << 8) | self._args[1]
+                b = (self._args[2] << 8) | self._args[3]
+                x0, x1, y0, y1 = self._win
+                self._win = (a, b, y0, y1) if self._cmd == CASET else (x0, x1, a, b)
+            return
+
+        if self._cmd != RAMWR:
+            return
+
+        self.pixel_bytes += len(mv)
+        x0, x1, _, y1 = self._win
+        i = 0
+        n = len(mv) - 1
+        while i < n and self._cy <= y1:
+            run = min(x1 - self._cx + 1, (n + 1 - i) // 2)
+            if 0 <= self._cy < self.gram_h:
+                off = (self._cy * self.gram_w + self._cx) * 2
+                self.gram[off:off + run * 2] = mv[i:i + run * 2]
+            i += run * 2
+            self._cx += run
+            if self._cx > x1:
+                self._cx = x0
+                self._cy += 1
+
+
+class SpidevTransport(LogMixin, SpiTransport):
+    """
+    Linux spidev transport. The DC (data/command) line is driven through a
+    callback so any GPIO library can be used: set_dc(False)=command, True=data.
+    """
+
+    def __init__(
+        self,
+        set_dc: Callable[[bool], None],
+        *,
+        bus: int = 0,
+        device: int = 0,
+        speed_hz: int = 40_000_000,
+        mode: int = 0,
+        chunk: int = 4096,
+    ):
+        import spidev  # optional dependency; only needed on the device
+
+        self._spi = spidev.SpiDev()
+        self._spi.open(int(bus), int(device))
+        self._spi.max_speed_hz = int(speed_hz)
+        self._spi.mode = int(mode)
+        self._set_dc = set_dc
+        self.chunk = max(1, int(chunk))
+
+        self.log.info("spi_open", bus=int(bus), device=int(device), speed_hz=int(speed_hz), mode=int(mode))
+
+    def command(self, cmd: int) -> None:
+        self._set_dc(False)
+        self._spi.writebytes2(bytes((int(cmd) & 0xFF,)))
+
+    def data(self, buf) -> None:
+        self._set_dc(True)
+        mv = memoryview(buf).cast("B")
+        for i in range(0, len(mv), self.chunk):
+            self._spi.writebytes2(mv[i:i + self.chunk])
+
+    def close(self) -> None:
+        self._spi.close()
+
+
+class ST7789Display(LogMixin):
+    """
+    Presents RGB565 big-endian framebuffers to an ST7789 over a SpiTransport,
+    uploading only the given rects through address windows.
+
+    x_offset/y_offset map the visible area into the controller's 240x320 GRAM
+    (240x280 modules usually sit at row 20).
+    """
+
+    def __init__(
+        self,
+        transport: SpiTransport,
+        *,
+        w: int = 240,
+        h: int = 280,
+        x_offset: int = 0,
+        y_offset: int = 20,
+        madctl: int = 0x00,
+        invert: bool = True,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.transport = transport
+        self.w = int(w)
+        self.h = int(h)
+        self.x_offset = int(x_offset)
+        self.y_offset = int(y_offset)
+        self.madctl = int(madctl) & 0xFF
+        self.invert = bool(invert)
+        self._sleep = sleep
+
+        # Reused gather buffer for windows narrower than the framebuffer stride.
+        self._scratch = bytearray(self.w * self.h * 2)
+
+        self.log.info(
+            "display_init",
+            driver="st7789",
+            w=self.w,
+            h=self.h,
+            x_offset=self.x_offset,
+            y_offset=self.y_offset,
+        )
+
+    def _cmd(self, cmd: int, args: bytes = b"") -> None:
+        self.transport.command(cmd)
+        if args:
+            self.transport.data(args)
+
+    def init(self) -> None:
+        """
+        Power-up sequence: reset, wake, RGB565, orientation, display on.
+        """
+        self._cmd(SWRESET)
+        self._sleep(0.150)
+        self._cmd(SLPOUT)
+        self._sleep(0.120)
+        self._cmd(COLMOD, bytes((COLMOD_RGB565,)))
+        self._cmd(MADCTL, bytes((self.madctl,)))
+        if self.invert:
+            self._cmd(INVON)
+        self._cmd(NORON)
+        self._cmd(DISPON)
+        self._sleep(0.020)
+        self.log.info("display_on", driver="st7789")
+
+    def set_window(self, x: int, y: int, w: int, h: int) -> None:
+        """
+        CASET/RASET to an inclusive address window, then start RAMWR.
+        """
+        x0 = x + self.x_offset
+        x1 = x0 + w - 1
+        y0 = y + self.y_offset
+        y1 = y0 + h - 1
+        self._cmd(CASET, bytes((x0 >> 8, x0 & 0xFF, x1 >> 8, x1 & 0xFF)))
+        self._cmd(RASET, bytes((y0 >> 8, y0 & 0xFF, y1 >> 8, y1 & 0xFF)))
+        self.transport.command(RAMWR)
+
+    def _clip(self, rect: Rect) -> Optional[Tuple[int, int, int, int]]:
+        x, y, w, h = (int(v) for v in rect)
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(self.w, x + w), min(self.h, y + h)
+        if x1 <= x0 or y1 <= y0:
+            return None
+        return (x0, y0, x1 - x0, y1 - y0)
+
+    def write_window(self, rect: Rect, data) -> int:
+        """
+        Upload tightly packed big-endian RGB565 pixels (w*h*2 bytes) to `rect`.
+        `rect` must already be on-screen (see _clip()).
+        """
+        x, y, w, h = rect
+        self.set_window(x, y, w, h)
+        self.transport.data(data)
+        return len(data)
+
+    def write_rect(self, buf, stride_px: int, rect: Rect) -> int:
+        """
+        Upload one rect from a big-endian RGB565 buffer with the given stride.
+        Returns the number of pixel bytes sent.
+        """
+        r = self._clip(rect)
+        if r is None:
+            return 0
+        x, y, w, h = r
+        src = memoryview(buf).cast("B")
+        row_bytes = w * 2
+        stride_b = int(stride_px) * 2
+
+        self.set_window(x, y, w, h)
+
+        if x == 0 and w == stride_px:
+            # Full-width rows are contiguous: send straight from the framebuffer.
+            off = y * stride_b
+            self.transport.data(src[off:off + h * row_bytes])
+            return h * row_bytes
+
+        out = memoryview(self._scratch)
+        o = 0
+        for yy in range(y, y + h):
+            s = yy * stride_b + x * 2
+            out[o:o + row_bytes] = src[s:s + row_bytes]
+            o += row_bytes
+        self.transport.data(out[:o])
+        return o
+
+    @staticmethod
+    def _check_canvas(canvas) -> None:
+        if getattr(canvas, "byteorder", None) != "big":
+            raise ValueError("ST7789Display needs a FramebufferCanvas with byteorder='big'")
+
+    def present(self, canvas, rects: Optional[Iterable[Rect]] = None) -> int:
+        """
+        Push damaged rects (default: full frame) from a FramebufferCanvas.
+        Returns pixel bytes sent.
+        """
+        self._check_canvas(canvas)
+
+        if rects is None:
+            rects = ((0, 0, self.w, self.h),)
+
+        sent = 0
+        for r in rects:
+            sent += self.write_rect(canvas.buffer, canvas.stride, r)
+        return sent
+
+    def present_array(self, fb, encoder, rects: Optional[Iterable[Rect]] = None) -> int:
+        """
+        Push rects of an ndarray frame (e.g. NumpyCanvas.fb, RGB565 or RGB888)
+        through a pixfmt.Rgb565Encoder. Returns pixel bytes sent.
+        """
+        if rects is None:
+            rects = ((0, 0, self.w, self.h),)
+
+        sent = 0
+        for rect in rects:
+            r = self._clip(rect)
+            if r is None:
+                continue
+            sent += self.write_window(r, encoder.encode(fb, r))
+        return sent
+
+    # ---- FramePresenter (see present_thread.py) ----
+    # Frames are (bytearray, stride_px) copies of the canvas buffer. Don't call
+    # present() concurrently with a PresentThread: both use the gather scratch.
+    def new_frame(self, canvas) -> Tuple[bytearray, int]:
+        self._check_canvas(canvas)
+        return (bytearray(len(canvas.buffer)), int(canvas.stride))
+
+    def snapshot(self, canvas, frame: Tuple[bytearray, int], rects: Iterable[Rect]) -> None:
+        buf, stride_px = frame
+        src = canvas.buffer
+        dst = memoryview(buf)
+        stride_b = stride_px * 2
+        for rect in rects:
+            r = self._clip(rect)
+            if r is None:
+                continue
+            x, y, w, h = r
+            if x == 0 and w == stride_px:
+                a, b = y * stride_b, (y + h) * stride_b
+                dst[a:b] = src[a:b]
+                continue
+            for yy in range(y, y + h):
+                a = yy * stride_b + x * 2
+                dst[a:a + w * 2] = src[a:a + w * 2]
+
+    def present_frame(self, frame: Tuple[bytearray, int], rects: Iterable[Rect]) -> None:
+        buf, stride_px = frame
+        for r in rects:
+            self.write_rect(buf, stride_px, r)
@@ -0,0 +1,421 @@
+# backends/stream.py
+"""
+Frame streaming over a local socket (headless UI debugging).
+
+The renderer side (FrameStreamServer) listens on a Unix-domain socket or a
+TCP port and sends only dirty rects, each zlib-compressed RGB565, followed by
+an end-of-frame marker. A viewer (FrameStreamClient, or `python -m
+msui.backends.stream ADDRESS` for a pygame window) applies them to its own
+copy of the frame.
+
+Addresses: "unix:/tmp/msui.sock" or "tcp:HOST:PORT" (e.g. tcp:127.0.0.1:7789;
+use an SSH tunnel to view a board from a desktop).
+
+Wire format: every message is a little-endian header
+
+  type u8, x u16, y u16, w u16, h u16, payload_len u32
+
+followed by payload_len bytes:
+
+  HELLO  w, h = frame size; payload = 1 byte: 1 if pixels are big-endian
+  RECT   rect; payload = zlib(tightly packed RGB565 rows)
+  END    end of frame; x = frame number & 0xFFFF
+
+The server is also a FramePresenter, so PresentThread can move the
+compression and socket writes off the render loop.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import select
+import socket
+import struct
+import sys
+import zlib
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from msui.backends.canvas import Rect, clip_rect
+from msui.log import LogMixin
+
+MSG_HELLO = 1
+MSG_RECT = 2
+MSG_END = 3
+
+_HDR = struct.Struct("<BHHHHI")
+
+
+def parse_address(address: str) -> Tuple[int, object]:
+    """
+    "unix:PATH" / "tcp:HOST:PORT" -> (socket family, sockaddr).
+    """
+    kind, _, rest = address.partition(":")
+    if kind == "unix" and rest:
+        return socket.AF_UNIX, rest
+    if kind == "tcp":
+        host, _, port = rest.rpartition(":")
+        if host and port.isdigit():
+            return socket.AF_INET, (host, int(port))
+    raise ValueError(f"Bad stream address {address!r} (expected unix:PATH or tcp:HOST:PORT)")
+
+
+def _gather(src: memoryview, stride_px: int, rect: Rect, out: bytearray) -> memoryview:
+    # Tightly packed rows of `rect` (contiguous full-width rects are sliced directly).
+    x, y, w, h = rect
+    stride_b = stride_px * 2
+    if x == 0 and w == stride_px:
+        return src[y * stride_b:(y + h) * stride_b]
+    n = w * 2
+    dst = memoryview(out)
+    o = 0
+    for yy in range(y, y + h):
+        a = yy * stride_b + x * 2
+        dst[o:o + n] = src[a:a + n]
+        o += n
+    return dst[:o]
+
+
+def _recv_exact(sock: socket.socket, n: int) -> bytes:
+    buf = bytearray(n)
+    view = memoryview(buf)
+    got = 0
+    while got < n:
+        k = sock.recv_into(view[got:], n - got)
+        if k == 0:
+            raise ConnectionError("stream closed")
+        got += k
+    return bytes(buf)
+
+
+class FrameStreamServer(LogMixin):
+    """
+    Streams dirty rects of a FramebufferCanvas to any connected viewers.
+
+    Keeps a mirror of everything sent so viewers connecting mid-session get
+    a full frame first.
+
+    Viewer sockets are non-blocking: what a viewer can't take right away is
+    queued per viewer and flushed on later send()/poll() calls. A viewer whose
+    queue grows past max_backlog_bytes is dropped; the render loop never
+    waits on a socket.
+    """
+
+    def __init__(
+        self,
+        address: str,
+        w: int,
+        h: int,
+        *,
+        stride_px: Optional[int] = None,
+        byteorder: str = "big",
+        level: int = 1,
+        max_viewers: int = 4,
+        max_backlog_bytes: int = 512 * 1024,
+    ):
+        self.address = str(address)
+        self.w = int(w)
+        self.h = int(h)
+        self.stride = int(stride_px) if stride_px else self.w
+        self.byteorder = byteorder
+        self.level = int(level)
+        self.max_viewers = max(1, int(max_viewers))
+        self.max_backlog_bytes = max(0, int(max_backlog_bytes))
+
+        self._mirror = bytearray(self.stride * self.h * 2)
+        self._scratch = bytearray(self.w * self.h * 2)
+        self._viewers: List[socket.socket] = []
+        self._backlog: Dict[socket.socket, bytearray] = {}
+        self._frame_no = 0
+
+        # Counters: uncompressed rect bytes vs bytes written per viewer.
+        self.frames = 0
+        self.raw_bytes = 0
+        self.sent_bytes = 0
+
+        family, addr = parse_address(self.address)
+        if family == socket.AF_UNIX and os.path.exists(addr):
+            os.unlink(addr)  # stale socket from a previous run
+        self._sock = socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_INET:
+            self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(addr)
+        self._sock.listen(self.max_viewers)
+        self._sock.setblocking(False)
+
+        self.log.info("stream_listen", address=self.address, w=self.w, h=self.h, byteorder=self.byteorder, zlib_level=self.level)
+
+    def close(self) -> None:
+        for v in self._viewers:
+            v.close()
+        self._viewers.clear()
+        self._backlog.clear()
+        family, addr = parse_address(self.address)
+        self._sock.close()
+        if family == socket.AF_UNIX and os.path.exists(addr):
+            os.unlink(addr)
+        self.log.info("stream_close", frames=self.frames, raw_bytes=self.raw_bytes, sent_bytes=self.sent_bytes)
+
+    def __enter__(self) -> "FrameStreamServer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def viewers(self) -> int:
+        return len(self._viewers)
+
+    @property
+    def backlog_bytes(self) -> int:
+        """
+        Bytes queued for viewers that couldn't take them yet (poll() flushes).
+        """
+        return sum(len(b) for b in self._backlog.values())
+
+    # ---- connections ----
+    def _accept(self) -> List[socket.socket]:
+        new = []
+        while len(self._viewers) + len(new) < self.max_viewers:
+            try:
+                conn, _ = self._sock.accept()
+            except (BlockingIOError, InterruptedError):
+                break
+            # a viewer that stops reading is dropped instead of stalling the UI
+            conn.setblocking(False)
+            self._backlog[conn] = bytearray()
+            if conn.family == socket.AF_INET:
+                conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            new.append(conn)
+            self.log.info("stream_viewer_connected", viewers=len(self._viewers) + len(new))
+        return new
+
+    def _drop(self, v: socket.socket, viewers: List[socket.socket], reason: str) -> None:
+        # viewer went away (or stalled); keep streaming to the others
+        v.close()
+        self._backlog.pop(v, None)
+        if v in viewers:
+            viewers.remove(v)
+        if viewers is not self._viewers and v in self._viewers:
+            self._viewers.remove(v)
+        self.log.info("stream_viewer_dropped", error=reason, viewers=len(self._viewers))
+
+    def _flush(self, v: socket.socket, viewers: List[socket.socket]) -> None:
+        backlog = self._backlog[v]
+        while backlog:
+            try:
+                n = v.send(backlog)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as e:
+                self._drop(v, viewers, repr(e))
+                return
+            self.sent_bytes += n
+            del backlog[:n]
+        if len(backlog) > self.max_backlog_bytes:
+            self._drop(v, viewers, f"backlog {len(backlog)} > {self.max_backlog_bytes} bytes")
+
+    def _send(self, viewers: List[socket.socket], data) -> None:
+        for v in list(viewers):
+            self._backlog[v] += data
+            self._flush(v, viewers)
+
+    def _encode(self, src: memoryview, stride_px: int, rects: Sequence[Rect]) -> bytes:
+        parts = []
+        for r in rects:
+            raw = _gather(src, stride_px, r, self._scratch)
+            self.raw_bytes += len(raw)
+            z = zlib.compress(raw, self.level)
+            parts.append(_HDR.pack(MSG_RECT, r[0], r[1], r[2], r[3], len(z)))
+            parts.append(z)
+        self._frame_no += 1
+        parts.append(_HDR.pack(MSG_END, self._frame_no & 0xFFFF, 0, 0, 0, 0))
+        return b"".join(parts)
+
+    # ---- sending ----
+    def send(self, buf, stride_px: int, rects: Optional[Sequence[Rect]] = None) -> None:
+        """
+        Stream `rects` (None: full frame) of a RGB565 buffer in this stream's
+        byte order.
+        """
+        if rects is None:
+            rects = ((0, 0, self.w, self.h),)
+        clipped = [r for r in (clip_rect(rc, self.w, self.h) for rc in rects) if r is not None]
+
+        src = memoryview(buf).cast("B")
+        mirror = memoryview(self._mirror)
+        stride_b = int(stride_px) * 2
+        for x, y, w, h in clipped:
+            for yy in range(y, y + h):
+                a = yy * stride_b + x * 2
+                b = yy * self.stride * 2 + x * 2
+                mirror[b:b + w * 2] = src[a:a + w * 2]
+
+        if clipped and self._viewers:
+            self._send(self._viewers, self._encode(mirror, self.stride, clipped))
+        self.frames += 1
+        self.poll()
+
+    def poll(self) -> int:
+        """
+        Accept waiting viewers and send them the current frame, and flush
+        queued data to slow viewers. send() does this too; call it while idle
+        so new viewers don't wait for a redraw. Same thread as send().
+        Returns the number of new viewers.
+        """
+        for v in list(self._viewers):
+            if self._backlog[v]:
+                self._flush(v, self._viewers)
+        new = self._accept()
+        if new:
+            hello = _HDR.pack(MSG_HELLO, 0, 0, self.w, self.h, 1) + bytes((1 if self.byteorder == "big" else 0,))
+            self._send(new, hello + self._encode(memoryview(self._mirror), self.stride, [(0, 0, self.w, self.h)]))
+            self._viewers.extend(new)
+        return len(new)
+
+    def present(self, canvas, rects: Optional[Sequence[Rect]] = None) -> None:
+        """
+        Stream from a FramebufferCanvas (byte order must match the stream's).
+        """
+        if canvas.byteorder != self.byteorder:
+            raise ValueError(f"canvas byteorder {canvas.byteorder!r} != stream byteorder {self.byteorder!r}")
+        self.send(canvas.buffer, canvas.stride, rects)
+
+    # ---- FramePresenter (see present_thread.py) ----
+    def new_frame(self, canvas) -> Tuple[bytearray, int]:
+        return (bytearray(len(canvas.buffer)), int(canvas.stride))
+
+    def snapshot(self, canvas, frame: Tuple[bytearray, int], rects: Sequence[Rect]) -> None:
+        buf, stride_px = frame
+        dst = memoryview(buf)
+        src = canvas.buffer
+        stride_b = stride_px * 2
+        for rect in rects:
+            r = clip_rect(rect, self.w, self.h)
+            if r is None:
+                continue
+            x, y, w, h = r
+            for yy in range(y, y + h):
+                a = yy * stride_b + x * 2
+                dst[a:a + w * 2] = src[a:a + w * 2]
+
+    def present_frame(self, frame: Tuple[bytearray, int], rects: Sequence[Rect]) -> None:
+        buf, stride_px = frame
+        self.send(buf, stride_px, rects)
+
+
+class FrameStreamClient(LogMixin):
+    """
+    Viewer side: connects, then recv_frame() applies one frame's rects to
+    `buffer` (tightly packed RGB565, `byteorder`) and returns them.
+    """
+
+    def __init__(self, address: str, *, timeout: Optional[float] = None):
+        family, addr = parse_address(address)
+        self._sock = socket.socket(family, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(addr)
+
+        kind, _, _, w, h, n = _HDR.unpack(_recv_exact(self._sock, _HDR.size))
+        if kind != MSG_HELLO:
+            raise ConnectionError(f"expected HELLO, got message type {kind}")
+        flags = _recv_exact(self._sock, n)
+        self.w, self.h = int(w), int(h)
+        self.byteorder = "big" if flags and flags[0] & 1 else "little"
+        self.buffer = bytearray(self.w * self.h * 2)
+        self.frames = 0
+        self.wire_bytes = 0
+        self.log.info("stream_connected", address=address, w=self.w, h=self.h, byteorder=self.byteorder)
+
+    def close(self) -> None:
+        self._sock.close()
+
+    def fileno(self) -> int:
+        return self._sock.fileno()
+
+    def recv_frame(self) -> List[Rect]:
+        rects: List[Rect] = []
+        view = memoryview(self.buffer)
+        row_b = self.w * 2
+        while True:
+            kind, x, y, w, h, n = _HDR.unpack(_recv_exact(self._sock, _HDR.size))
+            self.wire_bytes += _HDR.size + n
+            if kind == MSG_END:
+                self.frames += 1
+                return rects
+            payload = _recv_exact(self._sock, n)
+            if kind != MSG_RECT:
+                continue  # unknown message: skip (forward compatible)
+            raw = zlib.decompress(payload)
+            o = 0
+            for yy in range(y, y + h):
+                a = yy * row_b + x * 2
+                view[a:a + w * 2] = raw[o:o + w * 2]
+                o += w * 2
+            rects.append((x, y, w, h))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Pygame viewer:  python -m msui.backends.stream tcp:127.0.0.1:7789 [--scale 3]
+    """
+    ap = argparse.ArgumentParser(prog="python -m msui.backends.stream", description="msui frame stream viewer")
+    ap.add_argument("address", help="unix:PATH or tcp:HOST:PORT")
+    ap.add_argument("--scale", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    import pygame
+
+    client = FrameStreamClient(args.address)
+    scale = max(1, int(args.scale))
+    pygame.init()
+    win = pygame.display.set_mode((client.w * scale, client.h * scale))
+    pygame.display.set_caption(f"msui stream {args.address}")
+
+    # 16-bit surface with RGB565 masks; received rect rows are copied into it.
+    surf = pygame.Surface((client.w, client.h), 0, 16, (0xF800, 0x07E0, 0x001F, 0))
+    pitch = surf.get_pitch()
+    row_b = client.w * 2
+    swap = client.byteorder != sys.byteorder
+    data = client.buffer
+
+    try:
+        while True:
+            for ev in pygame.event.get():
+                if ev.type == pygame.QUIT:
+                    return 0
+            ready, _, _ = select.select([client], [], [], 0.05)
+            if not ready:
+                continue
+            rects = client.recv_frame()
+            if not rects:
+                continue
+            pixels = surf.get_buffer()
+            for x, y, w, h in rects:
+                n = w * 2
+                for yy in range(y, y + h):
+                    a = yy * row_b + x * 2
+                    if swap:
+                        row = array("H", data[a:a + n])
+                        row.byteswap()
+                        pixels.write(row.tobytes(), yy * pitch + x * 2)
+                    else:
+                        pixels.write(bytes(data[a:a + n]), yy * pitch + x * 2)
+            del pixels  # unlocks the surface
+            updated = []
+            for x, y, w, h in rects:
+                dst = pygame.Rect(x * scale, y * scale, w * scale, h * scale)
+                # 16-bit source vs window format: scale to a temp, blit converts
+                win.blit(pygame.transform.scale(surf.subsurface((x, y, w, h)), dst.size), dst)
+                updated.append(dst)
+            pygame.display.update(updated)
+    except (ConnectionError, KeyboardInterrupt):
+        return 0
+    finally:
+        client.close()
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,375 @@
+# msui/bench.py
+"""
+Headless render benchmark:  python -m msui.bench
+
+Drives apply_event() + render_effect_editor() over scripted scenarios on the
+demo effect and reports, per scenario:
+  - us/frame     best mean over --repeat runs
+  - calls/frame  Canvas primitive calls (counted on a separate pass)
+  - alloc        tracemalloc: mean transient peak per frame, retained after run
+
+Baselines:
+  python -m msui.bench --save base.json
+  python -m msui.bench --compare base.json     # exit 1 on regressions
+
+Logging is quiet (WARNING) unless MSUI_LOG_LEVEL is set.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+from msui.backends.input import AccelRepeater
+from msui.controls.dial import DialControl
+from msui.core.controller import apply_event
+from msui.core.dirty import DIRTY_ALL, DIRTY_NONE
+from msui.core.events import PAGE_NEXT, TOGGLE_BYPASS, VALUE_DELTA, UIEvent
+from msui.render.cache import TileCache
+from msui.render.dial_sprites import enable_dial_sprites
+from msui.render.screen_effect import render_effect_editor
+from msui.render.theme import Theme
+
+BACKENDS = ("fb", "numpy", "pygame")
+
+# Canvas calls counted per frame (bitmap calls included: caches turn draws into blits).
+_COUNTED = (
+    "fill", "round_rect", "circle", "arc", "line", "lines", "polyline", "circles",
+    "text", "text_size", "blit", "copy_rect",
+)
+
+# A step is an event to apply, or None for a forced full redraw.
+Step = Optional[UIEvent]
+
+
+# -------------------------
+# Canvas setup
+# -------------------------
+
+def _make_canvas(backend: str, theme: Theme):
+    if backend == "fb":
+        from msui.backends.canvas_fb import FramebufferCanvas
+        from msui.backends.fonts import default_bitmap_fonts
+
+        return FramebufferCanvas(theme.W, theme.H, default_bitmap_fonts())
+
+    if backend == "numpy":
+        from msui.backends.canvas_numpy import NumpyCanvas
+        from msui.backends.fonts import default_bitmap_fonts
+
+        return NumpyCanvas(theme.W, theme.H, default_bitmap_fonts())
+
+    if backend == "pygame":
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        import pygame
+
+        from msui.backends.canvas_pygame import PygameCanvas
+
+        pygame.init()
+        fonts = {
+            "S": pygame.font.SysFont("dejavusansmono", 14, bold=True),
+            "M": pygame.font.SysFont("dejavusansmono", 18, bold=True),
+            "L": pygame.font.SysFont("dejavusansmono", 22, bold=True),
+        }
+        return PygameCanvas(theme.W, theme.H, fonts, glyph_atlas=True)
+
+    raise ValueError(f"Unknown backend: {backend!r} (expected one of {BACKENDS})")
+
+
+class _CountingCanvas:
+    """
+    Forwards everything to `base`, counting Canvas primitive calls.
+    """
+
+    def __init__(self, base):
+        self.base = base
+        self.counts: Dict[str, int] = {}
+
+    def __getattr__(self, name):
+        attr = getattr(self.base, name)
+        if name not in _COUNTED:
+            return attr
+        counts = self.counts
+
+        def counted(*args, **kwargs):
+            counts[name] = counts.get(name, 0) + 1
+            return attr(*args, **kwargs)
+
+        return counted
+
+
+# -------------------------
+# Scenarios
+# -------------------------
+
+def _accel_steps() -> Tuple[int, ...]:
+    """
+    Distinct VALUE_DELTA sizes the key repeater produces while a key is held.
+    """
+    rep = AccelRepeater()
+    steps = []
+    for i in range(0, 40):
+        s = rep.step_for_hold(i * 0.1)
+        if s not in steps:
+            steps.append(s)
+    return tuple(steps)
+
+
+def _widest_dial(effect) -> Tuple[int, int, DialControl]:
+    best = None
+    for pi, page in enumerate(effect.pages):
+        for ci, ctrl in enumerate(page.controls):
+            if isinstance(ctrl, DialControl):
+                span = abs(int(ctrl.vmax) - int(ctrl.vmin))
+                if best is None or span > best[0]:
+                    best = (span, pi, ci, ctrl)
+    if best is None:
+        raise SystemExit("bench: demo effect has no DialControl")
+    return best[1], best[2], best[3]
+
+
+def _scenarios(frames: int) -> List[Tuple[str, Callable, Callable]]:
+    """
+    (name, setup(effect), steps(effect) -> List[Step]) per scenario.
+    """
+
+    def no_setup(effect) -> None:
+        return
+
+    def full_redraw(effect) -> List[Step]:
+        return [None] * frames
+
+    def page_flips(effect) -> List[Step]:
+        return [UIEvent(PAGE_NEXT)] * frames
+
+    def bypass_toggles(effect) -> List[Step]:
+        return [UIEvent(TOGGLE_BYPASS)] * frames
+
+    def focus_dial(effect) -> None:
+        pi, ci, _ = _widest_dial(effect)
+        effect.page_index = pi
+        effect.control_index = ci
+
+    def dial_sweep(step: int):
+        def steps(effect) -> List[Step]:
+            # Sweep min -> max -> min ... like a held encoder/key at this accel step.
+            _, _, ctrl = _widest_dial(effect)
+            lo, hi = sorted((int(ctrl.vmin), int(ctrl.vmax)))
+            v = int(effect.params.get(ctrl.key, lo))
+            d = 1
+            out: List[Step] = []
+            for _ in range(frames):
+                if not (lo <= v + d * step * int(ctrl.step) <= hi):
+                    d = -d
+                v += d * step * int(ctrl.step)
+                out.append(UIEvent(VALUE_DELTA, delta=d * step))
+            return out
+
+        return steps
+
+    out = [
+        ("full_redraw", no_setup, full_redraw),
+        ("page_flip", no_setup, page_flips),
+        ("bypass_toggle", no_setup, bypass_toggles),
+    ]
+    for step in _accel_steps():
+        out.append((f"dial_sweep_x{step}", focus_dial, dial_sweep(step)))
+    return out
+
+
+# -------------------------
+# Runner
+# -------------------------
+
+def _run_once(backend: str, caches: bool, setup, make_steps, *, wrap=None, trace: bool = False) -> Dict:
+    from msui.demos.chorus_effect import build_demo_effect
+
+    theme = Theme()
+    canvas = _make_canvas(backend, theme)
+    if wrap is not None:
+        canvas = wrap(canvas)
+
+    kw = {}
+    if caches:
+        kw["tile_cache"] = TileCache(max_bytes=2 * 1024 * 1024)
+        enable_dial_sprites(canvas, max_bytes=4 * 1024 * 1024)
+
+    effect = build_demo_effect()
+    setup(effect)
+    steps = make_steps(effect)
+
+    # Untimed first frame (fonts, atlases, first cache fills).
+    render_effect_editor(canvas, effect, theme, DIRTY_ALL, **kw)
+
+    transient = 0
+    if trace:
+        tracemalloc.start()
+        start_mem = tracemalloc.get_traced_memory()[0]
+
+    t0 = time.perf_counter()
+    for ev in steps:
+        if trace:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+
+        if ev is None:
+            mask = DIRTY_ALL
+        else:
+            _, mask = apply_event(effect, ev)
+        if mask != DIRTY_NONE:
+            render_effect_editor(canvas, effect, theme, mask, **kw)
+
+        if trace:
+            transient += tracemalloc.get_traced_memory()[1] - before
+    elapsed = time.perf_counter() - t0
+
+    out = {"frames": len(steps), "elapsed_s": elapsed}
+    if trace:
+        out["alloc_peak_b"] = transient / max(1, len(steps))
+        out["alloc_retained_b"] = tracemalloc.get_traced_memory()[0] - start_mem
+        tracemalloc.stop()
+    if wrap is not None:
+        out["counts"] = dict(canvas.counts)
+    return out
+
+
+def run_benchmarks(backend: str, *, frames: int = 300, repeat: int = 3, caches: bool = True, only=None) -> Dict:
+    results: Dict[str, Dict] = {}
+    for name, setup, make_steps in _scenarios(frames):
+        if only and name not in only:
+            continue
+
+        best = None
+        for _ in range(max(1, repeat)):
+            r = _run_once(backend, caches, setup, make_steps)
+            if best is None or r["elapsed_s"] < best:
+                best = r["elapsed_s"]
+
+        counted = _run_once(backend, caches, setup, make_steps, wrap=_CountingCanvas)
+        traced = _run_once(backend, caches, setup, make_steps, trace=True)
+
+        n = max(1, frames)
+        calls = counted["counts"]
+        results[name] = {
+            "frames": frames,
+            "us_per_frame": best / n * 1e6,
+            "calls_per_frame": sum(calls.values()) / n,
+            "calls": {k: calls[k] / n for k in sorted(calls)},
+            "alloc_kb_per_frame": traced["alloc_peak_b"] / 1024.0,
+            "alloc_retained_kb": traced["alloc_retained_b"] / 1024.0,
+        }
+
+    return {
+        "meta": {
+            "backend": backend,
+            "caches": bool(caches),
+            "frames": frames,
+            "repeat": repeat,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "scenarios": results,
+    }
+
+
+# -------------------------
+# Reporting
+# -------------------------
+
+def format_report(report: Dict) -> str:
+    m = report["meta"]
+    lines = [
+        f"backend={m['backend']} caches={m['caches']} frames={m['frames']} repeat={m['repeat']} python={m['python']}",
+        f"{'scenario':<18} {'us/frame':>10} {'calls/frame':>12} {'alloc_kb/frame':>15} {'retained_kb':>12}",
+    ]
+    for name, r in report["scenarios"].items():
+        lines.append(
+            f"{name:<18} {r['us_per_frame']:10.1f} {r['calls_per_frame']:12.1f} "
+            f"{r['alloc_kb_per_frame']:15.2f} {r['alloc_retained_kb']:12.1f}"
+        )
+    return "\n".join(lines)
+
+
+def compare_reports(base: Dict, cur: Dict, threshold_pct: float) -> Tuple[str, List[str]]:
+    """
+    Table of current vs baseline, plus names of scenarios whose us/frame
+    regressed by more than threshold_pct.
+    """
+    lines = []
+    bm, cm = base.get("meta", {}), cur["meta"]
+    for k in ("backend", "caches", "frames"):
+        if bm.get(k) != cm.get(k):
+            lines.append(f"note: baseline {k}={bm.get(k)!r}, current {k}={cm.get(k)!r}")
+
+    lines.append(f"{'scenario':<18} {'base us':>10} {'now us':>10} {'delta':>8} {'calls':>14}")
+    regressions = []
+    for name, r in cur["scenarios"].items():
+        b = base.get("scenarios", {}).get(name)
+        if b is None:
+            lines.append(f"{name:<18} {'-':>10} {r['us_per_frame']:10.1f} {'new':>8}")
+            continue
+        pct = (r["us_per_frame"] - b["us_per_frame"]) / max(1e-9, b["us_per_frame"]) * 100.0
+        flag = ""
+        if pct > threshold_pct:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        calls = f"{b['calls_per_frame']:.1f}->{r['calls_per_frame']:.1f}"
+        lines.append(
+            f"{name:<18} {b['us_per_frame']:10.1f} {r['us_per_frame']:10.1f} {pct:+7.1f}% {calls:>14}{flag}"
+        )
+    return "\n".join(lines), regressions
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m msui.bench", description="Headless msui render benchmark.")
+    ap.add_argument("--backend", choices=BACKENDS, default="fb")
+    ap.add_argument("--frames", type=int, default=300, help="frames (steps) per scenario")
+    ap.add_argument("--repeat", type=int, default=3, help="timed runs per scenario; best is reported")
+    ap.add_argument("--no-caches", action="store_true", help="disable TileCache and dial sprites")
+    ap.add_argument("--scenario", action="append", help="run only this scenario (repeatable)")
+    ap.add_argument("--save", metavar="PATH", help="write results as a JSON baseline")
+    ap.add_argument("--compare", metavar="PATH", help="compare against a JSON baseline")
+    ap.add_argument("--threshold", type=float, default=10.0, help="regression threshold in %% (default 10)")
+    args = ap.parse_args(argv)
+
+    if not os.getenv("MSUI_LOG_LEVEL"):
+        # Keep init logs (canvas_init, cache inits, ...) out of the report.
+        logging.getLogger("msui").setLevel(logging.WARNING)
+
+    report = run_benchmarks(
+        args.backend,
+        frames=max(1, args.frames),
+        repeat=max(1, args.repeat),
+        caches=not args.no_caches,
+        only=args.scenario,
+    )
+    print(format_report(report))
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"saved baseline: {args.save}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            base = json.load(f)
+        table, regressions = compare_reports(base, report, args.threshold)
+        print()
+        print(table)
+        if regressions:
+            print(f"regressions (> {args.threshold:.1f}%): {', '.join(regressions)}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,6 +20,14 @@ class Control(LogMixin):
         # default: no-op
         return
 
+    def merges_deltas(self) -> bool:
+        """
+        True if adjust(a) then adjust(b) equals adjust(a + b) for deltas of
+        the same sign, so the controller may coalesce them (apply_events()).
+        Holds for clamped and wrapped int params; override if not.
+        """
+        return True
+
     def value_text(self, effect) -> str:
         # default numeric-ish formatting (Dial overrides; others override)
         v = int(effect.params.get(self.key, 0))
@@ -109,6 +117,10 @@ class BoolControl(Control):
     def value_text(self, effect) -> str:
         return self.true_text if bool(effect.params.get(self.key, False)) else self.false_text
 
+    def merges_deltas(self) -> bool:
+        # wrap mode toggles once per adjust(), whatever the delta
+        return self.clamp
+
     def adjust(self, delta: int, effect):
         if delta == 0:
             return
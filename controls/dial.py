@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from msui.controls.base import Control
-from msui.render.draw import draw_dial_visual
+from msui.render.dial_sprites import draw_dial
 
 
 @dataclass
@@ -46,7 +46,7 @@ class DialControl(Control):
         accent = theme.ACC_FOCUS if focused else theme.ACC_IDLE
         ring = theme.FG if focused else theme.DIM
 
-        draw_dial_visual(canvas, visual_rect, v, self.vmin, self.vmax, ring, accent, theme)
+        draw_dial(canvas, visual_rect, v, self.vmin, self.vmax, ring, accent, theme)
 
         # Label (top)
         lx, ly, _, _ = label_rect
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+from contextlib import nullcontext
+from typing import Any, Iterable, Mapping, Sequence
+
 from msui.core.dirty import (
     DIRTY_NONE,
     DIRTY_HEADER,
@@ -10,6 +13,7 @@ from msui.core.dirty import (
     DIRTY_TILE2,
 )
 from msui.core.events import (
+    EVENT_CODES,
     NAV_LEFT,
     NAV_RIGHT,
     PAGE_PREV,
@@ -19,6 +23,7 @@ from msui.core.events import (
     QUIT,
 )
 from msui.core.model import Effect
+from msui.core.params import ParamStore
 from msui.log import get_logger
 
 log = get_logger(__name__)
@@ -39,6 +44,76 @@ def _tile_bit(i: int) -> int:
     return DIRTY_TILES
 
 
+def _adjust(effect: Effect, ctrl, delta: int) -> int:
+    params = effect.params
+    if isinstance(params, ParamStore):
+        # the epoch only moves on a real value change
+        epoch = params.epoch
+        ctrl.adjust(delta, effect)  # control logs the change if any
+        changed = params.epoch != epoch
+    else:
+        before = params.get(ctrl.key, None)
+        ctrl.adjust(delta, effect)
+        changed = params.get(ctrl.key, None) != before
+
+    if changed:
+        return _tile_bit(effect.control_index)
+    return DIRTY_NONE
+
+
+def _on_quit(effect: Effect, event) -> tuple[bool, int]:
+    return False, DIRTY_NONE
+
+
+def _on_toggle_bypass(effect: Effect, event) -> tuple[bool, int]:
+    effect.enabled = not effect.enabled
+    return True, DIRTY_HEADER
+
+
+def _on_nav_left(effect: Effect, event) -> tuple[bool, int]:
+    old = effect.control_index
+    new = effect.control_index = (old - 1) % effect.n_controls()
+    if new == old:
+        return True, DIRTY_NONE
+    return True, (_tile_bit(old) | _tile_bit(new))
+
+
+def _on_nav_right(effect: Effect, event) -> tuple[bool, int]:
+    old = effect.control_index
+    new = effect.control_index = (old + 1) % effect.n_controls()
+    if new == old:
+        return True, DIRTY_NONE
+    return True, (_tile_bit(old) | _tile_bit(new))
+
+
+def _on_page_prev(effect: Effect, event) -> tuple[bool, int]:
+    effect.page_index = (effect.page_index - 1) % len(effect.pages)
+    effect.control_index %= effect.n_controls()
+    return True, (DIRTY_PAGE | DIRTY_TILES)
+
+
+def _on_page_next(effect: Effect, event) -> tuple[bool, int]:
+    effect.page_index = (effect.page_index + 1) % len(effect.pages)
+    effect.control_index %= effect.n_controls()
+    return True, (DIRTY_PAGE | DIRTY_TILES)
+
+
+def _on_value_delta(effect: Effect, event) -> tuple[bool, int]:
+    return True, _adjust(effect, effect.current_control(), event.delta)
+
+
+# Dispatch table: event code (see core/events.py) -> handler.
+_HANDLERS = {
+    NAV_LEFT: _on_nav_left,
+    NAV_RIGHT: _on_nav_right,
+    PAGE_PREV: _on_page_prev,
+    PAGE_NEXT: _on_page_next,
+    VALUE_DELTA: _on_value_delta,
+    TOGGLE_BYPASS: _on_toggle_bypass,
+    QUIT: _on_quit,
+}
+
+
 def apply_event(effect: Effect, event) -> tuple[bool, int]:
     """
     Core state update: apply one UIEvent to the Effect.
@@ -48,53 +123,136 @@ def apply_event(effect: Effect, event) -> tuple[bool, int]:
       - input backend logs emitted events
       - controls log param changes on adjust()
     """
-    t = event.type
-
-    if t == QUIT:
-        return False, DIRTY_NONE
-
-    if t == TOGGLE_BYPASS:
-        effect.enabled = not effect.enabled
-        return True, DIRTY_HEADER
-
-    if t == NAV_LEFT:
-        n = effect.n_controls()
-        old = effect.control_index
-        effect.control_index = (effect.control_index - 1) % n
-        new = effect.control_index
-        if new == old:
-            return True, DIRTY_NONE
-        return True, (_tile_bit(old) | _tile_bit(new))
-
-    if t == NAV_RIGHT:
-        n = effect.n_controls()
-        old = effect.control_index
-        effect.control_index = (effect.control_index + 1) % n
-        new = effect.control_index
-        if new == old:
-            return True, DIRTY_NONE
-        return True, (_tile_bit(old) | _tile_bit(new))
-
-    if t == PAGE_PREV:
-        effect.page_index = (effect.page_index - 1) % len(effect.pages)
-        effect.control_index %= effect.n_controls()
-        return True, (DIRTY_PAGE | DIRTY_TILES)
-
-    if t == PAGE_NEXT:
-        effect.page_index = (effect.page_index + 1) % len(effect.pages)
-        effect.control_index %= effect.n_controls()
-        return True, (DIRTY_PAGE | DIRTY_TILES)
-
-    if t == VALUE_DELTA:
-        ctrl = effect.current_control()
-        before = effect.params.get(ctrl.key, None)
-        ctrl.adjust(event.delta, effect)  # control logs the change if any
-        after = effect.params.get(ctrl.key, None)
-
-        if before != after:
-            return True, _tile_bit(effect.control_index)
-        return True, DIRTY_NONE
+    handler = _HANDLERS.get(event.type)
+    if handler is None and event.type.__class__ is str:
+        # duck-typed events with a string type (UIEvent converts on construction)
+        handler = _HANDLERS.get(EVENT_CODES.get(event.type))
+    if handler is not None:
+        return handler(effect, event)
 
     # Unknown event type is a real problem; warn once per occurrence.
-    log.warn("unknown_ui_event", type=t)
+    log.warn("unknown_ui_event", type=event.type)
     return True, DIRTY_NONE
+
+
+_FOCUS_EVENTS = frozenset((NAV_LEFT, NAV_RIGHT, PAGE_PREV, PAGE_NEXT))
+
+
+def _move_focus(effect: Effect, events: Sequence, i: int, j: int) -> int:
+    """
+    Apply a run of NAV_*/PAGE_* events as one focus move: only the start and
+    end positions are redrawn, so round-trips cost nothing.
+    """
+    old_page, old_ctrl = effect.page_index, effect.control_index
+    n_pages = len(effect.pages)
+    for k in range(i, j):
+        t = events[k].type
+        if t == NAV_LEFT or t == NAV_RIGHT:
+            step = -1 if t == NAV_LEFT else 1
+            effect.control_index = (effect.control_index + step) % effect.n_controls()
+        else:
+            step = -1 if t == PAGE_PREV else 1
+            effect.page_index = (effect.page_index + step) % n_pages
+            # same clamp as apply_event, so intermediate pages still count
+            effect.control_index %= effect.n_controls()
+
+    if effect.page_index != old_page:
+        return DIRTY_PAGE | DIRTY_TILES
+    if effect.control_index != old_ctrl:
+        return _tile_bit(old_ctrl) | _tile_bit(effect.control_index)
+    return DIRTY_NONE
+
+
+def apply_events(effect: Effect, events: Sequence) -> tuple[bool, int]:
+    """
+    Apply one frame's UIEvents; same end state as apply_event() per event.
+    Returns (running_ok, combined dirty_mask); stops at QUIT.
+
+    Coalesces, so event floods (encoders, MIDI) cost one adjust per run:
+      - consecutive same-sign VALUE_DELTAs on a control that merges_deltas()
+        become one adjust() with the summed delta
+      - consecutive NAV_*/PAGE_* become one focus move (round-trips vanish)
+      - consecutive TOGGLE_BYPASS reduce to their parity
+    """
+    debug = log.is_debug_enabled()
+    dirty = DIRTY_NONE
+    i, n = 0, len(events)
+    while i < n:
+        ev = events[i]
+        t = ev.type
+
+        if t == VALUE_DELTA:
+            ctrl = effect.current_control()
+            delta = int(ev.delta)
+            i += 1
+            if ctrl.merges_deltas():
+                while i < n and events[i].type == VALUE_DELTA and (events[i].delta >= 0) == (delta >= 0):
+                    delta += int(events[i].delta)
+                    i += 1
+            # controls only log at debug level; skip the context otherwise
+            with log.context(ev="VALUE_DELTA", delta=delta) if debug else nullcontext():
+                dirty |= _adjust(effect, ctrl, delta)
+            continue
+
+        if t in _FOCUS_EVENTS:
+            j = i + 1
+            while j < n and events[j].type in _FOCUS_EVENTS:
+                j += 1
+            dirty |= _move_focus(effect, events, i, j)
+            i = j
+            continue
+
+        if t == TOGGLE_BYPASS:
+            j = i + 1
+            while j < n and events[j].type == TOGGLE_BYPASS:
+                j += 1
+            if (j - i) & 1:
+                effect.enabled = not effect.enabled
+                dirty |= DIRTY_HEADER
+            i = j
+            continue
+
+        ok, d = apply_event(effect, ev)
+        dirty |= d
+        if not ok:
+            return False, dirty
+        i += 1
+
+    return True, dirty
+
+
+def dirty_for_params(effect: Effect, keys: Iterable[str]) -> int:
+    """
+    Dirty bits for params changed outside the UI: the tiles showing `keys` on
+    the visible page (DIRTY_NONE if none of them is on screen).
+    """
+    index = effect.param_tiles
+    page = effect.page_index
+    dirty = DIRTY_NONE
+    for key in keys:
+        for pi, ti in index.get(key, ()):
+            if pi == page:
+                dirty |= _tile_bit(ti)
+    return dirty
+
+
+def dirty_since(effect: Effect, epoch: int) -> int:
+    """
+    dirty_for_params() for every param changed after `epoch` (ParamStore.epoch).
+    """
+    return dirty_for_params(effect, effect.params.changed_since(epoch))
+
+
+def apply_param_updates(effect: Effect, updates: Mapping[str, Any]) -> int:
+    """
+    Set params from outside the UI (MIDI CC, automation, preset morph) and
+    return the dirty mask for the ones that actually changed.
+
+    Values are stored as given; clamping to a control's range is the
+    caller's business. Unknown keys are added (they have no tile).
+    """
+    params = effect.params
+    epoch = params.epoch
+    for key, value in updates.items():
+        params[key] = value
+    return dirty_since(effect, epoch)
@@ -1,15 +1,111 @@
-from dataclasses import dataclass
+"""
+UI events.
 
-NAV_LEFT = "NAV_LEFT"
-NAV_RIGHT = "NAV_RIGHT"
-PAGE_PREV = "PAGE_PREV"
-PAGE_NEXT = "PAGE_NEXT"
-VALUE_DELTA = "VALUE_DELTA"
-TOGGLE_BYPASS = "TOGGLE_BYPASS"
-QUIT = "QUIT"
+Event types are small int codes; the controller dispatches on them through a
+table. Names still work at the boundary: UIEvent("NAV_LEFT") is the same
+event as UIEvent(NAV_LEFT), and ev.name gives the string back for logs.
+
+Events are immutable, so input backends hand out shared instances from
+ui_event() instead of allocating one per key repeat or encoder detent.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Tuple, Union
+
+NAV_LEFT = 1
+NAV_RIGHT = 2
+PAGE_PREV = 3
+PAGE_NEXT = 4
+VALUE_DELTA = 5
+TOGGLE_BYPASS = 6
+QUIT = 7
+
+# code -> name (index 0 unused)
+EVENT_NAMES: Tuple[str, ...] = (
+    "NONE",
+    "NAV_LEFT",
+    "NAV_RIGHT",
+    "PAGE_PREV",
+    "PAGE_NEXT",
+    "VALUE_DELTA",
+    "TOGGLE_BYPASS",
+    "QUIT",
+)
+EVENT_CODES: Dict[str, int] = {name: code for code, name in enumerate(EVENT_NAMES) if code}
+
+
+def event_code(t: Union[int, str]) -> int:
+    """
+    Int code for an event type given as code or name.
+    """
+    if t.__class__ is int:
+        if 0 < t < len(EVENT_NAMES):
+            return t
+        raise ValueError(f"Unknown UI event code {t!r}")
+    try:
+        return EVENT_CODES[t]
+    except KeyError:
+        raise ValueError(f"Unknown UI event type {t!r}") from None
+
+
+def event_name(code: int) -> str:
+    return EVENT_NAMES[code] if 0 < code < len(EVENT_NAMES) else f"UNKNOWN_{code}"
+
+
+_set = object.__setattr__
 
 
-@dataclass(frozen=True)
 class UIEvent:
-    type: str
-    delta: int = 0
+    """
+    One UI event: type code and (VALUE_DELTA only) a signed delta.
+    """
+
+    __slots__ = ("type", "delta")
+
+    def __init__(self, type: Union[int, str], delta: int = 0):
+        _set(self, "type", event_code(type))
+        _set(self, "delta", delta)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("UIEvent is immutable")
+
+    @property
+    def name(self) -> str:
+        return event_name(self.type)
+
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not UIEvent:
+            return NotImplemented
+        return self.type == other.type and self.delta == other.delta
+
+    def __hash__(self) -> int:
+        return hash((self.type, self.delta))
+
+    def __repr__(self) -> str:
+        return f"UIEvent(type={self.name}, delta={self.delta})"
+
+    def __reduce__(self):
+        return (UIEvent, (self.type, self.delta))
+
+
+_SHARED_DELTA = 32  # VALUE_DELTA instances kept for |delta| <= this
+_shared: Dict[Tuple[int, int], UIEvent] = {
+    (code, 0): UIEvent(code) for code in range(1, len(EVENT_NAMES))
+}
+_shared.update(
+    ((VALUE_DELTA, d), UIEvent(VALUE_DELTA, d)) for d in range(-_SHARED_DELTA, _SHARED_DELTA + 1)
+)
+
+
+def ui_event(t: Union[int, str], delta: int = 0) -> UIEvent:
+    """
+    Shared UIEvent for (t, delta); allocates only for rare large deltas.
+    """
+    ev = _shared.get((t, delta))
+    if ev is None and t.__class__ is not int:
+        t = event_code(t)
+        ev = _shared.get((t, delta))
+    if ev is None:
+        ev = UIEvent(t, delta)
+    return ev
@@ -4,6 +4,7 @@ from dataclasses import dataclass, field
 from typing import Any, Dict, List, MutableMapping, Protocol, Tuple, runtime_checkable
 
 from msui.core.dirty import DIRTY_ALL, DIRTY_NONE
+from msui.core.params import ParamStore
 from msui.log import LogMixin
 
 
@@ -55,11 +56,18 @@ class Effect(LogMixin):
     # Dirty mask for incremental rendering
     dirty: int = DIRTY_ALL
 
+    # param key -> ((page_index, tile_index), ...) showing it; built in __post_init__
+    param_tiles: Dict[str, Tuple[Tuple[int, int], ...]] = field(init=False, repr=False, default_factory=dict)
+
     def __post_init__(self) -> None:
         if not self.pages:
             self.log.error("effect_no_pages", name=self.name)
             raise ValueError("Effect.pages must be non-empty")
 
+        # Plain dicts are accepted; the store adds change versioning.
+        if not isinstance(self.params, ParamStore):
+            self.params = ParamStore(self.params)
+
         # Validate each page (Page.__post_init__ already checks control count)
         for p in self.pages:
             n = len(p.controls)
@@ -67,6 +75,14 @@ class Effect(LogMixin):
                 self.log.error("invalid_page", effect=self.name, page=p.title, n_controls=n)
                 raise ValueError(f"Invalid page '{p.title}': expected 1..3 controls, got {n}")
 
+        # Reverse index for updates from outside the UI (MIDI, automation):
+        # a changed key redraws only its tile(s), and only when visible.
+        index: Dict[str, List[Tuple[int, int]]] = {}
+        for pi, p in enumerate(self.pages):
+            for ti, ctrl in enumerate(p.controls):
+                index.setdefault(ctrl.key, []).append((pi, ti))
+        self.param_tiles = {k: tuple(v) for k, v in index.items()}
+
         # Normalize indices defensively
         old_pi = int(self.page_index)
         self.page_index = old_pi % len(self.pages)
@@ -0,0 +1,109 @@
+# msui/core/param_queue.py
+"""
+Parameter updates from non-UI threads (audio engine, MIDI reader).
+
+Effect and Effect.params belong to the UI loop. Other threads post (key,
+value) pairs into a ParamQueue instead, and the UI loop drains it once per
+frame:
+
+  q = ParamQueue(256)
+  # MIDI thread:  q.post("tone", cc_value)
+  # UI loop:      dirty |= q.drain_into(effect)
+
+It is a bounded single-producer / single-consumer ring: the producer only
+writes its tail index and the slots ahead of it, the consumer only its head
+index, so neither side takes a lock. The ring relies on the GIL making each
+list store and attribute store atomic and ordered. Use one queue per
+producer thread.
+
+When the ring is full, post() drops the update and returns False; the next
+drain logs how many were dropped. A drain keeps only the last value per key,
+so a 1 kHz modulation costs one param write per frame.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from msui.core.controller import apply_param_updates
+from msui.core.dirty import DIRTY_NONE
+from msui.core.model import Effect
+from msui.log import LogMixin
+
+
+class ParamQueue(LogMixin):
+    """
+    Bounded SPSC ring of (key, value) updates, drained into an Effect.
+    """
+
+    def __init__(self, capacity: int = 256):
+        # power of two: indices wrap with a mask
+        cap = 1
+        while cap < max(2, int(capacity)):
+            cap <<= 1
+        self.capacity = cap
+        self._mask = cap - 1
+        self._keys: List[Optional[str]] = [None] * cap
+        self._values: List[Any] = [None] * cap
+        self._head = 0  # next slot to read (consumer-owned)
+        self._tail = 0  # next slot to write (producer-owned)
+
+        # producer-side counter; the consumer only reads it
+        self.dropped = 0
+        self._dropped_seen = 0
+        self.drained = 0
+
+        self.log.info("param_queue_init", capacity=cap)
+
+    def __len__(self) -> int:
+        return self._tail - self._head
+
+    # ---- producer ----
+    def post(self, key: str, value: Any) -> bool:
+        """
+        Queue an update (producer thread). False if the ring is full.
+        """
+        tail = self._tail
+        if tail - self._head >= self.capacity:
+            self.dropped += 1
+            return False
+        i = tail & self._mask
+        self._keys[i] = key
+        self._values[i] = value
+        self._tail = tail + 1  # publish after the slot is written
+        return True
+
+    # ---- consumer ----
+    def drain(self) -> Dict[str, Any]:
+        """
+        Take everything queued so far (UI thread): last value per key, in
+        order of each key's first update.
+        """
+        head = self._head
+        tail = self._tail
+        if head == tail:
+            return {}
+        out: Dict[str, Any] = {}
+        keys, values, mask = self._keys, self._values, self._mask
+        for n in range(head, tail):
+            i = n & mask
+            out[keys[i]] = values[i]
+            keys[i] = values[i] = None  # don't keep values alive
+        self._head = tail  # hand the slots back to the producer
+        self.drained += tail - head
+
+        dropped = self.dropped
+        if dropped != self._dropped_seen:
+            self.log.warn("param_queue_overflow", dropped=dropped - self._dropped_seen, capacity=self.capacity)
+            self._dropped_seen = dropped
+        return out
+
+    def drain_into(self, effect: Effect) -> int:
+        """
+        Apply queued updates to `effect`; returns the dirty mask (changed
+        params on the visible page, see apply_param_updates()).
+        """
+        updates = self.drain()
+        if not updates:
+            return DIRTY_NONE
+        return apply_param_updates(effect, updates)
@@ -0,0 +1,195 @@
+# msui/core/params.py
+"""
+Array-backed effect parameters with change versioning.
+
+ParamStore is the MutableMapping behind Effect.params. Each key owns a slot:
+int and bool values live in one typed array (anything else falls back to a
+plain list), and every slot records the epoch of its last change. The store
+epoch goes up by one per actual value change, so
+
+  e = store.epoch
+  ...                          # controls adjust, presets load, ...
+  store.changed_since(e)       # -> keys changed meanwhile, oldest first
+
+answers "what changed" in O(changes): slots are kept in a list ordered by
+last change, walked backwards from the newest until an older version.
+Writing the value a slot already has is not a change.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Any, Dict, Iterator, List, Mapping, MutableMapping, Optional
+
+KIND_INT = 0
+KIND_BOOL = 1
+KIND_OBJECT = 2
+KIND_FREE = 3  # deleted slot, reusable
+
+_INT_MIN = -(1 << 63)
+_INT_MAX = (1 << 63) - 1
+
+
+class ParamStore(MutableMapping[str, Any]):
+    """
+    Parameter mapping with per-slot versions and a global change epoch.
+    """
+
+    def __init__(self, values: Optional[Mapping[str, Any]] = None):
+        self._slots: Dict[str, int] = {}
+        self._keys: List[Optional[str]] = []
+        self._kinds = array("b")
+        self._ints = array("q")
+        self._objs: List[Any] = []
+        self._versions = array("Q")
+        # change-ordered doubly linked list over slots (-1 = none)
+        self._prev = array("i")
+        self._next = array("i")
+        self._newest = -1
+        self._oldest = -1
+        self._free: List[int] = []
+        self.epoch = 0
+        if values:
+            for k, v in values.items():
+                self[k] = v
+
+    # ---- slot storage ----
+    def _load(self, slot: int) -> Any:
+        kind = self._kinds[slot]
+        if kind == KIND_INT:
+            return self._ints[slot]
+        if kind == KIND_BOOL:
+            return self._ints[slot] != 0
+        return self._objs[slot]
+
+    def _store(self, slot: int, value: Any) -> None:
+        # bool before int: bool is an int subclass
+        cls = value.__class__
+        if cls is bool:
+            self._kinds[slot] = KIND_BOOL
+            self._ints[slot] = 1 if value else 0
+            self._objs[slot] = None
+        elif cls is int and _INT_MIN <= value <= _INT_MAX:
+            self._kinds[slot] = KIND_INT
+            self._ints[slot] = value
+            self._objs[slot] = None
+        else:
+            self._kinds[slot] = KIND_OBJECT
+            self._ints[slot] = 0
+            self._objs[slot] = value
+
+    def _unlink(self, slot: int) -> None:
+        p, n = self._prev[slot], self._next[slot]
+        if p >= 0:
+            self._next[p] = n
+        else:
+            self._oldest = n
+        if n >= 0:
+            self._prev[n] = p
+        else:
+            self._newest = p
+        self._prev[slot] = self._next[slot] = -1
+
+    def _touch(self, slot: int) -> None:
+        # New epoch for `slot`; move it to the newest end of the change list.
+        self.epoch += 1
+        self._versions[slot] = self.epoch
+        if self._newest == slot:
+            return
+        if self._prev[slot] >= 0 or self._oldest == slot:
+            self._unlink(slot)
+        self._prev[slot] = self._newest
+        self._next[slot] = -1
+        if self._newest >= 0:
+            self._next[self._newest] = slot
+        else:
+            self._oldest = slot
+        self._newest = slot
+
+    def _new_slot(self, key: str) -> int:
+        if self._free:
+            slot = self._free.pop()
+            self._keys[slot] = key
+        else:
+            slot = len(self._keys)
+            self._keys.append(key)
+            self._kinds.append(KIND_FREE)
+            self._ints.append(0)
+            self._objs.append(None)
+            self._versions.append(0)
+            self._prev.append(-1)
+            self._next.append(-1)
+        self._slots[key] = slot
+        return slot
+
+    # ---- MutableMapping ----
+    def __getitem__(self, key: str) -> Any:
+        return self._load(self._slots[key])
+
+    def get(self, key: str, default: Any = None) -> Any:
+        slot = self._slots.get(key)
+        if slot is None:
+            return default
+        return self._load(slot)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._new_slot(key)
+        elif self._load(slot) == value and self._load(slot).__class__ is value.__class__:
+            return
+        self._store(slot, value)
+        self._touch(slot)
+
+    def __delitem__(self, key: str) -> None:
+        slot = self._slots.pop(key)
+        self._unlink(slot)
+        self._keys[slot] = None
+        self._kinds[slot] = KIND_FREE
+        self._objs[slot] = None
+        self._versions[slot] = 0
+        self._free.append(slot)
+        self.epoch += 1  # deletions move the epoch but aren't in changed_since()
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._slots
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._slots)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __repr__(self) -> str:
+        return f"ParamStore({dict(self.items())!r}, epoch={self.epoch})"
+
+    # ---- versioning ----
+    def version(self, key: str) -> int:
+        """
+        Epoch of the last change to `key`.
+        """
+        return self._versions[self._slots[key]]
+
+    def changed_since(self, epoch: int) -> List[str]:
+        """
+        Keys whose value changed after `epoch`, oldest change first.
+        """
+        out: List[str] = []
+        slot = self._newest
+        versions = self._versions
+        while slot >= 0 and versions[slot] > epoch:
+            out.append(self._keys[slot])
+            slot = self._prev[slot]
+        out.reverse()
+        return out
+
+    # ---- slots (for consumers indexing the arrays directly) ----
+    def slot(self, key: str) -> int:
+        return self._slots[key]
+
+    @property
+    def int_values(self) -> array:
+        """
+        array('q') of int/bool slot values (0 for other kinds), by slot().
+        """
+        return self._ints
@@ -2,10 +2,19 @@
 from __future__ import annotations
 
 import time
+from typing import Dict, Protocol
 
 from msui.log import LogMixin
 
 
+class CacheStats(Protocol):
+    """
+    Anything with LRUCache-style counters (LRUCache, TileCache, DialSpriteSheet, ...).
+    """
+
+    def stats(self) -> Dict[str, int]: ...
+
+
 class Profiler(LogMixin):
     """
     Small reusable per-second profiler for demos.
@@ -16,19 +25,54 @@ class Profiler(LogMixin):
       - events/s
       - avg render ms (time spent rendering into canvas)
       - avg present ms (time spent scaling/blitting/flipping)
+      - idle % (time the loop spent blocked in InputSource.wait())
+      - per watched cache: hits/misses/evictions in the window, hit rate,
+        entries and bytes held (see watch_cache())
     """
 
     def __init__(self, print_interval_s: float = 1.0):
         self.print_interval_s = float(print_interval_s)
         self._last_print = time.perf_counter()
+        self._caches: Dict[str, CacheStats] = {}
+        self._cache_prev: Dict[str, Dict[str, int]] = {}
         self._reset_window()
 
+    def watch_cache(self, name: str, cache: CacheStats) -> None:
+        """
+        Include `cache` in reports (e.g. canvas.caches() entries, TileCache).
+        """
+        self._caches[str(name)] = cache
+        self._cache_prev[str(name)] = cache.stats()
+
+    def cache_window(self) -> Dict[str, Dict[str, int]]:
+        """
+        Per watched cache: counters since the last call (hits, misses,
+        evictions), hit_pct, and current entries / nbytes.
+        """
+        out: Dict[str, Dict[str, int]] = {}
+        for name, cache in self._caches.items():
+            cur = cache.stats()
+            prev = self._cache_prev.get(name, cur)
+            hits = cur["hits"] - prev["hits"]
+            misses = cur["misses"] - prev["misses"]
+            out[name] = {
+                "hits": hits,
+                "misses": misses,
+                "evictions": cur["evictions"] - prev["evictions"],
+                "hit_pct": int(round(100.0 * hits / (hits + misses))) if hits + misses else 100,
+                "entries": cur["entries"],
+                "nbytes": cur["nbytes"],
+            }
+            self._cache_prev[name] = cur
+        return out
+
     def _reset_window(self) -> None:
         self.loops = 0
         self.renders = 0
         self.events = 0
         self.accum_render_s = 0.0
         self.accum_present_s = 0.0
+        self.accum_idle_s = 0.0
 
     def tick_loop(self) -> None:
         self.loops += 1
@@ -41,6 +85,13 @@ class Profiler(LogMixin):
         self.accum_render_s += float(render_s)
         self.accum_present_s += float(present_s)
 
+    def add_idle(self, idle_s: float) -> None:
+        self.accum_idle_s += float(idle_s)
+
+    def _idle_pct(self, now: float) -> int:
+        window = max(1e-9, now - self._last_print)
+        return int(round(100.0 * min(1.0, self.accum_idle_s / window)))
+
     def maybe_report(self) -> str | None:
         now = time.perf_counter()
         if (now - self._last_print) < self.print_interval_s:
@@ -51,8 +102,14 @@ class Profiler(LogMixin):
 
         line = (
             f"loops={self.loops:4d}/s  renders={self.renders:4d}/s  events={self.events:4d}/s  "
-            f"avg_render_ms={avg_render_ms:6.2f}  avg_present_ms={avg_present_ms:6.2f}"
+            f"avg_render_ms={avg_render_ms:6.2f}  avg_present_ms={avg_present_ms:6.2f}  "
+            f"idle={self._idle_pct(now):3d}%"
         )
+        for name, c in self.cache_window().items():
+            line += (
+                f"  {name}: hit={c['hit_pct']:3d}% miss={c['misses']} ev={c['evictions']} "
+                f"n={c['entries']} kb={c['nbytes'] // 1024}"
+            )
 
         self._last_print = now
         self._reset_window()
@@ -77,7 +134,10 @@ class Profiler(LogMixin):
             events_per_s=int(self.events),
             avg_render_ms=float(avg_render_ms),
             avg_present_ms=float(avg_present_ms),
+            idle_pct=self._idle_pct(now),
         )
+        for name, c in self.cache_window().items():
+            self.log.profile("cache", cache=name, **c)
 
         self._last_print = now
         self._reset_window()
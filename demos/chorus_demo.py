@@ -3,105 +3,28 @@ from __future__ import annotations
 import time
 import pygame
 
-from msui.core.model import Effect, Page
-from msui.controls.dial import DialControl
-from msui.controls.button import ButtonControl
-from msui.controls.enumsel import EnumControl
-from msui.controls.switch import SwitchControl
-from msui.controls.text import TextControl
+from msui.demos.chorus_effect import build_demo_effect
 
 from msui.render.theme import Theme
-from msui.render import icons as wave_icons
 from msui.render.screen_effect import render_effect_editor
+from msui.render.cache import TileCache
+from msui.render.dial_sprites import enable_dial_sprites
+from msui.render.warmup import warm_text_caches
+from msui.render.layout import dirty_rects
 
 from msui.backends.canvas_pygame import PygameCanvas
 from msui.backends.input_pygame import PygameInput
+from msui.backends.present_pygame import PygamePresenter
 
 from msui.core.dirty import DIRTY_NONE, DIRTY_ALL
 from msui.core.profiler import Profiler
-from msui.core.controller import apply_event
+from msui.core.controller import apply_events
 
 from msui.log import get_logger
 
 log = get_logger(__name__)
 
 
-def build_demo_effect() -> Effect:
-    params = {
-        "rate": 0,
-        "mode": 0,
-        "sync": False,
-        "wave": 0,
-        "filter": 0,
-        "tone": 55,
-        "pre": 10,
-        "post": 70,
-        "dry": 90,
-        "detune": 0,
-        "bpm": 120,
-        "div": 2,
-    }
-
-    pages = [
-        Page(
-            "MAIN",
-            (
-                DialControl(key="rate", label="RATE", vmin=-12, vmax=12, step=1),
-                SwitchControl(key="mode", label="MODE", options=("A", "B", "C")),
-                ButtonControl(key="sync", label="SYNC", true_text="ON", false_text="OFF"),
-            ),
-        ),
-        Page(
-            "MOD",
-            (
-                EnumControl(
-                    key="wave",
-                    label="WAVE",
-                    options=("SINE", "TRI", "SAW", "SQR"),
-                    icons=(
-                        wave_icons.wave_sine,
-                        wave_icons.wave_triangle,
-                        wave_icons.wave_saw,
-                        wave_icons.wave_square,
-                    ),
-                ),
-                EnumControl(
-                    key="filter",
-                    label="FILTER",
-                    options=("LP6", "HP6", "BP6", "NOTCH", "LADDER", "PULTEC"),
-                    icons=(
-                        wave_icons.filter_lp6,
-                        wave_icons.filter_hp6,
-                        wave_icons.filter_bp6,
-                        wave_icons.filter_notch6,
-                        wave_icons.filter_ladder,
-                        wave_icons.filter_pultec,
-                    ),
-                ),
-                DialControl(key="tone", label="TONE", vmin=0, vmax=100, step=1),
-            ),
-        ),
-        Page(
-            "LEVEL",
-            (
-                DialControl(key="pre", label="PRE", vmin=0, vmax=100, step=1),
-                DialControl(key="post", label="POST", vmin=0, vmax=100, step=1),
-                DialControl(key="dry", label="DRY", vmin=0, vmax=100, step=1),
-            ),
-        ),
-        Page(
-            "TUNE",
-            (
-                DialControl(key="detune", label="DETUNE", vmin=-12, vmax=12, step=1),
-                DialControl(key="bpm", label="BPM", vmin=30, vmax=300, step=1),
-                TextControl(key="div", label="DIV", options=("1/1", "1/2", "1/4", "1/8", "1/16")),
-            ),
-        ),
-    ]
-
-    return Effect(name="CHORUS", pages=pages, params=params)
-
-
 def main() -> None:
     pygame.init()
 
@@ -127,15 +50,31 @@ def main() -> None:
         # No redundant fields; they are already ambient via context().
         log.info("demo_start")
 
-        canvas = PygameCanvas(theme.W, theme.H, fonts)
+        canvas = PygameCanvas(theme.W, theme.H, fonts, glyph_atlas=True)
+        # All UI text is drawn in FG or DIM; render those atlases before the first frame.
+        canvas.build_glyph_atlases((theme.FG, theme.DIM))
+        # Window updates stay on this thread (SDL requirement), so no PresentThread here.
+        presenter = PygamePresenter(win, theme.W, theme.H, theme.SCALE)
         input_src = PygameInput(theme)
         clock = pygame.time.Clock()
 
         effect = build_demo_effect()
 
+        # Repeat tile states are one blit; new dial values blit a captured dial frame.
+        # (DisplayListCache would record dials as vectors and bypass the sprites.)
+        tile_cache = TileCache(max_bytes=2 * 1024 * 1024)
+        sprites = enable_dial_sprites(canvas, max_bytes=4 * 1024 * 1024)
+        # Strings the atlases don't cover (non-ASCII labels) are pre-rendered off-thread.
+        warm_text_caches(canvas, effect, theme, background=True)
+
         # Effect name is stable, so bind once at the boundary.
         with log.context(effect=getattr(effect, "name", "?")):
             prof = Profiler(print_interval_s=1.0)
+            for name, cache in canvas.caches().items():
+                prof.watch_cache(name, cache)
+            prof.watch_cache("tiles", tile_cache)
+            if sprites is not None:
+                prof.watch_cache("dial_sprites", sprites)
 
             dirty = DIRTY_ALL
             running = True
@@ -148,30 +87,23 @@ def main() -> None:
                     events = input_src.get_events(dt_ms)
                     prof.add_events(len(events))
 
-                    for ev in events:
-                        # Optional per-event ambient context to connect controller/control logs.
-                        ev_ctx = {"ev": ev.type}
-                        if getattr(ev, "delta", 0):
-                            ev_ctx["delta"] = int(ev.delta)
-
-                        with log.context(**ev_ctx):
-                            ok, d = apply_event(effect, ev)
-
-                        if not ok:
-                            running = False
-                            break
-                        dirty |= d
+                    # One call per frame; runs of deltas/nav are coalesced.
+                    ok, d = apply_events(effect, events)
+                    dirty |= d
+                    if not ok:
+                        running = False
+                        break
 
                     if dirty != DIRTY_NONE:
                         t0 = time.perf_counter()
-                        render_effect_editor(canvas, effect, theme, dirty_mask=dirty)
+                        render_effect_editor(
+                            canvas, effect, theme, dirty_mask=dirty,
+                            tile_cache=tile_cache,
+                        )
                         t1 = time.perf_counter()
 
-                        scaled = pygame.transform.scale(
-                            canvas.surface, (theme.W * theme.SCALE, theme.H * theme.SCALE)
-                        )
-                        win.blit(scaled, (0, 0))
-                        pygame.display.flip()
+                        # Present only what this dirty mask redrew.
+                        presenter.present(canvas.surface, dirty_rects(theme, dirty))
                         t2 = time.perf_counter()
 
                         prof.add_render(t1 - t0, t2 - t1)
@@ -182,6 +114,13 @@ def main() -> None:
                     # Structured perf log (do NOT also call maybe_report()/print)
                     prof.maybe_profile()
 
+                    # Nothing to draw: sleep until a key event or the next key
+                    # repeat instead of spinning at FPS.
+                    if theme.INPUT_IDLE_WAIT and not events and dirty == DIRTY_NONE:
+                        t0 = time.perf_counter()
+                        input_src.wait(theme.INPUT_IDLE_WAKE_S)
+                        prof.add_idle(time.perf_counter() - t0)
+
             finally:
                 pygame.quit()
                 log.info("demo_exit")
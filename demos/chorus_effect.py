@@ -0,0 +1,93 @@
+# msui/demos/chorus_effect.py
+"""
+The demo chorus effect (pages, controls, initial params).
+
+Kept free of pygame so headless runs and the benchmark can build it too.
+"""
+
+from __future__ import annotations
+
+from msui.core.model import Effect, Page
+from msui.controls.dial import DialControl
+from msui.controls.button import ButtonControl
+from msui.controls.enumsel import EnumControl
+from msui.controls.switch import SwitchControl
+from msui.controls.text import TextControl
+
+from msui.render import icons as wave_icons
+
+
+def build_demo_effect() -> Effect:
+    params = {
+        "rate": 0,
+        "mode": 0,
+        "sync": False,
+        "wave": 0,
+        "filter": 0,
+        "tone": 55,
+        "pre": 10,
+        "post": 70,
+        "dry": 90,
+        "detune": 0,
+        "bpm": 120,
+        "div": 2,
+    }
+
+    pages = [
+        Page(
+            "MAIN",
+            (
+                DialControl(key="rate", label="RATE", vmin=-12, vmax=12, step=1),
+                SwitchControl(key="mode", label="MODE", options=("A", "B", "C")),
+                ButtonControl(key="sync", label="SYNC", true_text="ON", false_text="OFF"),
+            ),
+        ),
+        Page(
+            "MOD",
+            (
+                EnumControl(
+                    key="wave",
+                    label="WAVE",
+                    options=("SINE", "TRI", "SAW", "SQR"),
+                    icons=(
+                        wave_icons.wave_sine,
+                        wave_icons.wave_triangle,
+                        wave_icons.wave_saw,
+                        wave_icons.wave_square,
+                    ),
+                ),
+                EnumControl(
+                    key="filter",
+                    label="FILTER",
+                    options=("LP6", "HP6", "BP6", "NOTCH", "LADDER", "PULTEC"),
+                    icons=(
+                        wave_icons.filter_lp6,
+                        wave_icons.filter_hp6,
+                        wave_icons.filter_bp6,
+                        wave_icons.filter_notch6,
+                        wave_icons.filter_ladder,
+                        wave_icons.filter_pultec,
+                    ),
+                ),
+                DialControl(key="tone", label="TONE", vmin=0, vmax=100, step=1),
+            ),
+        ),
+        Page(
+            "LEVEL",
+            (
+                DialControl(key="pre", label="PRE", vmin=0, vmax=100, step=1),
+                DialControl(key="post", label="POST", vmin=0, vmax=100, step=1),
+                DialControl(key="dry", label="DRY", vmin=0, vmax=100, step=1),
+            ),
+        ),
+        Page(
+            "TUNE",
+            (
+                DialControl(key="detune", label="DETUNE", vmin=-12, vmax=12, step=1),
+                DialControl(key="bpm", label="BPM", vmin=30, vmax=300, step=1),
+                TextControl(key="div", label="DIV", options=("1/1", "1/2", "1/4", "1/8", "1/16")),
+            ),
+        ),
+    ]
+
+    return Effect(name="CHORUS", pages=pages, params=params)
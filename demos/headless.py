@@ -0,0 +1,210 @@
+# msui/demos/headless.py
+"""
+Headless chorus demo: render into a FramebufferCanvas and stream the dirty
+rects to a viewer instead of opening a window.
+
+  python -m msui.demos.headless --stream unix:/tmp/msui.sock --autoplay
+  python -m msui.backends.stream unix:/tmp/msui.sock        # viewer
+
+Useful on a board without a panel (stream over tcp: and an SSH tunnel) or to
+watch a scripted run from CI.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import threading
+import time
+from typing import List, Optional, Sequence, Tuple
+
+from msui.demos.chorus_effect import build_demo_effect
+
+from msui.render.theme import Theme
+from msui.render.screen_effect import render_effect_editor
+from msui.render.cache import TileCache
+from msui.render.dial_sprites import enable_dial_sprites
+from msui.render.warmup import warm_text_caches
+from msui.render.layout import dirty_rects
+
+from msui.backends.canvas_fb import FramebufferCanvas
+from msui.backends.fonts import default_bitmap_fonts
+from msui.backends.input import InputSource
+from msui.backends.stream import FrameStreamServer
+
+from msui.core.dirty import DIRTY_NONE, DIRTY_ALL
+from msui.core.events import UIEvent, NAV_RIGHT, PAGE_NEXT, VALUE_DELTA, TOGGLE_BYPASS
+from msui.core.profiler import Profiler
+from msui.core.controller import apply_events
+from msui.core.param_queue import ParamQueue
+
+from msui.log import LogMixin, get_logger
+
+log = get_logger(__name__)
+
+def _lfo(queue: ParamQueue, key: str, lo: int, hi: int, stop: threading.Event) -> None:
+    # Stands in for an audio/MIDI thread: posts far faster than the UI draws.
+    while not stop.wait(0.002):
+        queue.post(key, lo + round((hi - lo) * (0.5 + 0.5 * math.sin(math.pi * time.perf_counter()))))
+
+
+# Idle wake-up bound, so viewers connecting meanwhile get their first frame soon.
+_VIEWER_POLL_S = 0.25
+
+# (delay_ms, event): turn the focused dial, move focus, flip pages, toggle bypass
+AUTOPLAY_SCRIPT: Tuple[Tuple[int, UIEvent], ...] = (
+    *((60, UIEvent(VALUE_DELTA, 1)) for _ in range(20)),
+    *((60, UIEvent(VALUE_DELTA, -1)) for _ in range(20)),
+    (400, UIEvent(NAV_RIGHT)),
+    *((80, UIEvent(VALUE_DELTA, 5)) for _ in range(10)),
+    (400, UIEvent(TOGGLE_BYPASS)),
+    (800, UIEvent(TOGGLE_BYPASS)),
+    (600, UIEvent(PAGE_NEXT)),
+    (600, UIEvent(NAV_RIGHT)),
+    (600, UIEvent(PAGE_NEXT)),
+)
+
+
+class ScriptedInput(LogMixin, InputSource):
+    """
+    InputSource replaying (delay_ms, UIEvent) steps on the dt clock, looping
+    (or nothing at all for an empty script).
+    """
+
+    def __init__(self, script: Sequence[Tuple[int, UIEvent]] = AUTOPLAY_SCRIPT, *, loop: bool = True):
+        self.script = tuple((max(1, int(d)), ev) for d, ev in script)
+        self.loop = bool(loop)
+        self._i = 0
+        self._elapsed_ms = 0
+        self.log.info("scripted_input_init", steps=len(self.script), loop=self.loop)
+
+    def pump(self) -> None:
+        pass
+
+    def get_events(self, dt_ms: int) -> List[UIEvent]:
+        events: List[UIEvent] = []
+        self._elapsed_ms += max(0, int(dt_ms))
+        while self.script:
+            if self._i >= len(self.script):
+                if not self.loop:
+                    break
+                self._i = 0
+            delay_ms, ev = self.script[self._i]
+            if self._elapsed_ms < delay_ms:
+                break
+            self._elapsed_ms -= delay_ms
+            events.append(ev)
+            self._i += 1
+        return events
+
+    def wait(self, timeout_s: Optional[float] = None) -> bool:
+        left_s = None
+        if self.script and (self.loop or self._i < len(self.script)):
+            delay_ms = self.script[self._i % len(self.script)][0]
+            left_s = max(0.0, (delay_ms - self._elapsed_ms) / 1000.0)
+        if timeout_s is not None:
+            left_s = float(timeout_s) if left_s is None else min(left_s, float(timeout_s))
+        if left_s is not None:
+            time.sleep(left_s)
+        return False
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m msui.demos.headless", description="Headless msui demo streaming frames")
+    ap.add_argument("--stream", default="unix:/tmp/msui.sock", help="unix:PATH or tcp:HOST:PORT")
+    ap.add_argument("--autoplay", action="store_true", help="loop a scripted input sequence")
+    ap.add_argument("--frames", type=int, default=0, help="stop after N loop iterations (0: run until interrupted)")
+    ap.add_argument("--lfo", metavar="KEY", help="modulate dial param KEY from another thread (0.5 Hz sine, 500 updates/s)")
+    args = ap.parse_args(argv)
+
+    theme = Theme()
+    with log.context(demo="chorus", backend="headless", w=int(theme.W), h=int(theme.H), fps=float(theme.FPS)):
+        log.info("demo_start", stream=args.stream, autoplay=bool(args.autoplay))
+
+        # Big-endian RGB565 is what the panel takes, so the stream matches it.
+        canvas = FramebufferCanvas(theme.W, theme.H, default_bitmap_fonts(), byteorder="big")
+        streamer = FrameStreamServer(args.stream, theme.W, theme.H, stride_px=canvas.stride, byteorder=canvas.byteorder)
+        input_src: InputSource = ScriptedInput() if args.autoplay else ScriptedInput(())
+
+        effect = build_demo_effect()
+        param_queue = ParamQueue()
+        lfo_stop = threading.Event()
+        if args.lfo:
+            if args.lfo not in effect.param_tiles:
+                ap.error(f"--lfo: no control shows param {args.lfo!r}")
+            pi, ti = effect.param_tiles[args.lfo][0]
+            ctrl = effect.pages[pi].controls[ti]
+            lfo_range = (int(getattr(ctrl, "vmin", 0)), int(getattr(ctrl, "vmax", 1)))
+            threading.Thread(
+                target=_lfo, args=(param_queue, args.lfo, *lfo_range, lfo_stop), name="msui-lfo", daemon=True
+            ).start()
+        tile_cache = TileCache(max_bytes=1024 * 1024)
+        sprites = enable_dial_sprites(canvas, max_bytes=2 * 1024 * 1024)
+        warm_text_caches(canvas, effect, theme)
+
+        with log.context(effect=getattr(effect, "name", "?")):
+            prof = Profiler(print_interval_s=1.0)
+            for name, cache in canvas.caches().items():
+                prof.watch_cache(name, cache)
+            prof.watch_cache("tiles", tile_cache)
+            if sprites is not None:
+                prof.watch_cache("dial_sprites", sprites)
+
+            dirty = DIRTY_ALL
+            frame_s = 1.0 / max(1.0, float(theme.FPS))
+            last = time.perf_counter()
+            n = 0
+            try:
+                while args.frames <= 0 or n < args.frames:
+                    now = time.perf_counter()
+                    dt_ms = int((now - last) * 1000.0)
+                    last = now
+
+                    input_src.pump()
+                    events = input_src.get_events(dt_ms)
+                    prof.add_events(len(events))
+                    ok, d = apply_events(effect, events)
+                    dirty |= d
+                    if not ok:
+                        return 0
+
+                    # Updates from other threads; redraws their tiles only while visible.
+                    dirty |= param_queue.drain_into(effect)
+
+                    if dirty != DIRTY_NONE:
+                        t0 = time.perf_counter()
+                        render_effect_editor(canvas, effect, theme, dirty_mask=dirty, tile_cache=tile_cache)
+                        t1 = time.perf_counter()
+                        # Stream rects are small; compressing inline keeps the loop single-threaded.
+                        streamer.present(canvas, dirty_rects(theme, dirty))
+                        t2 = time.perf_counter()
+                        prof.add_render(t1 - t0, t2 - t1)
+                        dirty = DIRTY_NONE
+                    else:
+                        streamer.poll()
+
+                    prof.tick_loop()
+                    prof.maybe_profile()
+                    n += 1
+
+                    if theme.INPUT_IDLE_WAIT and not events and dirty == DIRTY_NONE and not args.lfo:
+                        t0 = time.perf_counter()
+                        # Queued stream bytes are only flushed by poll(): come back sooner.
+                        wake_s = frame_s if streamer.backlog_bytes else _VIEWER_POLL_S
+                        input_src.wait(min(wake_s, theme.INPUT_IDLE_WAKE_S))
+                        prof.add_idle(time.perf_counter() - t0)
+                        continue
+                    spare = frame_s - (time.perf_counter() - now)
+                    if spare > 0:
+                        time.sleep(spare)
+            except KeyboardInterrupt:
+                pass
+            finally:
+                lfo_stop.set()
+                streamer.close()
+                log.info("demo_exit", frames=n)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
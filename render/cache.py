@@ -0,0 +1,161 @@
+# msui/render/cache.py
+"""
+Render-side caches keyed by control state.
+
+A control's render() only depends on (control, its param value, focused,
+theme, tile size), so identical states can be replayed instead of recomputing
+geometry every frame.
+"""
+
+from __future__ import annotations
+
+import weakref
+
+from msui.backends.cache import LRUCache
+from msui.backends.canvas import BitmapCanvas
+from msui.backends.canvas_record import RecordingCanvas
+from msui.log import LogMixin
+
+
+class DisplayListCache(LogMixin):
+    """
+    Records each control render once per state into a DisplayList and replays it.
+
+    Keys use id() for control and theme: controls are (unhashable) dataclasses
+    and both live as long as the UI does.
+    """
+
+    def __init__(self, capacity: int = 256):
+        self._lru = LRUCache(capacity)
+
+    @property
+    def hits(self) -> int:
+        return self._lru.hits
+
+    @property
+    def misses(self) -> int:
+        return self._lru.misses
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    def clear(self) -> None:
+        self._lru.clear()
+
+    def stats(self) -> dict:
+        return self._lru.stats()
+
+    def render_control(self, ctrl, canvas, rect, focused: bool, effect, theme) -> None:
+        x, y, w, h = rect
+        key = (id(ctrl), effect.params.get(ctrl.key), bool(focused), id(theme), w, h)
+        try:
+            entry = self._lru.get(key)
+        except TypeError:
+            # unhashable param value: nothing sensible to key on
+            ctrl.render(canvas, rect, focused, effect, theme)
+            return
+
+        if entry is None:
+            rec = RecordingCanvas(canvas.w, canvas.h, measure=canvas)
+            ctrl.render(rec, rect, focused, effect, theme)
+            entry = (x, y, rec.finish())
+            self._lru.put(key, entry)
+
+        ox, oy, dl = entry
+        dl.replay(canvas, x - ox, y - oy)
+
+
+class TileCache(LogMixin):
+    """
+    Bounded cache of fully rendered tile bitmaps.
+
+    Keyed like DisplayListCache; a hit makes the tile a single blit. Needs a
+    canvas with the BitmapCanvas capability (other canvases just miss).
+    Eviction is by approximate bitmap bytes (max_bytes), LRU order.
+    """
+
+    def __init__(self, max_bytes: int = 1 << 20):
+        # entries: (bitmap, nbytes)
+        self._lru = LRUCache(None, max_bytes=max_bytes, sizeof=lambda e: e[1])
+        self._bitmap_types: dict = {}
+        self._bitmap_wrappers: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+        self.log.info("tile_cache_init", max_bytes=int(max_bytes))
+
+    @property
+    def hits(self) -> int:
+        return self._lru.hits
+
+    @property
+    def misses(self) -> int:
+        return self._lru.misses
+
+    @property
+    def nbytes(self) -> int:
+        return self._lru.nbytes
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    def stats(self) -> dict:
+        return self._lru.stats()
+
+    def clear(self) -> None:
+        self._lru.clear()
+
+    def _supports(self, canvas) -> bool:
+        # isinstance() on a runtime Protocol is slow; remember per canvas type.
+        # Wrappers forwarding via __getattr__ (DamageTrackingCanvas) answer per
+        # instance: their capability is the wrapped canvas's.
+        t = type(canvas)
+        if hasattr(t, "__getattr__"):
+            memo, k = self._bitmap_wrappers, canvas
+        else:
+            memo, k = self._bitmap_types, t
+        ok = memo.get(k)
+        if ok is None:
+            ok = isinstance(canvas, BitmapCanvas)
+            memo[k] = ok
+        return ok
+
+    @staticmethod
+    def _bitmap_owner(canvas):
+        # Canvas whose copy_rect() made the bitmaps: unwrap forwarding wrappers.
+        while hasattr(type(canvas), "__getattr__") and getattr(canvas, "base", None) is not None:
+            canvas = canvas.base
+        return canvas
+
+    @classmethod
+    def _key(cls, ctrl, canvas, rect, focused: bool, effect, theme):
+        # Bitmaps are backend-specific (Surface, ndarray, bytes): key by the
+        # producing canvas so one cache never blits another backend's bitmap.
+        _, _, w, h = rect
+        return (id(cls._bitmap_owner(canvas)), id(ctrl), effect.params.get(ctrl.key), bool(focused), id(theme), w, h)
+
+    def blit_cached(self, ctrl, canvas, rect, focused: bool, effect, theme) -> bool:
+        """
+        Blit the cached tile if this state was seen before. Returns True on hit.
+        """
+        if not self._supports(canvas):
+            return False
+        try:
+            entry = self._lru.get(self._key(ctrl, canvas, rect, focused, effect, theme))
+        except TypeError:
+            return False
+        if entry is None:
+            return False
+        canvas.blit(entry[0], rect[0], rect[1])
+        return True
+
+    def store(self, ctrl, canvas, rect, focused: bool, effect, theme) -> None:
+        """
+        Capture the tile just rendered at `rect`.
+        """
+        if not self._supports(canvas):
+            return
+        try:
+            key = self._key(ctrl, canvas, rect, focused, effect, theme)
+            hash(key)
+        except TypeError:
+            return
+        bm = canvas.copy_rect(rect)
+        self._lru.put(key, (bm, canvas.bitmap_nbytes(bm)))
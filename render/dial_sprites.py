@@ -0,0 +1,164 @@
+# msui/render/dial_sprites.py
+"""
+Dial sprite sheets.
+
+draw_dial_visual() costs a circle, an arc, up to ~90 thick tick lines and the
+trig for each of them. Its output only depends on a handful of integers, so on
+bitmap-capable canvases every distinct dial frame is captured once and later
+drawn with a single blit.
+
+Frames are keyed by what actually reaches the screen (tick count + needle end
+pixel) rather than by value, so values that rasterize identically share one
+sprite (a 30..300 BPM dial needs far fewer than 271 frames).
+
+Sprites capture the dial together with the background under it, so the dial
+area must be cleared to a fixed color before drawing (screen_effect clears each
+tile to theme.BG).
+"""
+
+from __future__ import annotations
+
+import weakref
+from typing import Optional
+
+from msui.backends.cache import LRUCache
+from msui.backends.canvas import BitmapCanvas, clip_rect
+from msui.log import LogMixin
+from msui.render.draw import dial_geometry, draw_dial_visual, polar
+
+
+def _frame_key(cx, cy, r, ang, theme):
+    # Same tick loop as draw_dial_visual, so float stepping matches exactly.
+    n = 0
+    a = theme.DIAL_START_DEG
+    step = theme.DIAL_STEP_DEG
+    while a >= ang:
+        n += 1
+        a -= step
+    px, py = polar(cx, cy, r - theme.DIAL_NEEDLE_INSET, ang)
+    return (n, px - cx, py - cy)
+
+
+class DialSpriteSheet(LogMixin):
+    """
+    Byte-bounded store of captured dial frames for one canvas.
+
+    Sheet key: (id(theme), visual w/h, vmin, vmax, ring, accent); the focused
+    state is covered by the ring/accent colors.
+    """
+
+    def __init__(self, max_bytes: int = 2 * 1024 * 1024):
+        # entries: (bitmap, dx, dy, nbytes), offset relative to the dial center
+        self._lru = LRUCache(None, max_bytes=max_bytes, sizeof=lambda e: e[3])
+        self.log.info("dial_sprites_init", max_bytes=int(max_bytes))
+
+    @property
+    def hits(self) -> int:
+        return self._lru.hits
+
+    @property
+    def misses(self) -> int:
+        return self._lru.misses
+
+    @property
+    def nbytes(self) -> int:
+        return self._lru.nbytes
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    def stats(self) -> dict:
+        return self._lru.stats()
+
+    def clear(self) -> None:
+        self._lru.clear()
+
+    def draw(self, canvas, visual_rect, value: int, vmin: int, vmax: int, ring_col, accent_col, theme) -> None:
+        """
+        draw_dial_visual(), blitting a captured frame when one exists.
+        """
+        cx, cy, r, ang = dial_geometry(visual_rect, value, vmin, vmax, theme)
+        _, _, w, h = visual_rect
+        key = (id(theme), w, h, int(vmin), int(vmax), ring_col, accent_col, _frame_key(cx, cy, r, ang, theme))
+
+        entry = self._lru.get(key)
+        if entry is not None:
+            bm, dx, dy, _ = entry
+            canvas.blit(bm, cx + dx, cy + dy)
+            return
+
+        draw_dial_visual(canvas, visual_rect, value, vmin, vmax, ring_col, accent_col, theme)
+
+        # Capture the dial's bounding box (the circle may poke 1px out of visual_rect).
+        x, y = visual_rect[0], visual_rect[1]
+        bx0, by0 = min(x, cx - r), min(y, cy - r)
+        bx1, by1 = max(x + w, cx + r + 1), max(y + h, cy + r + 1)
+        box = clip_rect((bx0, by0, bx1 - bx0, by1 - by0), canvas.w, canvas.h)
+        if box is None or box != (bx0, by0, bx1 - bx0, by1 - by0):
+            # partially off-screen: a clipped capture can't be reused elsewhere
+            return
+        bm = canvas.copy_rect(box)
+        self._lru.put(key, (bm, bx0 - cx, by0 - cy, canvas.bitmap_nbytes(bm)))
+
+    def precompute(self, canvas, ctrl, rect, theme) -> int:
+        """
+        Capture every reachable frame of a DialControl tile at `rect`, for both
+        focus states. Draws on `canvas`; redraw the screen afterwards.
+
+        Returns the number of frames now cached.
+        """
+        _, visual_rect, _ = ctrl.split_tile(rect, theme)
+        lo, hi = sorted((int(ctrl.vmin), int(ctrl.vmax)))
+        for focused in (False, True):
+            accent = theme.ACC_FOCUS if focused else theme.ACC_IDLE
+            ring = theme.FG if focused else theme.DIM
+            for v in range(lo, hi + 1):
+                canvas.round_rect(rect, 0, theme.BG, fill=True)
+                self.draw(canvas, visual_rect, v, ctrl.vmin, ctrl.vmax, ring, accent, theme)
+
+        self.log.info(
+            "dial_sprites_precompute",
+            key=ctrl.key,
+            vmin=lo,
+            vmax=hi,
+            frames=len(self._lru),
+            nbytes=self._lru.nbytes,
+        )
+        return len(self._lru)
+
+
+# Per-canvas sheets; weak so dropping a canvas drops its sprites.
+_SHEETS: "weakref.WeakKeyDictionary[object, DialSpriteSheet]" = weakref.WeakKeyDictionary()
+
+
+def enable_dial_sprites(canvas, max_bytes: int = 2 * 1024 * 1024) -> Optional[DialSpriteSheet]:
+    """
+    Turn on dial sprites for `canvas`. Returns None if the canvas can't
+    copy/blit bitmaps (see BitmapCanvas); dials then keep drawing vectors.
+    """
+    if not isinstance(canvas, BitmapCanvas):
+        return None
+    sheet = _SHEETS.get(canvas)
+    if sheet is None:
+        sheet = DialSpriteSheet(max_bytes)
+        _SHEETS[canvas] = sheet
+    return sheet
+
+
+def dial_sprites(canvas) -> Optional[DialSpriteSheet]:
+    try:
+        return _SHEETS.get(canvas)
+    except TypeError:
+        # not weak-referenceable (e.g. __slots__ wrappers)
+        return None
+
+
+def draw_dial(canvas, visual_rect, value: int, vmin: int, vmax: int, ring_col, accent_col, theme) -> None:
+    """
+    Drop-in for draw_dial_visual() that uses the canvas' sprite sheet if enabled.
+    """
+    sheet = dial_sprites(canvas)
+    if sheet is None:
+        draw_dial_visual(canvas, visual_rect, value, vmin, vmax, ring_col, accent_col, theme)
+    else:
+        sheet.draw(canvas, visual_rect, value, vmin, vmax, ring_col, accent_col, theme)
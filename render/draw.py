@@ -3,6 +3,8 @@ from __future__ import annotations
 
 import math
 
+from msui.backends.canvas import draw_lines
+
 
 def polar(cx, cy, r, deg):
     rad = math.radians(deg)
@@ -10,10 +12,9 @@ def polar(cx, cy, r, deg):
             cy - int(r * math.sin(rad)))  # pygame y-down
 
 
-def draw_dial_visual(canvas, visual_rect, value: int, vmin: int, vmax: int, ring_col, accent_col, theme):
+def dial_geometry(visual_rect, value: int, vmin: int, vmax: int, theme):
     """
-    Draws the 270° symmetric dial + fill inside visual_rect.
-    Supports arbitrary ranges and shows a 0 marker when range crosses 0.
+    (cx, cy, r, needle_deg) of the dial drawn inside visual_rect.
     """
     x, y, w, h = visual_rect
 
@@ -21,6 +22,23 @@ def draw_dial_visual(canvas, visual_rect, value: int, vmin: int, vmax: int, ring
     cx = x + w // 2
     cy = y + h // 2 + theme.DIAL_CENTER_Y_OFFSET
 
+    # normalize value into [0..1]
+    if vmax == vmin:
+        t = 0.0
+    else:
+        t = (int(value) - int(vmin)) / float(int(vmax) - int(vmin))
+    t = max(0.0, min(1.0, t))
+
+    return cx, cy, r, theme.DIAL_START_DEG - theme.DIAL_SWEEP_DEG * t
+
+
+def draw_dial_visual(canvas, visual_rect, value: int, vmin: int, vmax: int, ring_col, accent_col, theme):
+    """
+    Draws the 270° symmetric dial + fill inside visual_rect.
+    Supports arbitrary ranges and shows a 0 marker when range crosses 0.
+    """
+    cx, cy, r, ang = dial_geometry(visual_rect, value, vmin, vmax, theme)
+
     start_deg = theme.DIAL_START_DEG
     sweep = theme.DIAL_SWEEP_DEG
     end_deg = start_deg - sweep
@@ -35,23 +53,16 @@ def draw_dial_visual(canvas, visual_rect, value: int, vmin: int, vmax: int, ring
         width=theme.DIAL_ARC_W,
     )
 
-    # normalize value into [0..1]
-    if vmax == vmin:
-        t = 0.0
-    else:
-        t = (int(value) - int(vmin)) / float(int(vmax) - int(vmin))
-    t = max(0.0, min(1.0, t))
-
-    ang = start_deg - sweep * t
-
-    # fill ticks from start -> ang
+    # fill ticks from start -> ang (one batched call)
     a = start_deg
     step = theme.DIAL_STEP_DEG
+    ticks = []
     while a >= ang:
-        p1 = polar(cx, cy, r - theme.DIAL_TICK_INSET, a)
-        p2 = polar(cx, cy, r - theme.DIAL_TICK_INSET - theme.DIAL_TICK_LEN, a)
-        canvas.line(p1, p2, accent_col, width=theme.DIAL_TICK_W)
+        ticks.extend(polar(cx, cy, r - theme.DIAL_TICK_INSET, a))
+        ticks.extend(polar(cx, cy, r - theme.DIAL_TICK_INSET - theme.DIAL_TICK_LEN, a))
         a -= step
+    if ticks:
+        draw_lines(canvas, ticks, accent_col, width=theme.DIAL_TICK_W)
 
     # indicator needle
     pend = polar(cx, cy, r - theme.DIAL_NEEDLE_INSET, ang)
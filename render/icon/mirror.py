@@ -4,6 +4,8 @@ from __future__ import annotations
 import math
 from dataclasses import dataclass
 
+from msui.backends.canvas import draw_circles, draw_lines, draw_polyline
+
 from .types import IconFn, Point, Rect
 
 
@@ -62,6 +64,21 @@ class _MirrorCanvas:
     def circle(self, center: Point, r: int, color, width=1):
         return self.base.circle(self._map_point(center), r, color, width=width)
 
+    def _map_flat(self, pts):
+        out = []
+        for i in range(0, len(pts) - 1, 2):
+            out.extend(self._map_point((pts[i], pts[i + 1])))
+        return out
+
+    def lines(self, segments, color, width=1):
+        return draw_lines(self.base, self._map_flat(segments), color, width=width)
+
+    def polyline(self, points, color, width=1):
+        return draw_polyline(self.base, self._map_flat(points), color, width=width)
+
+    def circles(self, centers, r: int, color, width=1):
+        return draw_circles(self.base, self._map_flat(centers), r, color, width=width)
+
     def round_rect(self, rect: Rect, radius: int, color, fill=True, width=1):
         return self.base.round_rect(self._map_rect(rect), radius, color, fill=fill, width=width)
 
@@ -3,6 +3,8 @@ from __future__ import annotations
 
 from typing import List
 
+from msui.backends.canvas import draw_polyline
+
 from .types import Point, Rect
 
 
@@ -12,8 +14,10 @@ def pad_rect(rect: Rect, pad: int) -> Rect:
 
 
 def polyline(canvas, pts: List[Point], color, width: int = 2) -> None:
-    for i in range(len(pts) - 1):
-        canvas.line(pts[i], pts[i + 1], color, width=width)
+    flat = []
+    for p in pts:
+        flat.extend(p)
+    draw_polyline(canvas, flat, color, width=width)
 
 
 def _bezier3(p0: Point, p1: Point, p2: Point, p3: Point, t: float) -> Point:
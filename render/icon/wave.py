@@ -3,6 +3,8 @@ from __future__ import annotations
 
 import math
 
+from msui.backends.canvas import draw_polyline
+
 from .primitives import pad_rect, polyline
 
 
@@ -15,10 +17,9 @@ def wave_sine(canvas, rect, color, theme):
     pts = []
     for i in range(n):
         t = i / (n - 1)
-        xx = x + int(t * (w - 1))
-        yy = mid - int(math.sin(2 * math.pi * t) * amp)
-        pts.append((xx, yy))
-    polyline(canvas, pts, color, width=3)
+        pts.append(x + int(t * (w - 1)))
+        pts.append(mid - int(math.sin(2 * math.pi * t) * amp))
+    draw_polyline(canvas, pts, color, width=3)
 
 
 def wave_triangle(canvas, rect, color, theme):
@@ -43,8 +44,7 @@ def wave_saw(canvas, rect, color, theme):
     top = mid - amp
     bot = mid + amp
 
-    canvas.line((left, bot), (right, top), color, width=3)
-    canvas.line((right, top), (right, bot), color, width=3)
+    polyline(canvas, [(left, bot), (right, top), (right, bot)], color, width=3)
 
 
 def wave_square(canvas, rect, color, theme):
@@ -59,8 +59,4 @@ def wave_square(canvas, rect, color, theme):
     q1 = x + w // 3
     q2 = x + 2 * w // 3
 
-    canvas.line((left, bot), (q1, bot), color, width=3)
-    canvas.line((q1, bot), (q1, top), color, width=3)
-    canvas.line((q1, top), (q2, top), color, width=3)
-    canvas.line((q2, top), (q2, bot), color, width=3)
-    canvas.line((q2, bot), (right, bot), color, width=3)
+    polyline(canvas, [(left, bot), (q1, bot), (q1, top), (q2, top), (q2, bot), (right, bot)], color, width=3)
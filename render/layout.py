@@ -3,6 +3,16 @@ from __future__ import annotations
 
 from typing import List, Tuple
 
+from msui.core.dirty import (
+    DIRTY_NONE,
+    DIRTY_ALL,
+    DIRTY_HEADER,
+    DIRTY_PAGE,
+    DIRTY_TILES,
+    DIRTY_TILE0,
+    DIRTY_TILE1,
+    DIRTY_TILE2,
+)
 
 Rect = Tuple[int, int, int, int]
 
@@ -62,3 +72,34 @@ def tile_rects(theme) -> List[Rect]:
         x0 = start_x + i * (theme.TILE_W + theme.TILE_GAP)
         rects.append((x0, y0, theme.TILE_W, theme.TILE_H))
     return rects
+
+
+def dirty_rects(theme, mask: int) -> List[Rect]:
+    """
+    Screen regions touched by render_effect_editor() for a dirty mask.
+
+    This is what a backend has to upload after rendering (SPI windows,
+    window update rects, ...). DIRTY_ALL is one full-screen rect.
+    """
+    if mask == DIRTY_NONE:
+        return []
+    if mask == DIRTY_ALL:
+        return [(0, 0, theme.W, theme.H)]
+
+    rects: List[Rect] = []
+    if mask & DIRTY_HEADER:
+        rects.append(header_rect(theme))
+    if mask & DIRTY_PAGE:
+        _, py = page_slots_pos(theme)
+        rects.append((theme.HEADER_X, py, theme.W - 2 * theme.HEADER_X, theme.PAGEBOX_H))
+
+    tiles = tile_rects(theme)
+    if mask & DIRTY_TILES:
+        x0, y0, _, th = tiles[0]
+        x2, _, tw, _ = tiles[2]
+        rects.append((x0, y0, x2 + tw - x0, th))
+    else:
+        for i, bit in enumerate((DIRTY_TILE0, DIRTY_TILE1, DIRTY_TILE2)):
+            if mask & bit:
+                rects.append(tiles[i])
+    return rects
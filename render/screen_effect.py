@@ -138,37 +138,64 @@ def _render_empty_tile(canvas, rect, theme: Theme) -> None:
     canvas.text(theme.FONT_M, x + (w - tw) // 2, y + (h - th) // 2, s, theme.DIM)
 
 
-def _render_tile(canvas, effect: Effect, theme: Theme, tile_i: int) -> None:
+def _render_tile(canvas, effect: Effect, theme: Theme, tile_i: int, display_lists=None, tile_cache=None) -> None:
     rects = tile_rects(theme)
     rect = rects[tile_i]
 
-    _fill_rect(canvas, rect, theme.BG)
-
     page = effect.current_page()
     if tile_i >= len(page.controls):
+        _fill_rect(canvas, rect, theme.BG)
         _render_empty_tile(canvas, rect, theme)
         return
 
     focused = (tile_i == effect.control_index)
-    page.controls[tile_i].render(canvas, rect, focused, effect, theme)
+    ctrl = page.controls[tile_i]
 
+    # Seen this exact state before: the whole tile is one blit.
+    if tile_cache is not None and tile_cache.blit_cached(ctrl, canvas, rect, focused, effect, theme):
+        return
+
+    _fill_rect(canvas, rect, theme.BG)
+    if display_lists is not None:
+        display_lists.render_control(ctrl, canvas, rect, focused, effect, theme)
+    else:
+        ctrl.render(canvas, rect, focused, effect, theme)
 
-def _render_tiles(canvas, effect: Effect, theme: Theme, mask: int) -> None:
+    if tile_cache is not None:
+        tile_cache.store(ctrl, canvas, rect, focused, effect, theme)
+
+
+def _render_tiles(canvas, effect: Effect, theme: Theme, mask: int, display_lists=None, tile_cache=None) -> None:
     if mask & DIRTY_TILES:
-        _render_tile(canvas, effect, theme, 0)
-        _render_tile(canvas, effect, theme, 1)
-        _render_tile(canvas, effect, theme, 2)
+        _render_tile(canvas, effect, theme, 0, display_lists, tile_cache)
+        _render_tile(canvas, effect, theme, 1, display_lists, tile_cache)
+        _render_tile(canvas, effect, theme, 2, display_lists, tile_cache)
         return
 
     if mask & DIRTY_TILE0:
-        _render_tile(canvas, effect, theme, 0)
+        _render_tile(canvas, effect, theme, 0, display_lists, tile_cache)
     if mask & DIRTY_TILE1:
-        _render_tile(canvas, effect, theme, 1)
+        _render_tile(canvas, effect, theme, 1, display_lists, tile_cache)
     if mask & DIRTY_TILE2:
-        _render_tile(canvas, effect, theme, 2)
-
-
-def render_effect_editor(canvas, effect: Effect, theme: Theme, dirty_mask: int = DIRTY_ALL) -> None:
+        _render_tile(canvas, effect, theme, 2, display_lists, tile_cache)
+
+
+def render_effect_editor(
+    canvas,
+    effect: Effect,
+    theme: Theme,
+    dirty_mask: int = DIRTY_ALL,
+    *,
+    display_lists=None,
+    tile_cache=None,
+) -> None:
+    """
+    Render the effect editor screen for the given dirty mask.
+
+    Optional caches (see render/cache.py):
+      - display_lists: DisplayListCache, control renders recorded once per state
+      - tile_cache: TileCache, finished tile bitmaps blitted on repeat states
+    """
     if dirty_mask == DIRTY_NONE:
         return
 
@@ -198,7 +225,7 @@ def render_effect_editor(canvas, effect: Effect, theme: Theme, dirty_mask: int =
         canvas.fill(theme.BG)
         _render_header_and_badge(canvas, effect, theme)
         _render_page_slots(canvas, effect, theme)
-        _render_tiles(canvas, effect, theme, DIRTY_TILES)
+        _render_tiles(canvas, effect, theme, DIRTY_TILES, display_lists, tile_cache)
         return
 
     if dirty_mask & DIRTY_HEADER:
@@ -209,4 +236,4 @@ def render_effect_editor(canvas, effect: Effect, theme: Theme, dirty_mask: int =
     if dirty_mask & DIRTY_PAGE:
         _render_page_slots(canvas, effect, theme)
 
-    _render_tiles(canvas, effect, theme, dirty_mask)
+    _render_tiles(canvas, effect, theme, dirty_mask, display_lists, tile_cache)
@@ -29,6 +29,10 @@ class Theme:
     INPUT_REPEAT_UPDOWN_RATIO: float = 1.0
     INPUT_REPEAT_NAV_RATIO: float = 0.6
     INPUT_REPEAT_PAGE_RATIO: float = 0.4
+    # Idle: block in InputSource.wait() instead of polling at FPS; wake at
+    # least every INPUT_IDLE_WAKE_S (periodic work such as perf logs).
+    INPUT_IDLE_WAIT: bool = True
+    INPUT_IDLE_WAKE_S: float = 1.0
 
     # ----------------
     # Fonts (keys; actual pygame fonts live in Canvas)
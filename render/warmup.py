@@ -0,0 +1,199 @@
+# msui/render/warmup.py
+"""
+Startup warm-up of the canvas text caches.
+
+Text is rendered lazily: the first time a dial shows "047" in the focused
+color, the backend rasterizes it. On a 15 FPS device that makes the first
+sweep through a dial stutter. warm_text_caches() finds every string the editor
+can show for an effect and pre-fills the canvas caches before the first frame:
+
+  - header text and the ACTIVE/BYPASS badge
+  - every control label, focused and idle
+  - every reachable value (dial digits over vmin..vmax, IndexedControl
+    options, Bool on/off text) in both colors
+
+Strings are collected by rendering each control state into a canvas that only
+records text calls, so whatever the controls draw is covered without
+duplicating their formatting here.
+
+The work can run on a background thread (background=True); the canvas must
+provide warm_text(font_key, s, color), which only touches its caches and
+serializes font access with the canvas's own text()/text_size() calls (the
+bundled canvases share a _font_lock for that).
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from msui.backends.canvas import Canvas, Color, Point, Rect
+from msui.controls.base import BoolControl, IndexedControl
+from msui.controls.dial import DialControl
+from msui.core.dirty import DIRTY_ALL
+from msui.log import get_logger
+from msui.render.layout import tile_rects
+from msui.render.screen_effect import render_effect_editor
+
+log = get_logger(__name__)
+
+TextItem = Tuple[str, str, Color]
+
+
+class _TextCollector(Canvas):
+    """
+    Canvas that draws nothing and records (font_key, s, color) per text() call.
+    """
+
+    def __init__(self, w: int, h: int):
+        self.w = int(w)
+        self.h = int(h)
+        self.items: Dict[TextItem, None] = {}  # ordered set, last use last
+
+    def fill(self, color: Color) -> None:
+        pass
+
+    def round_rect(self, rect: Rect, radius: int, color: Color, *, fill: bool = True, width: int = 1) -> None:
+        pass
+
+    def circle(self, center: Point, r: int, color: Color, *, width: int = 1) -> None:
+        pass
+
+    def arc(self, rect: Rect, start_rad: float, end_rad: float, color: Color, *, width: int = 1) -> None:
+        pass
+
+    def line(self, p1: Point, p2: Point, color: Color, *, width: int = 1) -> None:
+        pass
+
+    def lines(self, segments, color: Color, *, width: int = 1) -> None:
+        pass
+
+    def polyline(self, points, color: Color, *, width: int = 1) -> None:
+        pass
+
+    def circles(self, centers, r: int, color: Color, *, width: int = 1) -> None:
+        pass
+
+    def text(self, font_key: str, x: int, y: int, s: str, color: Color) -> None:
+        key = (font_key, s, color)
+        self.items.pop(key, None)
+        self.items[key] = None
+
+    def text_size(self, font_key: str, s: str) -> Tuple[int, int]:
+        # Positions don't matter here; warm_text() fills the size cache.
+        return (0, 0)
+
+
+def _reachable_values(ctrl, effect) -> Iterable[object]:
+    """
+    Param values the control can be adjusted to (current value for unknown types).
+    """
+    if isinstance(ctrl, DialControl):
+        lo, hi = sorted((int(ctrl.vmin), int(ctrl.vmax)))
+        step = max(1, abs(int(ctrl.step)))
+        v0 = int(effect.params.get(ctrl.key, lo))
+        if step == 1:
+            return range(lo, hi + 1)
+        # values on the step grid through the current value, plus the clamp ends
+        vals = set(range(lo + (v0 - lo) % step, hi + 1, step))
+        vals.update((lo, hi))
+        return sorted(vals)
+    if isinstance(ctrl, IndexedControl):
+        return range(max(1, len(ctrl.options)))
+    if isinstance(ctrl, BoolControl):
+        return (False, True)
+    return (effect.params.get(ctrl.key),)
+
+
+def _snapshot(effect):
+    """
+    Copy of `effect` the collector may mutate (params/ui copied, pages shared).
+    """
+    return dataclasses.replace(effect, params=dict(effect.params), ui=dict(effect.ui))
+
+
+def _collect(scratch, theme) -> List[TextItem]:
+    # Walks every state on `scratch` (a _snapshot()); restores nothing.
+    page0, ctrl0, enabled0 = scratch.page_index, scratch.control_index, scratch.enabled
+    tc = _TextCollector(theme.W, theme.H)
+
+    # Every control in every reachable value, focused and idle.
+    rects = tile_rects(theme)
+    for page in scratch.pages:
+        for ci, ctrl in enumerate(page.controls):
+            key = ctrl.key
+            orig = scratch.params.get(key)
+            for v in _reachable_values(ctrl, scratch):
+                scratch.params[key] = v
+                for focused in (True, False):
+                    ctrl.render(tc, rects[ci], focused, scratch, theme)
+            scratch.params[key] = orig
+
+    # Full screens (header, badge in both states, empty tiles), current page
+    # last: if the cache is too small, the most likely strings are the most
+    # recently inserted.
+    order = [pi for pi in range(len(scratch.pages)) if pi != page0] + [page0]
+    for pi in order:
+        scratch.page_index = pi
+        scratch.control_index = ctrl0 if pi == page0 else 0
+        for enabled in (not enabled0, enabled0):
+            scratch.enabled = enabled
+            render_effect_editor(tc, scratch, theme, DIRTY_ALL)
+    return list(tc.items)
+
+
+def collect_texts(effect, theme) -> List[TextItem]:
+    """
+    Every (font_key, string, color) the effect editor can draw for `effect`.
+
+    Works on a copy of the effect; `effect` itself is not modified.
+    """
+    return _collect(_snapshot(effect), theme)
+
+
+def warm_text_caches(canvas, effect, theme, *, background: bool = False) -> Optional[threading.Thread]:
+    """
+    Pre-fill `canvas` text caches for everything `effect` can show.
+
+    background=True runs on a daemon thread and returns it (join() to wait);
+    otherwise runs inline and returns None. `effect` is copied before the
+    thread starts, so the caller may keep editing it. Canvases without
+    warm_text() are skipped; caches()["text"] (if any) is checked for overflow.
+    """
+    warm = getattr(canvas, "warm_text", None)
+    if warm is None:
+        log.info("text_warmup_skipped", canvas=type(canvas).__name__)
+        return None
+
+    # Snapshot on the caller's thread: the UI may edit `effect` once the
+    # worker is running.
+    scratch = _snapshot(effect)
+    caches = getattr(canvas, "caches", None)
+    text_cache = caches().get("text") if caches is not None else None
+
+    def run() -> None:
+        t0 = time.perf_counter()
+        items = _collect(scratch, theme)
+        for font_key, s, color in items:
+            warm(font_key, s, color)
+
+        cap = getattr(text_cache, "capacity", None)
+        if cap is not None and len(text_cache) >= cap:
+            # Later items evicted earlier ones; warm-up still helps, just less.
+            log.warn("text_warmup_cache_full", items=len(items), capacity=cap)
+        log.info(
+            "text_warmup_done",
+            canvas=type(canvas).__name__,
+            items=len(items),
+            ms=round((time.perf_counter() - t0) * 1000.0, 1),
+        )
+
+    if not background:
+        run()
+        return None
+
+    t = threading.Thread(target=run, name="msui-text-warmup", daemon=True)
+    t.start()
+    return t